@@ -0,0 +1,125 @@
+"""
+EDMC Income Tracker Plugin - Journal event dispatch microbenchmark
+
+Compares the precompiled dispatch table in JournalProcessor against the
+previous per-event scan over JOURNAL_EVENT_CATEGORIES.
+
+Usage:
+    python benchmarks/bench_dispatch.py [events]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.constants import JOURNAL_EVENT_CATEGORIES, JOURNAL_FIELDS  # noqa: E402
+from src.journal_processor import JournalProcessor  # noqa: E402
+
+# Roughly what a play session looks like: mostly non-income events
+NOISE_EVENTS = ["FSDJump", "Scan", "Music", "ReceiveText", "FSSSignalDiscovered", "Docked", "Undocked", "Loadout"]
+INCOME_EVENTS = [
+    {"event": "MarketSell", "TotalSale": 120000},
+    {"event": "MarketBuy", "TotalCost": 90000},
+    {"event": "RedeemVoucher", "Amount": 50000},
+    {"event": "MissionCompleted", "Reward": 250000, "Donation": 1000},
+    {"event": "RefuelAll", "Cost": 500},
+]
+
+
+class _Prefs:
+    cached_track_trading = True
+    cached_track_combat = True
+    cached_track_exploration = True
+    cached_track_missions = True
+
+    def tracked_categories(self):
+        return {"trading": True, "combat": True, "exploration": True, "missions": True}
+
+
+class _Tracker:
+    def __init__(self):
+        self.count = 0
+
+    def transaction(self, earnings, category, timestamp=None, event=None, cmdr=None, system=None, station=None):
+        self.count += 1
+
+    def update_credits(self, credits):
+        pass
+
+    def switch_commander(self, cmdr, is_beta):
+        pass
+
+
+def legacy_process(tracker, prefs, entry):
+    """The per-event loop JournalProcessor used before the dispatch table"""
+    event = entry.get("event")
+    if not event:
+        return "No event found"
+
+    track_map = {
+        "trading": prefs.cached_track_trading,
+        "combat": prefs.cached_track_combat,
+        "exploration": prefs.cached_track_exploration,
+        "missions": prefs.cached_track_missions,
+    }
+
+    for category, events in JOURNAL_EVENT_CATEGORIES.items():
+        if category != "maintenance" and not track_map.get(category, False):
+            continue
+        if event not in events:
+            continue
+        key_names, signs = events[event]
+        amounts_found = False
+        for key_name, sign in zip(key_names, signs):
+            journal_key = JOURNAL_FIELDS.get(key_name)
+            if not journal_key:
+                continue
+            amount = entry.get(journal_key, 0)
+            if amount:
+                tracker.transaction(sign * amount, category)
+                amounts_found = True
+        if amounts_found:
+            return f"Event: {event}"
+    return None
+
+
+def make_stream(count, income_ratio=0.05):
+    rng = random.Random(42)
+    return [
+        rng.choice(INCOME_EVENTS) if rng.random() < income_ratio else {"event": rng.choice(NOISE_EVENTS)}
+        for _ in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    stream = make_stream(count)
+    prefs = _Prefs()
+
+    legacy_tracker = _Tracker()
+    start = time.perf_counter()
+    for entry in stream:
+        legacy_process(legacy_tracker, prefs, entry)
+    legacy_time = time.perf_counter() - start
+
+    tracker = _Tracker()
+    processor = JournalProcessor(tracker, prefs)
+    empty_state = {}
+    start = time.perf_counter()
+    for entry in stream:
+        processor.process_journal_entry("Cmdr", False, None, None, entry, empty_state)
+    table_time = time.perf_counter() - start
+
+    assert legacy_tracker.count == tracker.count, "dispatch results differ"
+
+    print(f"events:          {count:,} ({tracker.count:,} transactions)")
+    print(f"legacy loop:     {legacy_time * 1e9 / count:8.1f} ns/event")
+    print(f"dispatch table:  {table_time * 1e9 / count:8.1f} ns/event")
+    print(f"speedup:         {legacy_time / table_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
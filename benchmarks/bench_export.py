@@ -0,0 +1,89 @@
+"""
+EDMC Income Tracker Plugin - Transaction export throughput and memory benchmark
+
+Writes synthetic ledgers for three commanders, then exports them to CSV and
+JSON Lines: everything, and filtered to one category over the last 30 days.
+Peak traced memory should stay flat however many rows are exported.
+
+Usage:
+    python benchmarks/bench_export.py [rows]
+"""
+
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.commander_ledger import partition_dir  # noqa: E402
+from src.constants import LEDGER_FILE_NAME  # noqa: E402
+from src.export import export_file, ledger_sources  # noqa: E402
+from src.ledger_file import LedgerFile  # noqa: E402
+
+CATEGORIES = ["trading", "combat", "exploration", "missions", "maintenance"]
+COMMANDERS = ["Cmdr One", "Cmdr Two", "Cmdr Three"]
+START_TIME = 1_700_000_000.0
+SPAN = 365 * 86400
+
+
+def records(count: int, seed: int):
+    rng = random.Random(seed)
+    systems = [f"System {i}" for i in range(2000)]
+    step = SPAN / count
+    for i in range(count):
+        yield (START_TIME + i * step, rng.uniform(-50_000, 900_000), rng.choice(CATEGORIES),
+               rng.choice(systems), rng.choice(("Station A", "Station B", None)))
+
+
+def populate(data_dir: str, count: int):
+    """Split `count` transactions across the commanders' ledgers"""
+    for seed, cmdr in enumerate(COMMANDERS):
+        directory = partition_dir(data_dir, cmdr)
+        os.makedirs(directory, exist_ok=True)
+        ledger = LedgerFile(os.path.join(directory, LEDGER_FILE_NAME))
+        ledger.truncate()
+        ledger.append_many(records(count // len(COMMANDERS), seed))
+        ledger.close()
+
+
+def measure(func) -> tuple:
+    """(result, peak traced allocation in bytes) of func"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    directory = tempfile.mkdtemp(prefix="edmc-income-export-")
+    try:
+        populate(directory, count)
+        sources = ledger_sources(directory)
+        month = START_TIME + SPAN - 30 * 86400
+        output = os.path.join(directory, "export")
+
+        print(f"{'export':<28}{'rows':>12}{'seconds':>10}{'rows/s':>12}{'peak KiB':>10}{'MB':>8}")
+        for export_format in ("csv", "jsonl"):
+            for name, filters in (
+                ("all", {}),
+                ("trading, 30 days", {"start": month, "categories": {"trading"}}),
+            ):
+                # Throughput untraced, then memory traced (tracemalloc slows allocation down)
+                stats = export_file(output, sources, export_format, **filters)
+                _, peak = measure(lambda: export_file(output, sources, export_format, **filters))
+                print(f"{export_format + ' ' + name:<28}{stats['rows']:>12,}{stats['seconds']:>10.2f}"
+                      f"{stats['rows_per_second']:>12,.0f}{peak / 1024:>10.1f}{os.path.getsize(output) / 1e6:>8.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+EDMC Income Tracker Plugin - SQLite history insert and query benchmark
+
+Inserts synthetic transactions spread over a year, then times the single-row
+add() path used by EDMCIncome.transaction() and each HistoryDatabase query
+over the full table and over the last 7 days.
+
+Usage:
+    python benchmarks/bench_history_db.py [rows]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.history_db import HistoryDatabase  # noqa: E402
+
+CATEGORIES = ["trading", "combat", "exploration", "missions", "maintenance"]
+EVENTS = ["MarketSell", "RedeemVoucher", "SellExplorationData", "MissionCompleted", "RefuelAll"]
+START_TIME = 1_700_000_000.0
+SPAN = 365 * 86400
+
+
+def rows(count: int, seed: int = 4):
+    rng = random.Random(seed)
+    systems = [f"System {i}" for i in range(2000)]
+    commanders = ["Cmdr One", "Cmdr Two", "Cmdr Three"]
+    step = SPAN / count
+    for i in range(count):
+        index = rng.randrange(len(CATEGORIES))
+        yield (START_TIME + i * step, rng.uniform(-50_000, 900_000), CATEGORIES[index], EVENTS[index],
+               rng.choice(commanders), rng.choice(systems), None)
+
+
+def timed(func, repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    directory = tempfile.mkdtemp(prefix="edmc-income-history-")
+    try:
+        history = HistoryDatabase(os.path.join(directory, "history.sqlite3"))
+        history.open()
+
+        start = time.perf_counter()
+        history.add_many(rows(count))
+        elapsed = time.perf_counter() - start
+        print(f"bulk insert: {count:,} rows in {elapsed:.2f} s ({count / elapsed:,.0f} rows/s)")
+
+        single = 10_000
+        now = START_TIME + SPAN
+        start = time.perf_counter()
+        for i in range(single):
+            history.add(now + i, 1000.0, "trading", "MarketSell", "Cmdr One", "System 1", "Station")
+        history.flush()
+        print(f"add(): {(time.perf_counter() - start) * 1e6 / single:.1f} us/row (batched)")
+
+        week = now - 7 * 86400
+        print(f"{'query':<28}{'all ms':>10}{'7 days ms':>12}")
+        for name, query in (
+            ("count", lambda **f: history.count(**f)),
+            ("totals_by_day", lambda **f: history.totals_by_day(**f)),
+            ("totals_by_category", lambda **f: history.totals_by_category(**f)),
+            ("totals_by_system", lambda **f: history.totals_by_system(10, **f)),
+            ("top_transactions", lambda **f: history.top_transactions(10, **f)),
+        ):
+            print(f"{name:<28}{timed(query):>10.1f}{timed(lambda: query(start=week)):>12.1f}")
+        history.close()
+        print(f"file size: {os.path.getsize(history.path) / 1e6:.1f} MB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
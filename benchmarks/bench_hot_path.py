@@ -0,0 +1,312 @@
+"""
+EDMC Income Tracker Plugin - Hot path throughput and latency benchmarks
+
+Runs headless (see src/headless) and covers:
+    journal_entry    load.journal_entry -> JournalProcessor -> EDMCIncome.transaction -> update_window
+    speed            EDMCIncome.speed() at various ledger sizes
+    save_state       EDMCIncome.save_state() at various ledger sizes
+    load_state       EDMCIncome.load_state() at various ledger sizes (from the snapshot)
+    hydrate          Reading the full history after a snapshot load
+
+Usage:
+    python benchmarks/bench_hot_path.py                       # print results
+    python benchmarks/bench_hot_path.py --save baselines/x.json
+    python benchmarks/bench_hot_path.py --compare benchmarks/baselines/baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.headless import edmc_stubs  # noqa: E402
+from src.headless.replay import DEFAULT_CONFIG  # noqa: E402
+
+config = edmc_stubs.install(tempfile.mkdtemp(prefix="edmc-income-bench-"), dict(DEFAULT_CONFIG, **{
+    "EDMCIncomeTracker_reset_on_close": 0,
+    "EDMCIncomeTracker_compact_after_days": 0,  # Measure the full, uncompacted history
+}))
+
+import load  # noqa: E402
+from src.income_tracker import EDMCIncome  # noqa: E402
+
+LEDGER_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+QUICK_LEDGER_SIZES = [100, 1_000, 10_000]
+STREAM_LENGTH = 50_000
+
+# Relative weights of journal events in a typical mixed session
+EVENT_MIX = [
+    (30, lambda rng: {"event": "Music", "MusicTrack": "Exploration"}),
+    (15, lambda rng: {"event": "ReceiveText", "From": "", "Message": "...", "Channel": "npc"}),
+    (12, lambda rng: {"event": "FSDJump", "StarSystem": f"Sys {rng.randrange(5000)}", "JumpDist": rng.uniform(5, 60)}),
+    (12, lambda rng: {"event": "Scan", "BodyName": f"Body {rng.randrange(100)}", "PlanetClass": "Icy body"}),
+    (8, lambda rng: {"event": "FSSSignalDiscovered", "SignalName": "USS"}),
+    (4, lambda rng: {"event": "Docked", "StationName": f"Station {rng.randrange(50)}"}),
+    (4, lambda rng: {"event": "Undocked", "StationName": ""}),
+    (3, lambda rng: {"event": "MarketBuy", "Type": "gold", "Count": 100, "BuyPrice": 9000, "TotalCost": 900000}),
+    (3, lambda rng: {"event": "MarketSell", "Type": "gold", "Count": 100, "SellPrice": 11000, "TotalSale": 1100000}),
+    (2, lambda rng: {"event": "RefuelAll", "Cost": rng.randrange(100, 5000), "Amount": 16.0}),
+    (2, lambda rng: {"event": "MissionCompleted", "Reward": rng.randrange(10000, 900000), "Donation": 0}),
+    (2, lambda rng: {"event": "RedeemVoucher", "Type": "bounty", "Amount": rng.randrange(1000, 500000)}),
+    (1, lambda rng: {"event": "MultiSellExplorationData", "TotalEarnings": rng.randrange(10000, 5000000)}),
+    (1, lambda rng: {"event": "RepairAll", "Cost": rng.randrange(100, 20000)}),
+    (1, lambda rng: {"event": "PayFines", "Amount": rng.randrange(100, 5000)}),
+]
+
+
+#region Workloads
+def synthetic_journal(count: int, seed: int = 1):
+    """Generate journal entries with a realistic event mix and increasing timestamps"""
+    rng = random.Random(seed)
+    weights = [w for w, _ in EVENT_MIX]
+    makers = [m for _, m in EVENT_MIX]
+    timestamp = 1_700_000_000
+    for _ in range(count):
+        timestamp += rng.randint(1, 40)
+        entry = rng.choices(makers, weights)[0](rng)
+        entry["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+        yield entry
+
+
+def populate(tracker: EDMCIncome, size: int, seed: int = 2):
+    """Fill a tracker's ledger with `size` transactions and load it"""
+    rng = random.Random(seed)
+    categories = ["trading", "combat", "exploration", "missions", "maintenance"]
+    timestamp = 1_700_000_000.0
+
+    def records():
+        nonlocal timestamp
+        for _ in range(size):
+            timestamp += rng.uniform(5, 900)
+            yield timestamp, rng.uniform(-50_000, 900_000), rng.choice(categories)
+
+    # Fill whichever commander's ledger load_state() makes active
+    tracker.load_state(reset_on_close=False)
+    tracker.ledger.clear()  # Cancels the hydration load_state() started before truncating
+    tracker.ledger_file.append_many(records())
+    reload(tracker)
+    settle(tracker)
+    tracker.ledger.save_snapshot()
+
+
+def reload(tracker: EDMCIncome):
+    """Read the active ledger from disk again (loaded commander ledgers are otherwise cached)"""
+    tracker.ledger.loaded = False
+    tracker.load_state(reset_on_close=False)
+
+
+def settle(tracker: EDMCIncome):
+    """Wait for a background hydration so it does not overlap the next measurement"""
+    if tracker._hydration_thread:
+        tracker._hydration_thread.join()
+
+
+class HeadlessUI:
+    """Does the model-side work of a repaint (what IncomeTrackerUI reads) without Tk"""
+
+    def __init__(self, income_tracker):
+        self.income_tracker = income_tracker
+
+    def request_update(self):
+        tracker = self.income_tracker
+        tracker.speed()
+        for category in ("trading", "combat", "exploration", "missions", "maintenance"):
+            tracker.trip_earnings_by_category(category)
+        tracker.get_current_credits()
+        tracker.top_stations(5)
+        tracker.top_systems(5)
+#endregion
+
+
+#region Measurement helpers
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _latency_summary(samples_ns):
+    samples_ns.sort()
+    total = sum(samples_ns)
+    return {
+        "count": len(samples_ns),
+        "ops_per_second": len(samples_ns) / (total / 1e9) if total else 0.0,
+        "mean_us": statistics.fmean(samples_ns) / 1000.0 if samples_ns else 0.0,
+        "p50_us": _percentile(samples_ns, 0.50) / 1000.0,
+        "p99_us": _percentile(samples_ns, 0.99) / 1000.0,
+    }
+
+
+def _peak_memory(func):
+    """Peak traced allocation (bytes) while running func"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+#endregion
+
+
+#region Benchmarks
+def bench_journal_entry(length: int) -> dict:
+    load.plugin_start3(ROOT)
+    manager = load.this.plugin_manager
+    manager.income_tracker.reset()
+    manager.income_tracker.ui = HeadlessUI(manager.income_tracker)
+    state = {"Credits": 10_000_000}
+    entries = list(synthetic_journal(length))
+
+    samples = []
+    clock = time.perf_counter_ns
+    for entry in entries:
+        start = clock()
+        load.journal_entry("Bench", False, "Sol", "Abraham Lincoln", entry, state)
+        samples.append(clock() - start)
+    result = _latency_summary(samples)
+    result["transactions"] = len(manager.income_tracker.transactions)
+
+    manager.income_tracker.reset()
+    result["peak_memory_bytes"] = _peak_memory(
+        lambda: [load.journal_entry("Bench", False, "Sol", None, entry, state) for entry in entries]
+    )
+    load.plugin_stop()
+    return result
+
+
+def _bench_at_sizes(sizes, operation, repeat: int, prepare=None) -> dict:
+    results = {}
+    for size in sizes:
+        tracker = EDMCIncome(None)
+        tracker.compact_after_days = 0
+        populate(tracker, size)
+        samples = []
+        for _ in range(repeat):
+            if prepare:
+                prepare(tracker)
+            start = time.perf_counter_ns()
+            operation(tracker)
+            samples.append(time.perf_counter_ns() - start)
+            settle(tracker)
+        if prepare:
+            prepare(tracker)
+        summary = _latency_summary(samples)
+        summary["peak_memory_bytes"] = _peak_memory(lambda: operation(tracker))
+        settle(tracker)
+        results[str(size)] = summary
+        tracker.close()
+    return results
+
+
+def bench_speed(sizes) -> dict:
+    return _bench_at_sizes(sizes, lambda tracker: tracker.speed(), repeat=1000)
+
+
+def bench_save_state(sizes) -> dict:
+    return _bench_at_sizes(sizes, lambda tracker: tracker.save_state(), repeat=20)
+
+
+def bench_load_state(sizes) -> dict:
+    return _bench_at_sizes(sizes, reload, repeat=3)
+
+
+def _load_snapshot_only(tracker: EDMCIncome):
+    tracker.ledger.loaded = False
+    tracker.ledger.load()
+
+
+def bench_hydrate(sizes) -> dict:
+    return _bench_at_sizes(sizes, lambda tracker: tracker.ledger.hydrate(), repeat=3, prepare=_load_snapshot_only)
+#endregion
+
+
+#region Reporting
+def run(quick: bool) -> dict:
+    sizes = QUICK_LEDGER_SIZES if quick else LEDGER_SIZES
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "journal_entry": bench_journal_entry(STREAM_LENGTH // 10 if quick else STREAM_LENGTH),
+        "speed": bench_speed(sizes),
+        "save_state": bench_save_state(sizes),
+        "load_state": bench_load_state(sizes),
+        "hydrate": bench_hydrate(sizes),
+    }
+
+
+def _rows(results: dict):
+    """(row name, summary) of every benchmark in the results; older baselines may lack some sections"""
+    if "journal_entry" in results:
+        yield "journal_entry", results["journal_entry"]
+    for name in ("speed", "save_state", "load_state", "hydrate"):
+        for size, summary in results.get(name, {}).items():
+            yield f"{name}[{size}]", summary
+
+
+def print_results(results: dict):
+    print(f"{'benchmark':<24} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for name, summary in _rows(results):
+        print(f"{name:<24} {summary['ops_per_second']:>12,.1f} {summary['p50_us']:>10.2f} "
+              f"{summary['p99_us']:>10.2f} {summary['peak_memory_bytes'] / 1024:>10,.1f}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> int:
+    """Print p50 changes against a baseline; returns the number of regressions"""
+    baseline_rows = dict(_rows(baseline))
+    regressions = 0
+    print(f"\n{'benchmark':<24} {'base p50':>10} {'now p50':>10} {'change':>8}")
+    for name, summary in _rows(results):
+        base = baseline_rows.get(name)
+        if not base or not base["p50_us"]:
+            continue
+        change = summary["p50_us"] / base["p50_us"] - 1.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<24} {base['p50_us']:>10.2f} {summary['p50_us']:>10.2f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Income Tracker hot path benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Smaller ledgers and journal stream")
+    parser.add_argument("--save", metavar="FILE", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown before flagging (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+    print_results(results)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
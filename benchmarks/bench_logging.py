@@ -0,0 +1,77 @@
+"""
+EDMC Income Tracker Plugin - Per-event logging overhead benchmark
+
+Compares the old eager helpers (f-string formatted before the call) with the
+lazy log_* helpers, with debug logging off, with the in-memory log buffer on,
+and with debug logging fully enabled.
+
+Usage:
+    python benchmarks/bench_logging.py [events]
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import utils  # noqa: E402
+from src.utils import log_debug, logger  # noqa: E402
+
+
+def eager_log_debug(message: str) -> None:
+    """The helper as it was before lazy formatting"""
+    logger.debug(f"[Income Tracker - Debug] {message}")
+
+
+def eager_event(earnings, category, credits, count):
+    eager_log_debug(f"[CREDITS] {credits:,}")
+    eager_log_debug(f"Recording transaction: {earnings:,.0f} Cr ({category})")
+    eager_log_debug(f"Total transactions: {count}")
+    eager_log_debug(f"Transaction recorded: {earnings:,.0f} Cr ({category})")
+
+
+def lazy_event(earnings, category, credits, count):
+    log_debug("[CREDITS] {:,}", credits)
+    log_debug("Recording transaction: {:,.0f} Cr ({})", earnings, category)
+    log_debug("Total transactions: {}", count)
+    log_debug("Transaction recorded: {:,.0f} Cr ({})", earnings, category)
+
+
+def measure(func, events):
+    start = time.perf_counter()
+    for i in range(events):
+        func(123456.0 + i, "trading", 98765432, i)
+    return (time.perf_counter() - start) * 1e9 / events
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    # Discard output; we only care about the cost of producing it
+    logger.handlers[:] = [logging.NullHandler()]
+    logger.propagate = False
+
+    logger.setLevel(logging.INFO)
+    utils.disable_log_buffer()
+    eager_off = measure(eager_event, events)
+    lazy_off = measure(lazy_event, events)
+
+    utils.enable_log_buffer(200)
+    lazy_buffer = measure(lazy_event, events)
+    utils.disable_log_buffer()
+
+    logger.setLevel(logging.DEBUG)
+    eager_on = measure(eager_event, events)
+    lazy_on = measure(lazy_event, events)
+
+    print(f"events: {events:,} (4 debug lines each)")
+    print(f"{'':<28}{'eager ns/event':>16}{'lazy ns/event':>16}")
+    print(f"{'debug off':<28}{eager_off:>16.0f}{lazy_off:>16.0f}")
+    print(f"{'debug off, ring buffer on':<28}{'-':>16}{lazy_buffer:>16.0f}")
+    print(f"{'debug on':<28}{eager_on:>16.0f}{lazy_on:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
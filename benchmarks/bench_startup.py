@@ -0,0 +1,112 @@
+"""
+EDMC Income Tracker Plugin - Plugin import time budget
+
+Imports load.py in fresh interpreters with `-X importtime` (EDMC modules
+replaced by src/headless stand-ins) and fails when:
+    - the median cumulative import time of `load` exceeds the budget, or
+    - a module that should only load on first use (networking, Tk UI,
+      preferences panel widgets, debug tools) is imported at startup
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --budget-ms 80
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median cumulative import time of `load` allowed, in milliseconds
+STARTUP_BUDGET_MS = 120.0
+RUNS = 7
+
+# Modules only needed once the UI, settings panel, update check or debug tools are used
+# (the myNotebook and ttkHyperlinkLabel stand-ins are only created when imported)
+DEFERRED_MODULES = (
+    "requests",
+    "tkinter",
+    "myNotebook",
+    "ttkHyperlinkLabel",
+    "src.ui",
+    "src.update_checker",
+    "src.debug",
+)
+
+MARKER = "-- import load --"
+IMPORT_SCRIPT = (
+    "import sys\n"
+    "from src.headless import edmc_stubs\n"
+    "edmc_stubs.install()\n"
+    f"sys.stderr.write({MARKER!r} + '\\n')\n"
+    "import load\n"
+)
+
+
+def measure() -> tuple:
+    """
+    Import load once in a fresh interpreter.
+
+    Returns:
+        tuple: (cumulative import time of load in ms, {module: cumulative ms} imported by it)
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    lines = process.stderr.splitlines()
+    modules = {}
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Column header
+        modules[name.strip()] = int(cumulative) / 1000.0
+    return modules.get("load", 0.0), modules
+
+
+def deferred_imports(modules: dict) -> list:
+    """DEFERRED_MODULES entries that were imported, themselves or through a submodule"""
+    return [prefix for prefix in DEFERRED_MODULES
+            if any(name == prefix or name.startswith(prefix + ".") for name in modules)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Income Tracker plugin import time budget")
+    parser.add_argument("--runs", type=int, default=RUNS, help=f"Fresh interpreters to measure (default: {RUNS})")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Allowed median import time of load.py (default: {STARTUP_BUDGET_MS:g})")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list (default: 10)")
+    args = parser.parse_args(argv)
+
+    samples = []
+    modules = {}
+    for _ in range(args.runs):
+        elapsed, modules = measure()
+        samples.append(elapsed)
+    median = statistics.median(samples)
+
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for name, elapsed in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<40} {elapsed:>14.2f}")
+    print(f"\nload.py import: median {median:.2f} ms, min {min(samples):.2f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:g} ms)")
+
+    failures = 0
+    if median > args.budget_ms:
+        print(f"OVER BUDGET by {median - args.budget_ms:.2f} ms")
+        failures += 1
+    eager = deferred_imports(modules)
+    if eager:
+        print(f"Imported at startup but should load on first use: {', '.join(eager)}")
+        failures += 1
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
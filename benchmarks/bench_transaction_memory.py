@@ -0,0 +1,64 @@
+"""
+EDMC Income Tracker Plugin - Transaction storage memory benchmark
+
+Compares bytes per transaction of the legacy list of Transaction objects
+against the columnar TransactionStore.
+
+Usage:
+    python benchmarks/bench_transaction_memory.py
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import Transaction  # noqa: E402
+from src.transaction_store import TransactionStore  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+CATEGORIES = ["trading", "combat", "exploration", "missions", "maintenance"]
+
+
+def _sample(count):
+    rng = random.Random(count)
+    timestamp = 1_700_000_000.0
+    for _ in range(count):
+        timestamp += rng.uniform(5, 600)
+        yield rng.uniform(-50_000, 500_000), rng.choice(CATEGORIES), timestamp
+
+
+def _measure(build):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def _build_list(count):
+    return [Transaction(earnings, category, timestamp) for earnings, category, timestamp in _sample(count)]
+
+
+def _build_store(count):
+    store = TransactionStore()
+    for earnings, category, timestamp in _sample(count):
+        store.append(earnings, category, timestamp)
+    return store
+
+
+def main():
+    print(f"{'transactions':>12} {'list B/tx':>10} {'store B/tx':>11} {'ratio':>7}")
+    for count in SIZES:
+        list_bytes = _measure(lambda: _build_list(count))
+        store_bytes = _measure(lambda: _build_store(count))
+        print(f"{count:>12,} {list_bytes / count:>10.1f} {store_bytes / count:>11.1f} {list_bytes / store_bytes:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,17 @@
 EDMC Income Tracker Plugin - Track your income and earnings in Elite Dangerous
 """
 
-import tkinter as tk
 import sys
+from typing import TYPE_CHECKING
 from config import config # type: ignore
 from src.utils import log_info, log_error, log_warning, log_debug, log_critical
 
 # Import our modular components
 from src.plugin_manager import PluginManager
+from src.instrumentation import instrumentation
+
+if TYPE_CHECKING:
+    import tkinter as tk
 
 # Module globals
 this = sys.modules[__name__]
@@ -57,7 +61,7 @@ def plugin_stop() -> None:
     else:
         log_warning("plugin_stop() called but plugin_manager is None")
 
-def plugin_app(parent: tk.Frame) -> tk.Frame:
+def plugin_app(parent: "tk.Frame") -> "tk.Frame":
     """
     Create the plugin's main UI frame.
 
@@ -124,3 +128,8 @@ def dashboard_entry(cmdr: str, is_beta: bool, entry: dict) -> None:
     """
     if this.plugin_manager:
         this.plugin_manager.process_dashboard_entry(cmdr, is_beta, entry)
+
+
+# Hot-path timers (only wrapped while instrumentation is enabled)
+instrumentation.register(this, "journal_entry", "journal_entry")
+instrumentation.register(this, "dashboard_entry", "dashboard_entry")
@@ -0,0 +1,63 @@
+"""
+EDMC Income Tracker Plugin - Running income aggregates
+"""
+
+
+class IncomeAggregates:
+    """Keeps per-category and grand totals up to date as transactions are recorded"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.categories = {}
+        self.count = 0
+
+    def add(self, earnings: float, category: str):
+        """Account for a single transaction"""
+        self.total += earnings
+        self.categories[category] = self.categories.get(category, 0.0) + earnings
+        self.count += 1
+
+    def reset(self):
+        """Clear all totals"""
+        self.total = 0.0
+        self.categories = {}
+        self.count = 0
+
+    def add_summary(self, summary):
+        """Account for a compacted HistorySummary"""
+        self.total += summary.earnings
+        self.categories[summary.category] = self.categories.get(summary.category, 0.0) + summary.earnings
+        self.count += summary.count
+
+    def rebuild(self, transactions, summaries=()):
+        """Recompute all totals from a transaction history (and compacted summaries)"""
+        self.reset()
+        for summary in summaries:
+            self.add_summary(summary)
+        for t in transactions:
+            self.add(t.earnings, t.category)
+
+    def to_record(self) -> list:
+        return [self.total, self.categories, self.count]
+
+    def load_record(self, record):
+        """Restore totals saved with to_record()"""
+        total, categories, count = record
+        self.total = float(total)
+        self.categories = {category: float(amount) for category, amount in categories.items()}
+        self.count = int(count)
+
+    def by_category(self, category: str) -> float:
+        """Get the running total for a category"""
+        return self.categories.get(category, 0.0)
+
+    def matches(self, transactions, summaries=()) -> bool:
+        """Check the running totals against a full recompute of the history"""
+        expected = IncomeAggregates()
+        expected.rebuild(transactions, summaries)
+        if expected.count != self.count or abs(expected.total - self.total) > 1e-6:
+            return False
+        for category in set(expected.categories) | set(self.categories):
+            if abs(expected.by_category(category) - self.by_category(category)) > 1e-6:
+                return False
+        return True
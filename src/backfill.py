@@ -0,0 +1,216 @@
+"""
+EDMC Income Tracker Plugin - Historical journal backfill
+
+Rebuilds a transaction ledger from old Journal.*.log files using the same
+event mapping as JournalProcessor. Files are parsed in parallel; each
+worker writes its file's transactions, sorted, to a spill file, and the
+spill files are stream-merged in timestamp order into the ledger. Memory
+use depends on the largest single journal and the number of files, not on
+the total number of events.
+
+Usage:
+    python -m src.backfill <journal dir> [--output ledger.jsonl] [--workers N]
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.journal_processor import build_dispatch_table
+from src.ledger_file import LedgerFile
+from src.utils import parse_journal_timestamp
+
+JOURNAL_GLOB = "Journal.*.log"
+ALL_CATEGORIES = ("trading", "combat", "exploration", "missions")
+
+_EVENT_KEY = '"event"'
+
+# Most spill files merged at once (each one is an open file during the merge)
+MERGE_FAN_IN = 128
+
+
+def find_journal_files(journal_dir: str) -> list:
+    """List journal files in a directory"""
+    return sorted(glob.glob(os.path.join(journal_dir, JOURNAL_GLOB)))
+
+
+def _event_name(line: str):
+    """Pull the event name out of a raw journal line without parsing the JSON"""
+    key = line.find(_EVENT_KEY)
+    if key == -1:
+        return None
+    start = line.find('"', line.find(":", key + len(_EVENT_KEY)) + 1) + 1
+    end = line.find('"', start)
+    return line[start:end] if start and end != -1 else None
+
+
+def parse_journal_file(path: str, dispatch_table: dict):
+    """
+    Stream one journal file and extract its transactions.
+
+    Only lines whose event appears in the dispatch table are JSON-decoded.
+
+    Returns:
+        tuple: (events read, bytes read, sorted list of (time, earnings, category))
+    """
+    events = 0
+    records = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            events += 1
+            fields = dispatch_table.get(_event_name(line))
+            if not fields:
+                continue
+            try:
+                entry = json.loads(line)
+                timestamp = parse_journal_timestamp(entry["timestamp"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            for category, journal_key, sign in fields:
+                amount = entry.get(journal_key, 0)
+                if amount:
+                    records.append((timestamp, sign * amount, category))
+
+    records.sort(key=lambda r: r[0])
+    return events, os.path.getsize(path), records
+
+
+#region Spill files
+def _write_spill(path: str, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+
+
+def _read_spill(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def spill_journal_file(path: str, dispatch_table: dict, spill_dir: str):
+    """
+    Parse one journal file and write its sorted transactions to a spill file.
+
+    Returns:
+        tuple: (events read, bytes read, spill file path or None if it had no transactions)
+    """
+    events, size, records = parse_journal_file(path, dispatch_table)
+    if not records:
+        return events, size, None
+    spill_path = os.path.join(spill_dir, os.path.basename(path) + ".spill")
+    _write_spill(spill_path, records)
+    return events, size, spill_path
+
+
+def merge_spills(spill_paths: list, spill_dir: str, fan_in: int = None):
+    """
+    Stream the records of sorted spill files in timestamp order.
+
+    With more files than the fan-in, groups of them are first merged into
+    intermediate spill files, so at most `fan_in` files are open at once.
+    """
+    fan_in = fan_in or MERGE_FAN_IN
+    level = 0
+    while len(spill_paths) > fan_in:
+        merged = []
+        for index in range(0, len(spill_paths), fan_in):
+            group = spill_paths[index:index + fan_in]
+            merged_path = os.path.join(spill_dir, f"merge-{level}-{index // fan_in}.spill")
+            _write_spill(merged_path, heapq.merge(*(_read_spill(p) for p in group), key=lambda r: r[0]))
+            for p in group:
+                os.remove(p)
+            merged.append(merged_path)
+        spill_paths = merged
+        level += 1
+    return heapq.merge(*(_read_spill(p) for p in spill_paths), key=lambda r: r[0])
+#endregion
+
+
+def backfill(journal_dir: str, output_path: str, categories=ALL_CATEGORIES, workers: int = None, progress=None) -> dict:
+    """
+    Parse every journal file in a directory and write the merged ledger.
+
+    Args:
+        journal_dir: Directory containing Journal.*.log files
+        output_path: Ledger file to (re)write
+        categories: Income categories to include (maintenance is always included)
+        workers: Process pool size (defaults to the CPU count)
+        progress: Optional callable(files_done, files_total)
+
+    Returns:
+        dict: files, events, bytes, transactions, seconds and events_per_second
+    """
+    files = find_journal_files(journal_dir)
+    dispatch_table = build_dispatch_table({category: category in categories for category in ALL_CATEGORIES})
+
+    started = time.perf_counter()
+    total_events = 0
+    total_bytes = 0
+    spill_paths = []
+    spill_dir = tempfile.mkdtemp(prefix="edmc-income-backfill-")
+
+    try:
+        # Each worker streams its own file into a sorted spill file; only the paths come back
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(spill_journal_file, files, [dispatch_table] * len(files), [spill_dir] * len(files), chunksize=8)
+            for done, (events, size, spill_path) in enumerate(results, start=1):
+                total_events += events
+                total_bytes += size
+                if spill_path:
+                    spill_paths.append(spill_path)
+                if progress:
+                    progress(done, len(files))
+
+        ledger = LedgerFile(output_path)
+        ledger.truncate()
+        count = ledger.append_many(merge_spills(spill_paths, spill_dir))
+        ledger.close()
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": len(files),
+        "events": total_events,
+        "bytes": total_bytes,
+        "transactions": count,
+        "seconds": elapsed,
+        "events_per_second": total_events / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild an income ledger from Elite Dangerous journal files")
+    parser.add_argument("journal_dir", help="Directory containing Journal.*.log files")
+    parser.add_argument("--output", default="ledger.jsonl", help="Ledger file to write (default: ledger.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parser processes (default: CPU count)")
+    parser.add_argument("--categories", default=",".join(ALL_CATEGORIES),
+                        help="Comma separated income categories to include (maintenance is always included)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.journal_dir):
+        parser.error(f"not a directory: {args.journal_dir}")
+
+    def progress(done, total):
+        print(f"\r{done}/{total} files", end="", file=sys.stderr, flush=True)
+
+    categories = tuple(c.strip() for c in args.categories.split(",") if c.strip())
+    stats = backfill(args.journal_dir, args.output, categories, args.workers, progress)
+    print(file=sys.stderr)
+
+    print(f"Files:        {stats['files']:,}")
+    print(f"Events:       {stats['events']:,} ({stats['bytes'] / 1e6:,.1f} MB)")
+    print(f"Transactions: {stats['transactions']:,} -> {args.output}")
+    print(f"Elapsed:      {stats['seconds']:.2f} s ({stats['events_per_second']:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
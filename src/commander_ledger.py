@@ -0,0 +1,356 @@
+"""
+EDMC Income Tracker Plugin - Per-commander ledger partitions
+"""
+
+import hashlib
+import os
+import re
+import threading
+from src.constants import (
+    LEDGER_FILE_NAME, ROLLING_WINDOWS, ROLLING_BUCKET_SECONDS, COMMANDERS_DIR_NAME,
+    TRADES_FILE_NAME, MISSIONS_FILE_NAME, VOUCHERS_FILE_NAME, EXPLORATION_FILE_NAME, SNAPSHOT_FILE_NAME, SNAPSHOT_VERSION
+)
+from src.utils import log_info, log_warning, load_json_file, save_json_file
+from src.ledger_file import LedgerFile
+from src.transaction_store import TransactionStore
+from src.aggregates import IncomeAggregates
+from src.play_time import ActivePlayTime
+from src.rolling_rate import RollingRate
+from src.profit_index import ProfitIndex
+from src.compaction import HistorySummary
+from src.trade_engine import TradeEngine
+from src.mission_tracker import MissionTracker
+from src.voucher_tracker import VoucherTracker
+from src.exploration_estimator import ExplorationEstimator
+
+
+def partition_dir(data_dir: str, cmdr: str = None, is_beta: bool = False) -> str:
+    """
+    Directory holding the ledger of a (commander, beta) partition.
+
+    Transactions seen before any commander is known go to the data directory
+    itself, where single-commander installs kept their ledger before partitions.
+    """
+    if cmdr is None:
+        return data_dir
+    # Readable but filesystem-safe name, with a hash so distinct names never collide
+    safe = re.sub(r"[^A-Za-z0-9_-]+", "_", cmdr).strip("_")[:40] or "commander"
+    digest = hashlib.sha1(cmdr.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(data_dir, COMMANDERS_DIR_NAME, f"{safe}-{digest}{'-beta' if is_beta else ''}")
+
+
+def remove_state_files(directory: str):
+    """Delete the tracker state files and the snapshot of a partition directory"""
+    for name in CommanderLedger.STATE_FILES:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+class CommanderLedger:
+    """Transaction history, running totals and ledger file of one (commander, beta) partition"""
+
+    # State files of the event trackers, kept next to the ledger file
+    TRACKER_FILES = (TRADES_FILE_NAME, MISSIONS_FILE_NAME, VOUCHERS_FILE_NAME, EXPLORATION_FILE_NAME)
+    # Every file that belongs with the ledger file
+    STATE_FILES = TRACKER_FILES + (SNAPSHOT_FILE_NAME,)
+
+    def __init__(self, cmdr: str, is_beta: bool, directory: str, idle_threshold: float, lock=None):
+        self.cmdr = cmdr
+        self.is_beta = is_beta
+        self.directory = directory
+        self.transactions = TransactionStore()
+        self.aggregates = IncomeAggregates()
+        self.play_time = ActivePlayTime(idle_threshold)
+        self.rolling = {name: RollingRate(seconds, ROLLING_BUCKET_SECONDS) for name, (_, seconds) in ROLLING_WINDOWS.items()}
+        self.summaries = []
+        self.profit = ProfitIndex()
+        self.location_summaries = {}  # (system, station) -> [earnings, count] of compacted transactions
+        self.ledger_file = LedgerFile(os.path.join(directory, LEDGER_FILE_NAME))
+        self.trades = TradeEngine(idle_threshold=idle_threshold)
+        self.missions = MissionTracker()
+        self.vouchers = VoucherTracker(idle_threshold)
+        self.exploration = ExplorationEstimator()
+        # Trackers with reset(), to_dict(), load_dict() and a dirty flag, by state file name
+        self.trackers = {
+            TRADES_FILE_NAME: self.trades,
+            MISSIONS_FILE_NAME: self.missions,
+            VOUCHERS_FILE_NAME: self.vouchers,
+            EXPLORATION_FILE_NAME: self.exploration,
+        }
+        self.current_credits = 0
+        self.loaded = False
+        self.hydrated = False  # Whether transactions, summaries and location_summaries hold the whole ledger
+        self.generation = 0  # Bumped by clear() so an in-flight compaction or hydration is discarded
+        self.lock = lock or threading.RLock()  # Guards swapping in the hydrated history
+        self._reading = threading.Lock()  # Held by hydrate() while it reads the ledger without the lock
+        self._snapshot_size = None  # Ledger size when the snapshot file was last written
+        self._snapshots_enabled = True  # False while the totals do not cover the whole ledger file
+
+    @property
+    def key(self):
+        return self.cmdr, self.is_beta
+
+    def load(self):
+        """
+        Load the running totals.
+
+        With a current snapshot only the records appended after it are read,
+        and the full history is left for hydrate(). Otherwise the whole ledger
+        is streamed into the store and running totals.
+        """
+        self.ledger_file.open()
+        self.clear_memory()
+        if self._restore_snapshot():
+            self.hydrated = False
+            log_info(f"Ledger totals restored from snapshot for {self.label()} ({self.aggregates.count} transactions)")
+        else:
+            self._load_full()
+            log_info(f"Ledger loaded for {self.label()} ({len(self.transactions)} transactions, {len(self.summaries)} summaries)")
+        self.load_trackers()
+        self._snapshots_enabled = True
+        self.loaded = True
+
+    def _load_full(self):
+        for kind, value in self.ledger_file.entries():
+            if kind == "summary":
+                summary = HistorySummary.from_record(value)
+                self.summaries.append(summary)
+                self.aggregates.add_summary(summary)
+                self.play_time.add_summary(summary)
+            elif kind == "location":
+                system, station, earnings, count = value[:4]
+                self.location_summaries[(system, station)] = [earnings, count]
+                self.profit.add(earnings, system, station, count)
+            else:
+                timestamp, earnings, category, system, station = value
+                self.transactions.append(earnings, category, timestamp, system, station)
+                self._account(timestamp, earnings, category, system, station)
+        self.hydrated = True
+
+    def _account(self, timestamp: float, earnings: float, category: str, system: str, station: str):
+        """Add a transaction to the running totals"""
+        self.aggregates.add(earnings, category)
+        self.profit.add(earnings, system, station)
+        self.play_time.add(timestamp)
+        for window in self.rolling.values():
+            window.add(timestamp, earnings, category)
+
+    def add(self, earnings: float, category: str, timestamp: float = None, system: str = None, station: str = None) -> float:
+        """Record a transaction and return its time"""
+        data = self.transactions.append(earnings, category, timestamp, system, station)
+        timestamp = data.time
+        self._account(timestamp, earnings, category, system, station)
+        self.ledger_file.append(timestamp, earnings, category, system, station)
+        return timestamp
+
+    #region Snapshot and hydration
+    def save_snapshot(self) -> bool:
+        """Write the running totals so the next load can skip reading the whole ledger"""
+        if not self.loaded or not self._snapshots_enabled:
+            return False
+        self.ledger_file.sync()
+        size = self.ledger_file.size()
+        if size == self._snapshot_size:
+            return False
+        saved = save_json_file(os.path.join(self.directory, SNAPSHOT_FILE_NAME), {
+            "version": SNAPSHOT_VERSION,
+            "cmdr": self.cmdr,
+            "is_beta": self.is_beta,
+            "ledger_size": size,
+            "fingerprint": self.ledger_file.fingerprint(size),
+            "idle_threshold": self.play_time.idle_threshold,
+            "aggregates": self.aggregates.to_record(),
+            "play_time": self.play_time.to_record(),
+            "rolling": {name: window.to_record() for name, window in self.rolling.items()},
+            "profit": self.profit.to_record(),
+        })
+        if saved:
+            self._snapshot_size = size
+        return saved
+
+    def _restore_snapshot(self) -> bool:
+        """Restore the running totals from a snapshot that matches the ledger file"""
+        data = load_json_file(os.path.join(self.directory, SNAPSHOT_FILE_NAME))
+        if not data or data.get("version") != SNAPSHOT_VERSION:
+            return False
+        size = data.get("ledger_size", -1)
+        # The ledger must still start with the records the snapshot was taken from
+        if not 0 <= size <= self.ledger_file.size() or self.ledger_file.fingerprint(size) != data.get("fingerprint"):
+            log_info(f"Snapshot of {self.label()} is out of date, reading the full ledger")
+            return False
+        try:
+            self.play_time.idle_threshold = data["idle_threshold"]
+            self.aggregates.load_record(data["aggregates"])
+            self.play_time.load_record(data["play_time"])
+            for name, window in self.rolling.items():
+                if name in data["rolling"]:
+                    window.load_record(data["rolling"][name])
+            self.profit.load_record(data["profit"])
+            # Records appended after the snapshot (e.g. before a crash)
+            for kind, value in self.ledger_file.entries(size):
+                if kind != "transaction":
+                    raise ValueError(f"unexpected {kind} record after the snapshot")
+                self._account(*value)
+        except (ValueError, TypeError, KeyError) as e:
+            log_warning(f"Ignoring damaged snapshot of {self.label()}: {e}")
+            self.clear_memory()
+            return False
+        self._snapshot_size = size
+        return True
+
+    def _read_history(self, start: int = 0, stop: int = None, store: TransactionStore = None, generation: int = None):
+        """
+        Read a byte range of the ledger into a store, summaries and location summaries.
+
+        Given a generation, the read stops and returns None as soon as clear() moves past it.
+        """
+        store = store if store is not None else TransactionStore()
+        summaries = []
+        locations = {}
+        entries = self.ledger_file.entries(start, stop)
+        try:
+            for kind, value in entries:
+                if generation is not None and generation != self.generation:
+                    return None
+                if kind == "summary":
+                    summaries.append(HistorySummary.from_record(value))
+                elif kind == "location":
+                    system, station, earnings, count = value[:4]
+                    locations[(system, station)] = [earnings, count]
+                else:
+                    timestamp, earnings, category, system, station = value
+                    store.append(earnings, category, timestamp, system, station)
+        finally:
+            entries.close()
+        return store, summaries, locations
+
+    def hydrate(self):
+        """
+        Read the full history into memory after a snapshot load (no-op once done).
+
+        The bulk of the file is read without holding the lock; records appended
+        meanwhile are read and the history swapped in under it. A clear() in
+        between cancels the read and waits for it to stop before truncating.
+        """
+        with self.lock:
+            if self.hydrated or not self.loaded:
+                return
+            generation = self.generation
+            size = self.ledger_file.size()
+
+        with self._reading:
+            history = self._read_history(0, size, generation=generation)
+        if history is None:
+            return
+        store, summaries, locations = history
+
+        with self.lock:
+            if self.hydrated or generation != self.generation:
+                return
+            self._read_history(size, None, store)
+            self.transactions = store
+            self.summaries = summaries
+            self.location_summaries = locations
+            self.hydrated = True
+        log_info(f"History hydrated for {self.label()} ({len(store)} transactions, {len(summaries)} summaries)")
+    #endregion
+
+    def clear_memory(self):
+        """Forget the in-memory history (the ledger file is kept)"""
+        self.generation += 1
+        self.transactions.clear()
+        self.summaries = []
+        self.location_summaries = {}
+        self.aggregates.reset()
+        self.profit.reset()
+        self.play_time.reset()
+        for window in self.rolling.values():
+            window.reset()
+        for tracker in self.trackers.values():
+            tracker.reset()
+
+    def clear(self):
+        """Forget the history, truncate the ledger file and delete the tracker files"""
+        with self.lock:
+            # The new generation cancels a hydration read; the file is only truncated once it has stopped
+            self.clear_memory()
+            with self._reading:
+                self.ledger_file.truncate()
+            remove_state_files(self.directory)
+            self._snapshot_size = None
+            self._snapshots_enabled = True
+            self.hydrated = True
+            self.loaded = True
+
+    def set_aside(self):
+        """
+        Start over after the ledger failed to load, keeping the file as ledger.jsonl.bad.
+
+        Nothing is deleted: the unreadable ledger is moved out of the way (the
+        history of the partition starts empty) and the trackers are restored
+        from their own files.
+        """
+        with self.lock:
+            self.ledger_file.close()
+            path = self.ledger_file.path
+            bad_path = path + ".bad"
+            suffix = 1
+            while os.path.exists(bad_path):
+                bad_path = f"{path}.bad{suffix}"
+                suffix += 1
+            if os.path.exists(path):
+                try:
+                    os.replace(path, bad_path)
+                    log_warning(f"Unreadable ledger of {self.label()} kept as {bad_path}")
+                except OSError as e:
+                    # Left in place: new records are appended to it, but no snapshot
+                    # may claim the old records are part of the (empty) totals
+                    log_warning(f"Could not set aside the ledger of {self.label()}: {e}")
+                    self._snapshots_enabled = False
+            try:
+                os.remove(os.path.join(self.directory, SNAPSHOT_FILE_NAME))
+            except FileNotFoundError:
+                pass
+            self.clear_memory()
+            self.load_trackers()
+            self._snapshot_size = None
+            self.hydrated = True
+            self.loaded = True
+
+    def load_trackers(self):
+        """Restore the event trackers from their state files"""
+        for name, tracker in self.trackers.items():
+            data = load_json_file(os.path.join(self.directory, name))
+            if not data:
+                continue
+            try:
+                tracker.load_dict(data)
+            except (ValueError, TypeError, KeyError) as e:
+                log_warning(f"Ignoring damaged {name} of {self.label()}: {e}")
+                tracker.reset()
+
+    def save_trackers(self):
+        """Write the state files of trackers changed since the last save"""
+        for name, tracker in self.trackers.items():
+            if tracker.dirty and save_json_file(os.path.join(self.directory, name), tracker.to_dict()):
+                tracker.dirty = False
+
+    def set_idle_threshold(self, idle_threshold: float):
+        if idle_threshold != self.play_time.idle_threshold:
+            self.hydrate()
+            self.play_time.set_idle_threshold(idle_threshold, self.transactions, self.summaries)
+
+    def close(self):
+        self.save_trackers()
+        self.save_snapshot()
+        self.ledger_file.close()
+
+    def label(self) -> str:
+        if self.cmdr is None:
+            return "(no commander)"
+        return f"{self.cmdr}{' (beta)' if self.is_beta else ''}"
+
+    def __repr__(self):
+        return f"CommanderLedger({self.cmdr!r}, is_beta={self.is_beta!r})"
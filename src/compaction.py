@@ -0,0 +1,146 @@
+"""
+EDMC Income Tracker Plugin - History compaction into summary buckets
+"""
+
+
+class HistorySummary:
+    """Folded transactions of one category within one period"""
+
+    __slots__ = ("period_start", "category", "earnings", "count", "play_time", "first_time", "last_time")
+
+    def __init__(self, period_start, category, earnings=0.0, count=0, play_time=0.0, first_time=None, last_time=None):
+        self.period_start = period_start
+        self.category = category
+        self.earnings = earnings
+        self.count = count
+        # Active play time attributed to these transactions (gap to each one's predecessor)
+        self.play_time = play_time
+        self.first_time = first_time
+        self.last_time = last_time
+
+    @property
+    def key(self):
+        return self.period_start, self.category
+
+    def merge(self, other: "HistorySummary"):
+        """Fold another summary for the same period and category into this one"""
+        self.earnings += other.earnings
+        self.count += other.count
+        self.play_time += other.play_time
+        self.first_time = min(self.first_time, other.first_time)
+        self.last_time = max(self.last_time, other.last_time)
+
+    def to_record(self) -> list:
+        return [self.period_start, self.category, self.earnings, self.count, self.play_time, self.first_time, self.last_time]
+
+    @classmethod
+    def from_record(cls, record) -> "HistorySummary":
+        return cls(*record[:7])
+
+    def __repr__(self):
+        return f"HistorySummary({self.period_start!r}, {self.category!r}, earnings={self.earnings!r}, count={self.count!r})"
+
+
+def count_older_than(store, cutoff: float) -> int:
+    """Number of leading transactions recorded before the cutoff time"""
+    times = store.times
+    count = 0
+    for timestamp in times:
+        if timestamp >= cutoff:
+            break
+        count += 1
+    return count
+
+
+def summarize(store, count: int, period: float, idle_threshold: float, previous_time: float = None) -> dict:
+    """
+    Fold the first `count` transactions of a store into per-period, per-category summaries.
+
+    Args:
+        store: TransactionStore
+        count: Number of leading transactions to fold
+        period: Summary bucket width in seconds (e.g. 3600 or 86400)
+        idle_threshold: Gaps shorter than this count as active play (same rule as ActivePlayTime)
+        previous_time: Time of the transaction just before the first one (from earlier summaries)
+
+    Returns:
+        dict: (period_start, category) -> HistorySummary
+    """
+    summaries = {}
+    names = store.category_names
+    for index in range(count):
+        timestamp = store.times[index]
+        earnings = store.amounts[index]
+        category = names[store.codes[index]]
+
+        gap = 0.0
+        if previous_time is not None:
+            time_diff = timestamp - previous_time
+            if time_diff < idle_threshold:
+                gap = time_diff
+        previous_time = timestamp
+
+        key = (timestamp // period * period, category)
+        summary = summaries.get(key)
+        if summary is None:
+            summary = summaries[key] = HistorySummary(key[0], category, first_time=timestamp, last_time=timestamp)
+        summary.earnings += earnings
+        summary.count += 1
+        summary.play_time += gap
+        summary.first_time = min(summary.first_time, timestamp)
+        summary.last_time = max(summary.last_time, timestamp)
+    return summaries
+
+
+def merge_summaries(existing, new: dict) -> list:
+    """Combine earlier summaries with newly folded ones, ordered by period"""
+    merged = {summary.key: summary for summary in existing}
+    for key, summary in new.items():
+        if key in merged:
+            merged[key].merge(summary)
+        else:
+            merged[key] = summary
+    return sorted(merged.values(), key=lambda s: (s.period_start, s.category))
+
+
+def totals(summaries=(), rows=()) -> dict:
+    """Per-category (earnings, count) over summaries and/or (time, earnings, category) rows"""
+    result = {}
+    for summary in summaries:
+        earnings, count = result.get(summary.category, (0.0, 0))
+        result[summary.category] = (earnings + summary.earnings, count + summary.count)
+    for _, earnings_row, category in rows:
+        earnings, count = result.get(category, (0.0, 0))
+        result[category] = (earnings + earnings_row, count + 1)
+    return result
+
+
+def summarize_locations(store, count: int) -> dict:
+    """Fold the location of the first `count` transactions into (system, station) -> [earnings, count]"""
+    locations = {}
+    names = store.location_names
+    for index in range(count):
+        system = names[store.systems[index]]
+        if system is None:
+            continue
+        key = (system, names[store.stations[index]])
+        entry = locations.get(key)
+        if entry is None:
+            locations[key] = [store.amounts[index], 1]
+        else:
+            entry[0] += store.amounts[index]
+            entry[1] += 1
+    return locations
+
+
+def merge_locations(existing: dict, new: dict) -> dict:
+    """Combine earlier location summaries with newly folded ones"""
+    merged = {key: list(entry) for key, entry in existing.items()}
+    for key, (earnings, count) in new.items():
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = [earnings, count]
+        else:
+            entry[0] += earnings
+            entry[1] += count
+    return merged
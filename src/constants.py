@@ -4,6 +4,8 @@ EDMC Income Tracker Plugin - Constants and configuration
 
 # Debug settings
 DEBUG_MODE = False
+INSTRUMENTATION_ENABLED = False  # Time hot-path hooks from startup (can also be toggled in the debug panel)
+LOG_BUFFER_SIZE = 200  # Recent log records kept in memory for the debug panel (DEBUG_MODE only)
 
 # Plugin information
 PLUGIN_NAME = "Income Tracker"
@@ -15,6 +17,10 @@ GITHUB_REPO_URL = "https://github.com/excalith/edmc-income-tracker"
 GITHUB_API_URL = "https://api.github.com/repos/excalith/edmc-income-tracker/releases/latest"
 #GITHUB_API_URL = "https://api.github.com/repos/excalith/excalith-start-page/releases/latest" #TEST URL WITH RELEASES
 
+# Latest release info is cached in the plugin data directory
+UPDATE_CACHE_FILE_NAME = "update_cache.json"
+UPDATE_POLL_INTERVAL_MS = 200
+
 # Configuration Keys
 CFG_SESSION_STATE = f"{PLUGIN_TECH_NAME}_session_state"
 CFG_EARNINGS = f"{PLUGIN_TECH_NAME}_earnings"
@@ -24,20 +30,98 @@ CFG_TRACK_TRADING = f"{PLUGIN_TECH_NAME}_track_trading"
 CFG_TRACK_COMBAT = f"{PLUGIN_TECH_NAME}_track_combat"
 CFG_TRACK_EXPLORATION = f"{PLUGIN_TECH_NAME}_track_exploration"
 CFG_TRACK_MISSIONS = f"{PLUGIN_TECH_NAME}_track_missions"
+CFG_IDLE_THRESHOLD = f"{PLUGIN_TECH_NAME}_idle_threshold"
+CFG_COMPACT_AFTER_DAYS = f"{PLUGIN_TECH_NAME}_compact_after_days"
+CFG_HISTORY_DB = f"{PLUGIN_TECH_NAME}_history_db"
+CFG_ACTIVE_COMMANDER = f"{PLUGIN_TECH_NAME}_active_commander"
+CFG_TRADE_COST_BASIS = f"{PLUGIN_TECH_NAME}_trade_cost_basis"
+
+# Gaps between transactions longer than this (in seconds) are not counted as active play
+IDLE_THRESHOLD_SECONDS = 1800
+
+# On-disk transaction ledger (stored in the plugin data directory)
+LEDGER_FILE_NAME = "ledger.jsonl"
+LEDGER_FSYNC_EVERY = 32        # records
+LEDGER_FSYNC_INTERVAL = 5.0    # seconds
+
+# Each (commander, beta) pair keeps its own ledger in a subdirectory of this
+COMMANDERS_DIR_NAME = "commanders"
+
+# Running totals saved next to each ledger so startup does not have to read the whole history
+SNAPSHOT_FILE_NAME = "snapshot.json"
+SNAPSHOT_VERSION = 1
+
+# Trade cost basis and cargo lots (stored next to each commander's ledger)
+TRADES_FILE_NAME = "trades.json"
+TRADE_COST_BASIS = "fifo"  # "fifo" or "average"
+
+# Mission lifecycle tracking (stored next to each commander's ledger)
+MISSIONS_FILE_NAME = "missions.json"
+MISSION_ACTIVE_LIMIT = 100                      # active missions kept (the game allows 20)
+MISSION_EXPIRY_GRACE_SECONDS = 7 * 24 * 60 * 60  # expired missions are dropped this long after expiry
+
+# Unredeemed bounty vouchers and combat bonds (stored next to each commander's ledger)
+VOUCHERS_FILE_NAME = "vouchers.json"
+VOUCHER_EXPIRY_SECONDS = 30 * 24 * 60 * 60  # pending vouchers older than this are dropped
+VOUCHER_BUCKET_SECONDS = 60 * 60            # pending values are grouped per hour for expiry
+
+# Unsold exploration data estimates (stored next to each commander's ledger)
+EXPLORATION_FILE_NAME = "exploration.json"
+
+# Optional SQLite history (stored in the plugin data directory, must be a local filesystem)
+HISTORY_DB_FILE_NAME = "history.sqlite3"
+HISTORY_DB_BATCH_SIZE = 256  # rows buffered before an insert transaction
+
+# Transaction export (suggested file name in the preferences panel)
+EXPORT_FILE_NAME = "income-transactions.csv"
+
+# History compaction: transactions older than this many days are folded into
+# per-period, per-category summary records (0 = never compact)
+COMPACT_AFTER_DAYS = 30
+COMPACTION_PERIOD_SECONDS = 24 * 60 * 60  # One summary per category per day
+COMPACTION_CHECK_EVERY = 500              # transactions between background compaction checks
+
+# Config writes are coalesced and flushed at most this often (seconds)
+CONFIG_FLUSH_INTERVAL = 10.0
+
+# Minimum time between two repaints of the main UI (milliseconds)
+UI_REFRESH_INTERVAL_MS = 250
+
+# Rolling income rate windows: UI element name -> (row title, window in seconds)
+ROLLING_WINDOWS = {
+    "rate_15m": ("Last 15m", 15 * 60),
+    "rate_1h": ("Last 1h", 60 * 60),
+}
+ROLLING_BUCKET_SECONDS = 60
+ROLLING_TICK_MS = 30 * 1000  # Repaint this often so rolling rates decay while idle
+
+# Number of systems and stations listed in the "Top Station" tooltip
+TOP_LOCATIONS_COUNT = 5
+
+# Number of commodities listed in the "Trade Profit" tooltip
+TOP_COMMODITIES_COUNT = 10
 
 # UI Element States - defines visibility rules for each element
 UI_ELEMENT_STATES = {
     "title": {"always_show": True},
     "reset": {"always_show": True},
     "speed": {"show_in": ["full", "compact"]},
+    "rate_15m": {"show_in": ["full"]},
+    "rate_1h": {"show_in": ["full"]},
     "earned": {"show_in": ["full", "compact"]},
     "maintenance": {"show_in": ["full"]},
     "total_credits": {"show_in": ["full"], "enabled": "show_total_credits"},
+    "top_station": {"show_in": ["full"]},
     "breakdown_toggle": {"show_in": ["full"]},
 	"trading": {"show_in": ["full"], "enabled": "track_trading", "requires": "show_breakdown"},
 	"combat": {"show_in": ["full"], "enabled": "track_combat", "requires": "show_breakdown"},
 	"exploration": {"show_in": ["full"], "enabled": "track_exploration", "requires": "show_breakdown"},
 	"missions": {"show_in": ["full"], "enabled": "track_missions", "requires": "show_breakdown"},
+	"trade_profit": {"show_in": ["full"], "enabled": "track_trading", "requires": "show_breakdown"},
+	"cargo_value": {"show_in": ["full"], "enabled": "track_trading", "requires": "show_breakdown"},
+	"unredeemed": {"show_in": ["full"], "enabled": "track_combat", "requires": "show_breakdown"},
+	"projected": {"show_in": ["full"], "enabled": "track_combat", "requires": "show_breakdown"},
+	"unsold_data": {"show_in": ["full"], "enabled": "track_exploration", "requires": "show_breakdown"},
 }
 
 # Event to category mappings for journal processing
@@ -57,14 +141,17 @@ JOURNAL_FIELDS = {
 # Journal Entry Event Mappings
 JOURNAL_EVENT_CATEGORIES = {
     "trading": {
+        # Cash flow, like every other row; realised profit and the cost of
+        # unsold cargo are TradeEngine's (Trade Profit and Cargo Value)
         "MarketSell":    (["total_sale"], [1]),
         "MarketBuy":     (["total_cost"], [-1]),
         "BuyTradeData":  (["cost"], [-1]),
         "SellMicroResources": (["price"], [1]),
     },
     "combat": {
+        # Bounties and combat bonds are income once redeemed; until then
+        # VoucherTracker keeps them as unredeemed
         "RedeemVoucher":    (["amount"], [1]),
-        "FactionKillBond":  (["reward"], [1]),
         "PayBounties":      (["amount"], [-1]),
         "PayFines":         (["amount"], [-1]),
     },
@@ -4,9 +4,19 @@ EDMC Income Tracker Plugin - Debug testing interface (with real data)
 
 import os
 import json
+import time
 import tkinter as tk
-from src.utils import log_debug
+from config import config # type: ignore
+from src import utils
+from src.utils import get_data_dir, log_debug
 from src.constants import JOURNAL_EVENT_CATEGORIES
+from src.instrumentation import instrumentation
+
+# How often the timing and log panels are refreshed (milliseconds)
+TIMING_REFRESH_MS = 1000
+
+# Number of recent log records shown in the log panel
+LOG_PANEL_LINES = 12
 
 DEBUG_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
@@ -67,8 +77,148 @@ class DebugInterface:
 
             row += 1
 
+        # Consistency check for the running totals
+        verify_btn = tk.Button(frame, text="Verify Totals", command=self._verify_aggregates, width=18)
+        verify_btn.grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        row += 1
+
+        self._create_timing_panel(frame, row)
+        row += 1
+
+        self._create_history_panel(frame, row)
+        row += 1
+
+        self._create_log_panel(frame, row)
+
         return frame
 
+    #region History panel
+    def _create_history_panel(self, frame, row):
+        """Create the SQLite history query section"""
+        title = tk.Label(frame, text="History", font=("Euro Caps", 9, "bold"))
+        title.grid(row=row, column=0, sticky=tk.NW, pady=(5, 2))
+
+        panel = tk.Frame(frame)
+        panel.grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+
+        tk.Button(panel, text="Last 7 Days", command=self._query_history, width=18).grid(row=0, column=0, sticky=tk.W)
+        self.history_label = tk.Label(panel, text="", font=("Courier", 8), justify=tk.LEFT, anchor=tk.W)
+        self.history_label.grid(row=1, column=0, sticky=tk.W)
+
+    def _query_history(self):
+        """Show the recent history report from the SQLite database"""
+        started = time.perf_counter()
+        report = self.income_tracker.history_report(days=7)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if not report:
+            self.history_label.config(text="(history database disabled)")
+            return
+
+        lines = ["-- by day --"]
+        for day, earnings, count in report["by_day"]:
+            lines.append(f"{time.strftime('%Y-%m-%d', time.gmtime(day)):<24}{earnings:>16,.0f}{count:>8}")
+        lines.append("-- by category --")
+        for category, earnings, count in report["by_category"]:
+            lines.append(f"{category:<24}{earnings:>16,.0f}{count:>8}")
+        lines.append("-- top systems --")
+        for system, earnings, count in report["top_systems"]:
+            lines.append(f"{system[:24]:<24}{earnings:>16,.0f}{count:>8}")
+        lines.append("-- top transactions --")
+        for timestamp, earnings, category, event, *_ in report["top_transactions"]:
+            lines.append(f"{(event or category)[:24]:<24}{earnings:>16,.0f}  {time.strftime('%m-%d %H:%M', time.gmtime(timestamp))}")
+        lines.append(f"query time: {elapsed_ms:.1f} ms")
+        self.history_label.config(text="\n".join(lines))
+        log_debug(f"DEBUG: History report took {elapsed_ms:.1f} ms")
+    #endregion
+
+    #region Timing panel
+    def _create_timing_panel(self, frame, row):
+        """Create the hot-path timing section"""
+        title = tk.Label(frame, text="Timing", font=("Euro Caps", 9, "bold"))
+        title.grid(row=row, column=0, sticky=tk.NW, pady=(5, 2))
+
+        panel = tk.Frame(frame)
+        panel.grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+
+        self.timing_enabled = tk.BooleanVar(value=instrumentation.enabled)
+        tk.Checkbutton(panel, text="Enabled", variable=self.timing_enabled, command=self._toggle_timing).grid(row=0, column=0, sticky=tk.W)
+        tk.Button(panel, text="Reset", command=instrumentation.reset, width=8).grid(row=0, column=1, padx=(5, 0))
+        tk.Button(panel, text="Dump JSON", command=self._dump_timing, width=10).grid(row=0, column=2, padx=(5, 0))
+
+        self.timing_label = tk.Label(panel, text="", font=("Courier", 8), justify=tk.LEFT, anchor=tk.W)
+        self.timing_label.grid(row=1, column=0, columnspan=3, sticky=tk.W)
+        self._refresh_timing()
+
+    def _toggle_timing(self):
+        if self.timing_enabled.get():
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+        log_debug(f"DEBUG: Instrumentation {'enabled' if instrumentation.enabled else 'disabled'}")
+
+    def _timing_text(self):
+        lines = [f"{'hook':<24}{'count':>8}{'p50us':>9}{'p99us':>9}{'maxus':>10}"]
+        for name, stats in instrumentation.snapshot().items():
+            lines.append(f"{name:<24}{stats['count']:>8}{stats['p50_us']:>9.0f}{stats['p99_us']:>9.0f}{stats['max_us']:>10.0f}")
+
+        ui = getattr(self.income_tracker, 'ui', None)
+        scheduler = getattr(ui, 'refresh_scheduler', None)
+        if scheduler:
+            repaints = scheduler.stats()
+            lines.append(f"repaints: {repaints['performed']} of {repaints['requested']} requested")
+        persistence = getattr(self.income_tracker, 'persistence', None)
+        if persistence:
+            writes = persistence.stats()
+            lines.append(f"config writes: {writes['performed']} of {writes['requested']} requested")
+        ledger = getattr(self.income_tracker, 'ledger', None)
+        if ledger:
+            loaded = sum(1 for partition in self.income_tracker.ledgers.values() if partition.loaded)
+            lines.append(f"ledger: {ledger.label()} ({loaded} of {len(self.income_tracker.ledgers)} partitions loaded)")
+        return "\n".join(lines)
+
+    def _refresh_timing(self):
+        if not self.timing_label.winfo_exists():
+            return
+        self.timing_label.config(text=self._timing_text())
+        self.timing_label.after(TIMING_REFRESH_MS, self._refresh_timing)
+
+    def _create_log_panel(self, frame, row):
+        """Create the recent log records section"""
+        title = tk.Label(frame, text="Log", font=("Euro Caps", 9, "bold"))
+        title.grid(row=row, column=0, sticky=tk.NW, pady=(5, 2))
+
+        self.log_label = tk.Label(frame, text="", font=("Courier", 8), justify=tk.LEFT, anchor=tk.W)
+        self.log_label.grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        self._refresh_log()
+
+    def _refresh_log(self):
+        if not self.log_label.winfo_exists():
+            return
+        if utils.log_buffer is None:
+            text = "(log buffer disabled)"
+        else:
+            text = "\n".join(line[:100] for line in utils.log_buffer.lines(LOG_PANEL_LINES))
+        self.log_label.config(text=text)
+        self.log_label.after(TIMING_REFRESH_MS, self._refresh_log)
+
+    def _dump_timing(self):
+        """Write the current timings to a JSON file in the plugin data directory"""
+        data_dir = get_data_dir(config)
+        os.makedirs(data_dir, exist_ok=True)
+        path = os.path.join(data_dir, f"timings-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            instrumentation.dump(path)
+            log_debug(f"DEBUG: Timings written to {path}")
+        except OSError as e:
+            log_debug(f"DEBUG: Failed to write timings: {e}")
+    #endregion
+
+    def _verify_aggregates(self):
+        """Compare the running totals against a full recompute"""
+        if hasattr(self.income_tracker, 'verify_aggregates'):
+            ok = self.income_tracker.verify_aggregates()
+            log_debug(f"DEBUG: Aggregate verification {'passed' if ok else 'FAILED'}")
+
     def _test_event_from_file(self, category, event_name):
         """Load a real journal event JSON from category/event path and process it"""
         log_debug(f"DEBUG: Button clicked for {category}/{event_name}")
@@ -100,13 +250,16 @@ class DebugInterface:
             "IsDocked": True
         }
 
+        # Test events go to the active commander's ledger
+        cmdr, is_beta = self.income_tracker.ledger.key
         result = self.journal_processor.process_journal_entry(
-            cmdr="TestCommander",
-            is_beta=False,
+            cmdr=cmdr,
+            is_beta=is_beta,
             system="Test System",
             station="Test Station",
             entry=transformed_entry,
-            state=mock_state
+            state=mock_state,
+            synthetic=True
         )
 
         log_debug(f"DEBUG: Test result: {result}")
@@ -114,7 +267,3 @@ class DebugInterface:
         # Trigger UI refresh if available
         if hasattr(self.income_tracker, 'update_window'):
             self.income_tracker.update_window()
-
-        # Also refresh the UI display to show updated values
-        if hasattr(self.income_tracker, 'ui') and hasattr(self.income_tracker.ui, 'update_display'):
-            self.income_tracker.ui.update_display()
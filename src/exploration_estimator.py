@@ -0,0 +1,192 @@
+"""
+EDMC Income Tracker Plugin - Unsold exploration data value estimates
+"""
+
+from functools import lru_cache
+
+# Base values (k) of the community cartographic value formula
+STAR_VALUES = {"N": 22628, "H": 22628, "D": 14057}  # Neutron stars, black holes, white dwarfs (DA, DB, ...)
+STAR_DEFAULT_VALUE = 1200
+PLANET_VALUES = {
+    # Planet class -> (k, extra k when terraformable)
+    "Metal rich body": (21790, 0),
+    "Ammonia world": (96932, 0),
+    "Sudarsky class I gas giant": (1656, 0),
+    "Sudarsky class II gas giant": (9654, 0),
+    "High metal content body": (9654, 100677),
+    "Earthlike body": (64831, 116295),
+    "Water world": (64831, 116295),
+}
+PLANET_DEFAULT_VALUES = (300, 93328)
+GAS_GIANT_MASS = 100.0  # Earth masses; other bodies are valued at 1 Earth mass
+
+FIRST_DISCOVERY_MULTIPLIER = 2.6
+MAPPED_MULTIPLIER = 3.3333333333
+FIRST_MAPPED_MULTIPLIER = 3.699622554  # Mapped first and discovered first
+FIRST_MAPPED_ONLY_MULTIPLIER = 8.0956  # Mapped first, discovered by someone else
+MINIMUM_PLANET_VALUE = 500
+
+
+@lru_cache(maxsize=512)
+def body_value(body_class: str, terraformable: bool, mapped: int, first_discovery: bool) -> int:
+    """
+    Estimated sale value of a scanned body.
+
+    Bodies are valued at a nominal mass, so a valuation depends only on its
+    arguments and is cached: a honk followed by a scanning burst values
+    hundreds of bodies from a handful of distinct keys.
+
+    Args:
+        body_class: StarType for stars (prefixed "star:"), PlanetClass for planets
+        terraformable: Whether the planet is a terraforming candidate
+        mapped: 0 if not mapped, 1 if mapped before, 2 if mapped first
+        first_discovery: Whether the body was undiscovered when scanned
+    """
+    if body_class.startswith("star:"):
+        star_type = body_class[5:]
+        k = STAR_VALUES.get(star_type[:1] if star_type.startswith("D") else star_type, STAR_DEFAULT_VALUE)
+        value = k + k / 66.25
+        return round(value * FIRST_DISCOVERY_MULTIPLIER if first_discovery else value)
+
+    k, terraformable_k = PLANET_VALUES.get(body_class, PLANET_DEFAULT_VALUES)
+    if terraformable or body_class == "Earthlike body":
+        k += terraformable_k
+    mass = GAS_GIANT_MASS if "gas giant" in body_class.lower() else 1.0
+    value = k + k * 0.56591828 * mass ** 0.2
+    if mapped == 2:
+        value *= FIRST_MAPPED_MULTIPLIER if first_discovery else FIRST_MAPPED_ONLY_MULTIPLIER
+    elif mapped:
+        value *= MAPPED_MULTIPLIER
+    value = max(value, MINIMUM_PLANET_VALUE)
+    return round(value * FIRST_DISCOVERY_MULTIPLIER if first_discovery else value)
+
+
+class ExplorationEstimator:
+    """
+    Estimated value of exploration data scanned but not sold yet.
+
+    Bodies are indexed by system name and body id, with a running value per
+    system, so a scan is O(1) and a sale is O(systems sold).
+    """
+
+    EVENTS = ("FSSDiscoveryScan", "Scan", "SAAScanComplete", "SellExplorationData", "MultiSellExplorationData", "Died")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all unsold data"""
+        self.systems = {}          # system name -> {body id: [class, terraformable, mapped, first discovery, mapped before, value]}
+        self.system_values = {}    # system name -> estimated value of its bodies
+        self.total = 0             # Estimated value of every unsold system
+        self.system_names = {}     # SystemAddress -> system name (for events without StarSystem)
+        self.dirty = False
+
+    def _system(self, entry: dict) -> str:
+        name = entry.get("StarSystem") or entry.get("SystemName")
+        address = entry.get("SystemAddress")
+        if name:
+            if address is not None:
+                self.system_names[address] = name
+            return name
+        return self.system_names.get(address)
+
+    def _set_body(self, system: str, body_id, body: list):
+        value = body_value(body[0], body[1], body[2], body[3])
+        bodies = self.systems.setdefault(system, {})
+        previous = bodies.get(body_id)
+        delta = value - (previous[5] if previous else 0)
+        body.append(value)
+        bodies[body_id] = body
+        self.system_values[system] = self.system_values.get(system, 0) + delta
+        self.total += delta
+
+    def _sold(self, system: str):
+        self.systems.pop(system, None)
+        self.total -= self.system_values.pop(system, 0)
+
+    def handle_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: value scans and drop systems once their data is sold"""
+        event = entry.get("event")
+        if event == "FSSDiscoveryScan":
+            self._system(entry)  # Learn the system name for the scans that follow
+            return
+        if event == "Scan":
+            if entry.get("ScanType") == "NavBeaconDetail":
+                return  # Nav beacon data cannot be sold
+            if "StarType" in entry:
+                body_class = f"star:{entry['StarType']}"
+            elif "PlanetClass" in entry:
+                body_class = entry["PlanetClass"]
+            else:
+                return  # Belt clusters and rings
+            system = self._system(entry)
+            if system is None:
+                return
+            body_id = entry.get("BodyID", entry.get("BodyName"))
+            previous = self.systems.get(system, {}).get(body_id)
+            mapped = previous[2] if previous else 0
+            self._set_body(system, body_id, [
+                body_class,
+                entry.get("TerraformState") == "Terraformable",
+                mapped,
+                entry.get("WasDiscovered") is False,
+                bool(entry.get("WasMapped")),
+            ])
+        elif event == "SAAScanComplete":
+            system = self._system(entry)
+            previous = self.systems.get(system, {}).get(entry.get("BodyID"))
+            if previous is None:
+                return  # Mapped without a detailed scan first (nothing to value)
+            body_class, terraformable, _, first_discovery, mapped_before, _ = previous
+            self._set_body(system, entry.get("BodyID"), [body_class, terraformable, 1 if mapped_before else 2, first_discovery, mapped_before])
+        elif event == "MultiSellExplorationData":
+            for item in entry.get("Discovered", []):
+                self._sold(item.get("SystemName"))
+        elif event == "SellExplorationData":
+            for system in entry.get("Systems", []):
+                self._sold(system)
+        elif event == "Died":
+            # Unsold exploration data is lost on death
+            self.systems, self.system_values, self.total = {}, {}, 0
+        else:
+            return
+        self.dirty = True
+
+    #region Queries
+    def unsold_value(self) -> int:
+        return self.total
+
+    def system_count(self) -> int:
+        return len(self.systems)
+
+    def body_count(self) -> int:
+        return sum(len(bodies) for bodies in self.systems.values())
+
+    def top_systems(self, count: int = 5) -> list:
+        """
+        Most valuable unsold systems.
+
+        Returns:
+            list: (system, estimated value, bodies), largest first
+        """
+        best = sorted(self.system_values.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [(system, value, len(self.systems.get(system, ()))) for system, value in best]
+    #endregion
+
+    #region Persistence
+    def to_dict(self) -> dict:
+        # Body values are re-estimated on load, so only the valuation keys are stored
+        return {
+            "systems": {
+                system: [[body_id] + body[:5] for body_id, body in bodies.items()]
+                for system, bodies in self.systems.items()
+            },
+        }
+
+    def load_dict(self, data: dict):
+        self.reset()
+        for system, bodies in data.get("systems", {}).items():
+            for body_id, *body in bodies:
+                self._set_body(system, body_id, body)
+    #endregion
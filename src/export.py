@@ -0,0 +1,229 @@
+"""
+EDMC Income Tracker Plugin - Streaming transaction export
+
+Writes the transactions of the ledger files to CSV or JSON Lines. Records
+are read, filtered and written one at a time through generators, so memory
+use does not depend on the size of the history. Compacted history is
+exported as one "summary" row per day and category (its count is the number
+of transactions folded into it), so the earnings of an export always add up
+to the tracker's totals.
+
+Usage:
+    python -m src.export <plugin data dir> [--output FILE] [--format csv|jsonl]
+                         [--start DATE] [--end DATE] [--category NAME ...] [--cmdr NAME [--beta]]
+"""
+
+import argparse
+import csv
+import glob
+import heapq
+import json
+import os
+import sys
+import time
+from src.constants import LEDGER_FILE_NAME, COMMANDERS_DIR_NAME, SNAPSHOT_FILE_NAME
+from src.commander_ledger import partition_dir
+from src.ledger_file import LedgerFile
+from src.utils import load_json_file, parse_journal_timestamp
+
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_COLUMNS = ("timestamp", "time", "commander", "type", "category", "earnings", "count", "system", "station")
+
+
+#region Sources
+def commander_label(directory: str) -> str:
+    """
+    Commander name of a partition directory.
+
+    The name is taken from the partition's snapshot; without one it is read
+    from the directory name, which only keeps filesystem-safe characters
+    ("Jameson-1a2b3c4d-beta" -> "Jameson (beta)").
+    """
+    snapshot = load_json_file(os.path.join(directory, SNAPSHOT_FILE_NAME)) or {}
+    name, beta = snapshot.get("cmdr"), snapshot.get("is_beta", False)
+    if not name:
+        name = os.path.basename(directory)
+        beta = name.endswith("-beta")
+        if beta:
+            name = name[:-5]
+        name = name.rsplit("-", 1)[0]
+    return f"{name} (beta)" if beta else name
+
+
+def ledger_sources(data_dir: str, cmdr: str = None, is_beta: bool = False, commanders=None) -> list:
+    """
+    Ledger files to export: one commander's, or every partition's.
+
+    Args:
+        data_dir: Plugin data directory
+        cmdr: Only this commander (with is_beta, their beta ledger)
+        commanders: Only the partitions with these labels (see commander_label())
+
+    Returns:
+        list: (commander label, ledger path); the label is "" for transactions recorded before a commander was known
+    """
+    if cmdr is not None:
+        label = f"{cmdr} (beta)" if is_beta else cmdr
+        return [(label, os.path.join(partition_dir(data_dir, cmdr, is_beta), LEDGER_FILE_NAME))]
+    sources = [("", os.path.join(data_dir, LEDGER_FILE_NAME))]
+    for directory in sorted(glob.glob(os.path.join(data_dir, COMMANDERS_DIR_NAME, "*", ""))):
+        directory = os.path.dirname(directory)
+        sources.append((commander_label(directory), os.path.join(directory, LEDGER_FILE_NAME)))
+    return [(label, path) for label, path in sources
+            if os.path.exists(path) and (commanders is None or label in commanders)]
+#endregion
+
+
+#region Pipeline
+def iter_transactions(path: str, commander: str = "", start: float = None, end: float = None, categories=None):
+    """
+    Stream (time, commander, type, category, earnings, count, system, station) from one ledger file, filtered.
+
+    Summary rows come first, at the start of their period (which is also what
+    the time filter applies to); they are older than every transaction left
+    in the ledger, so the stream stays in time order.
+    """
+    for kind, value in LedgerFile(path).entries():
+        if kind == "transaction":
+            timestamp, earnings, category, system, station = value
+            count = 1
+        elif kind == "summary":
+            timestamp, category, earnings, count = value[:4]
+            system = station = None
+        else:
+            continue
+        if start is not None and timestamp < start:
+            continue
+        if end is not None and timestamp >= end:
+            continue
+        if categories and category not in categories:
+            continue
+        yield timestamp, commander, kind, category, earnings, count, system, station
+
+
+def iter_export_rows(sources, start: float = None, end: float = None, categories=None):
+    """Merge the filtered transactions of several ledgers in time order (one pending row per ledger)"""
+    streams = [iter_transactions(path, label, start, end, categories) for label, path in sources]
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=lambda row: row[0])
+
+
+def _iso(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+def write_rows(rows, output, export_format: str = "csv") -> int:
+    """
+    Write rows to an open text file.
+
+    Returns:
+        int: Number of rows written
+    """
+    count = 0
+    if export_format == "csv":
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(EXPORT_COLUMNS)
+        for timestamp, commander, kind, category, earnings, total, system, station in rows:
+            writer.writerow((_iso(timestamp), timestamp, commander, kind, category, earnings, total, system or "", station or ""))
+            count += 1
+    elif export_format == "jsonl":
+        for timestamp, commander, kind, category, earnings, total, system, station in rows:
+            output.write(json.dumps(dict(zip(EXPORT_COLUMNS, (_iso(timestamp), timestamp, commander, kind, category, earnings, total, system, station))),
+                                    separators=(",", ":")))
+            output.write("\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return count
+
+
+def export_file(output_path: str, sources, export_format: str = None, start: float = None, end: float = None, categories=None) -> dict:
+    """
+    Export the transactions (and compacted summaries) of the given ledgers to a file.
+
+    The file is written next to its destination and moved into place when
+    complete, so a failed export never leaves a partial file behind.
+
+    Args:
+        output_path: File to write
+        sources: (commander label, ledger path) pairs (see ledger_sources())
+        export_format: "csv" or "jsonl" (defaults to the file extension, then CSV)
+        start: Only transactions at or after this time (epoch seconds)
+        end: Only transactions before this time (epoch seconds)
+        categories: Only these income categories
+
+    Returns:
+        dict: rows, seconds and rows_per_second
+    """
+    if export_format is None:
+        extension = os.path.splitext(output_path)[1].lower().lstrip(".")
+        export_format = "jsonl" if extension in ("jsonl", "json") else "csv"
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    started = time.perf_counter()
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            count = write_rows(iter_export_rows(sources, start, end, categories), f, export_format)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": count,
+        "seconds": elapsed,
+        "rows_per_second": count / elapsed if elapsed > 0 else 0.0,
+    }
+#endregion
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds of an ISO date ("2026-01-31") or UTC date and time ("2026-01-31T18:00:00Z")"""
+    if "T" not in value:
+        value += "T00:00:00Z"
+    elif not value.endswith("Z") and "+" not in value:
+        value += "Z"
+    return parse_journal_timestamp(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Income Tracker transactions to CSV or JSON Lines")
+    parser.add_argument("data_dir", help="Plugin data directory (EDMCIncomeTracker inside the EDMC app directory)")
+    parser.add_argument("--output", default="-", help="File to write, or - for stdout (default: -)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="Output format (default: from the output file extension, otherwise csv)")
+    parser.add_argument("--start", default=None, help="Only transactions from this UTC date or time on")
+    parser.add_argument("--end", default=None, help="Only transactions before this UTC date or time")
+    parser.add_argument("--category", action="append", default=None, help="Only this income category (repeatable)")
+    parser.add_argument("--cmdr", default=None, help="Only this commander (default: every commander)")
+    parser.add_argument("--beta", action="store_true", help="With --cmdr, the commander's beta ledger")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        parser.error(f"not a directory: {args.data_dir}")
+    try:
+        start = parse_time(args.start) if args.start else None
+        end = parse_time(args.end) if args.end else None
+    except ValueError as e:
+        parser.error(f"invalid date: {e}")
+
+    sources = ledger_sources(args.data_dir, args.cmdr, args.beta)
+    categories = set(args.category) if args.category else None
+
+    if args.output == "-":
+        rows = iter_export_rows(sources, start, end, categories)
+        count = write_rows(rows, sys.stdout, args.format or "csv")
+        print(f"Exported {count:,} transactions", file=sys.stderr)
+        return
+
+    stats = export_file(args.output, sources, args.format, start, end, categories)
+    print(f"Transactions: {stats['rows']:,} -> {args.output}")
+    print(f"Elapsed:      {stats['seconds']:.2f} s ({stats['rows_per_second']:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
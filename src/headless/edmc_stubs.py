@@ -0,0 +1,110 @@
+"""
+EDMC Income Tracker Plugin - In-memory stand-ins for EDMC modules
+
+Lets the plugin run outside EDMC (replays, benchmarks, CI). Call install()
+before importing any plugin module that imports `config` or `l10n`.
+"""
+
+import importlib.abc
+import importlib.util
+import pathlib
+import sys
+import tempfile
+import types
+
+
+class InMemoryConfig:
+    """Dictionary-backed stand-in for EDMC's `config.config` object"""
+
+    def __init__(self, app_dir_path=None, values=None):
+        self.app_dir_path = pathlib.Path(app_dir_path or tempfile.mkdtemp(prefix="edmc-income-"))
+        self.values = dict(values or {})
+        self.writes = 0
+
+    def get_str(self, key, *, default=None):
+        value = self.values.get(key)
+        return str(value) if value is not None else default
+
+    def get_int(self, key, *, default=0):
+        try:
+            return int(self.values[key])
+        except (KeyError, TypeError, ValueError):
+            return default
+
+    def get_bool(self, key, *, default=None):
+        value = self.values.get(key)
+        return bool(value) if value is not None else default
+
+    def get_list(self, key, *, default=None):
+        value = self.values.get(key)
+        return list(value) if value is not None else default
+
+    def set(self, key, value):
+        if isinstance(value, bool):
+            value = int(value)
+        self.values[key] = value
+        self.writes += 1
+
+    def delete(self, key, *, suppress=False):
+        if key not in self.values and not suppress:
+            raise KeyError(key)
+        self.values.pop(key, None)
+
+
+class Locale:
+    """Stand-in for EDMC's l10n.Locale (always formats like en-US)"""
+
+    @staticmethod
+    def string_from_number(number, decimals=5):
+        return f"{number:,.{decimals}f}" if decimals else f"{round(number):,}"
+
+
+class UIModuleFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """
+    Empty `myNotebook` and `ttkHyperlinkLabel` modules, created when first imported.
+
+    Like the real EDMC modules they are not in sys.modules until something
+    imports them, so `-X importtime` shows whether the plugin did.
+    """
+
+    NAMES = ("myNotebook", "ttkHyperlinkLabel")
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self.NAMES:
+            return importlib.util.spec_from_loader(fullname, self)
+        return None
+
+    def create_module(self, spec):
+        return None  # Default module creation
+
+    def exec_module(self, module):
+        if module.__name__ == "ttkHyperlinkLabel":
+            module.HyperlinkLabel = None
+
+
+def install(app_dir_path=None, values=None) -> InMemoryConfig:
+    """
+    Register stand-in `config`, `l10n`, `myNotebook` and `ttkHyperlinkLabel` modules.
+
+    Args:
+        app_dir_path: Directory for plugin data files (a temporary one by default)
+        values: Initial config values
+
+    Returns:
+        The in-memory config object
+    """
+    config = InMemoryConfig(app_dir_path, values)
+
+    config_module = types.ModuleType("config")
+    config_module.config = config
+    sys.modules["config"] = config_module
+
+    l10n_module = types.ModuleType("l10n")
+    l10n_module.Locale = Locale
+    sys.modules["l10n"] = l10n_module
+
+    # UI-only EDMC modules; never used without a Tk UI, so only importable on demand
+    if not any(isinstance(finder, UIModuleFinder) for finder in sys.meta_path):
+        sys.meta_path.append(UIModuleFinder())
+
+    return config
@@ -0,0 +1,154 @@
+"""
+EDMC Income Tracker Plugin - Headless journal replay
+
+Drives PluginManager and JournalProcessor from a journal file (or stdin) at
+full speed, without EDMC or a Tk window, and prints the final aggregates.
+
+Usage:
+    python -m src.headless.replay Journal.2024-01-01T000000.01.log
+    cat Journal.*.log | python -m src.headless.replay - --json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from src.headless import edmc_stubs
+
+# Tracking is enabled by default, exactly as a fresh install of the plugin
+DEFAULT_CONFIG = {
+    "EDMCIncomeTracker_track_trading": 1,
+    "EDMCIncomeTracker_track_combat": 1,
+    "EDMCIncomeTracker_track_exploration": 1,
+    "EDMCIncomeTracker_track_missions": 1,
+    "EDMCIncomeTracker_reset_on_close": 1,
+    "EDMCIncomeTracker_show_total_credits": 1,
+}
+
+CATEGORIES = ("trading", "combat", "exploration", "missions", "maintenance")
+
+
+class GameState:
+    """The subset of EDMC's monitor state the plugin looks at"""
+
+    def __init__(self):
+        self.cmdr = None
+        self.is_beta = False
+        self.system = None
+        self.station = None
+        self.state = {}
+
+    def update(self, entry: dict):
+        event = entry.get("event")
+        if event == "Fileheader":
+            self.is_beta = "beta" in entry.get("gameversion", "").lower()
+        elif event in ("Commander", "LoadGame"):
+            self.cmdr = entry.get("Name") or entry.get("Commander") or self.cmdr
+            if "Credits" in entry:
+                self.state["Credits"] = entry["Credits"]
+        elif event in ("Location", "FSDJump", "CarrierJump"):
+            self.system = entry.get("StarSystem", self.system)
+            self.station = entry.get("StationName") if entry.get("Docked") else None
+        elif event == "Docked":
+            self.system = entry.get("StarSystem", self.system)
+            self.station = entry.get("StationName")
+        elif event == "Undocked":
+            self.station = None
+
+
+def replay(lines, plugin_manager, game=None) -> dict:
+    """
+    Feed journal lines through the plugin.
+
+    Returns:
+        dict: events, errors and elapsed seconds
+    """
+    game = game or GameState()
+    events = 0
+    errors = 0
+    started = time.perf_counter()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            errors += 1
+            continue
+        game.update(entry)
+        plugin_manager.process_journal_entry(game.cmdr, game.is_beta, game.system, game.station, entry, game.state)
+        events += 1
+    return {"events": events, "errors": errors, "seconds": time.perf_counter() - started}
+
+
+def summarize(income_tracker) -> dict:
+    """Collect the final aggregates of a replay"""
+    return {
+        "transactions": len(income_tracker.transactions),
+        "total": income_tracker.trip_earnings(),
+        "categories": {category: income_tracker.trip_earnings_by_category(category) for category in CATEGORIES},
+        "hourly": income_tracker.speed(),
+        "credits": income_tracker.get_current_credits(),
+        "top_stations": [
+            {"system": system, "station": station, "earnings": earnings, "transactions": count}
+            for system, station, earnings, count in income_tracker.top_stations(5)
+        ],
+        "trade_profit": income_tracker.trade_profit(),
+        "cargo_value": income_tracker.cargo_value(),
+        "commodities": income_tracker.commodity_stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an Elite Dangerous journal through the Income Tracker without EDMC")
+    parser.add_argument("journal", help="Journal file to replay, or - for stdin")
+    parser.add_argument("--data-dir", default=None, help="Directory for plugin data files (default: a temporary directory)")
+    parser.add_argument("--wall-clock", action="store_true",
+                        help="Record transactions at replay time instead of the journal timestamps")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    edmc_stubs.install(args.data_dir, DEFAULT_CONFIG)
+
+    # Plugin modules can only be imported once the stand-ins are in place
+    from src.plugin_manager import PluginManager
+
+    plugin_manager = PluginManager()
+    plugin_manager.initialize()
+    plugin_manager.journal_processor.use_entry_timestamps = not args.wall_clock
+
+    if args.journal == "-":
+        stats = replay(sys.stdin, plugin_manager)
+    else:
+        with open(args.journal, "r", encoding="utf-8", errors="replace") as f:
+            stats = replay(f, plugin_manager)
+
+    result = summarize(plugin_manager.income_tracker)
+    result["replay"] = stats
+    plugin_manager.cleanup()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"Events:       {stats['events']:,} ({stats['errors']:,} unreadable)")
+    print(f"Elapsed:      {stats['seconds']:.3f} s ({stats['events'] / max(stats['seconds'], 1e-9):,.0f} events/s)")
+    print(f"Transactions: {result['transactions']:,}")
+    for category, value in result["categories"].items():
+        print(f"  {category.capitalize():<12}{value:>16,.0f} Cr")
+    print(f"Total:        {result['total']:,.0f} Cr")
+    print(f"Hourly:       {result['hourly']:,.0f} Cr/hr")
+    if result["top_stations"]:
+        print("Top stations:")
+        for item in result["top_stations"]:
+            print(f"  {item['station'] + ' (' + item['system'] + ')':<40}{item['earnings']:>16,.0f} Cr")
+    if result["commodities"]:
+        print(f"Trade profit: {result['trade_profit']:,.0f} Cr ({result['cargo_value']:,.0f} Cr of cargo unsold)")
+        for item in result["commodities"][:10]:
+            print(f"  {item['name']:<28}{item['profit']:>14,.0f} Cr {item['margin'] * 100:>6.1f}% {item['profit_per_hour']:>14,.0f} Cr/hr")
+
+
+if __name__ == "__main__":
+    main()
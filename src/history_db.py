@@ -0,0 +1,252 @@
+"""
+EDMC Income Tracker Plugin - Indexed SQLite transaction history
+"""
+
+import os
+import sqlite3
+import threading
+from src.constants import HISTORY_DB_BATCH_SIZE
+from src.utils import log_debug, log_error
+
+_SCHEMA = (
+    # Category, event, commander, system and station names are interned here
+    "CREATE TABLE IF NOT EXISTS names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+    """CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY,
+        time REAL NOT NULL,
+        earnings REAL NOT NULL,
+        category INTEGER NOT NULL,
+        event INTEGER,
+        commander INTEGER,
+        system INTEGER,
+        station INTEGER
+    )""",
+    # Indexes include earnings so the grouped totals are answered from the index alone
+    "CREATE INDEX IF NOT EXISTS idx_transactions_time ON transactions (time, earnings)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category, time, earnings)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_commander ON transactions (commander, time, earnings)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_system ON transactions (system, time, earnings)",
+)
+
+_INSERT = "INSERT INTO transactions (time, earnings, category, event, commander, system, station) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+class HistoryDatabase:
+    """
+    Full transaction history in a local SQLite file.
+
+    Rows are buffered in memory and written with one executemany() inside a
+    single transaction per flush (every HISTORY_DB_BATCH_SIZE rows, and on
+    EDMCIncome.flush()). The database uses WAL mode, which needs a local
+    filesystem - keep it in the plugin data directory, not on a network share.
+    Queries flush pending rows first so they always see everything recorded.
+    """
+
+    def __init__(self, path: str, batch_size: int = HISTORY_DB_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._connection = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._name_ids = {}
+        self._names = {}
+
+    #region Connection
+    def open(self):
+        """Create the database file and schema if needed"""
+        if self._connection:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+        self._names = dict(connection.execute("SELECT id, name FROM names"))
+        self._name_ids = {name: name_id for name_id, name in self._names.items()}
+        self._connection = connection
+        log_debug(f"History database opened: {self.path}")
+
+    def close(self):
+        """Write pending rows and close the database"""
+        if not self._connection:
+            return
+        self.flush()
+        with self._lock:
+            # Refresh planner statistics for the indexes (cheap when nothing changed)
+            self._connection.execute("PRAGMA optimize")
+            self._connection.close()
+            self._connection = None
+    #endregion
+
+    #region Writing
+    def add(self, timestamp: float, earnings: float, category: str, event: str = None,
+            commander: str = None, system: str = None, station: str = None):
+        """Queue a transaction row (written on the next flush)"""
+        self._pending.append((timestamp, earnings, category, event, commander, system, station))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, rows) -> int:
+        """Insert an iterable of (time, earnings, category[, event, commander, system, station]) rows"""
+        count = 0
+        for row in rows:
+            self._pending.append(tuple(row) + (None,) * (7 - len(row)))
+            count += 1
+            if len(self._pending) >= self.batch_size * 16:
+                self.flush()
+        self.flush()
+        if count:
+            # Planner statistics let filtered queries skip-scan the (name, time) indexes
+            with self._lock:
+                self._connection.execute("ANALYZE")
+        return count
+
+    def _intern(self, name: str):
+        """Get the id of a name, adding it to the names table if new (call inside a transaction)"""
+        if name is None:
+            return None
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._connection.execute("INSERT INTO names (name) VALUES (?)", (name,)).lastrowid
+            self._name_ids[name] = name_id
+            self._names[name_id] = name
+        return name_id
+
+    def flush(self):
+        """Write all pending rows in a single transaction"""
+        if not self._pending:
+            return
+        if not self._connection:
+            self.open()
+        rows, self._pending = self._pending, []
+        intern = self._intern
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(_INSERT, [
+                    (timestamp, earnings, intern(category), intern(event), intern(commander), intern(system), intern(station))
+                    for timestamp, earnings, category, event, commander, system, station in rows
+                ])
+        except sqlite3.Error as e:
+            # Names added in the rolled back transaction are gone too
+            self._names = dict(self._connection.execute("SELECT id, name FROM names"))
+            self._name_ids = {name: name_id for name_id, name in self._names.items()}
+            log_error(f"History database write failed ({len(rows)} rows): {e}")
+
+    def clear(self):
+        """Delete every stored transaction"""
+        self._pending = []
+        if not self._connection:
+            self.open()
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM transactions")
+    #endregion
+
+    #region Queries
+    def _query(self, sql: str, params=()) -> list:
+        self.flush()
+        if not self._connection:
+            self.open()
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _where(self, start: float = None, end: float = None, category: str = None,
+               commander: str = None, system: str = None):
+        """Build a WHERE clause from the common filters"""
+        # Names are resolved to ids here, so pending rows must be written (and the names loaded) first
+        self.flush()
+        if not self._connection:
+            self.open()
+        clauses = []
+        params = []
+        for column, operator, value in (
+            ("time", ">=", start),
+            ("time", "<", end),
+            ("category", "=", category),
+            ("commander", "=", commander),
+            ("system", "=", system),
+        ):
+            if value is None:
+                continue
+            if column != "time":
+                value = self._name_ids.get(value, -1)  # Unknown names match nothing
+            clauses.append(f"{column} {operator} ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _named(self, rows, *columns) -> list:
+        """Replace name ids in the given result columns with the names"""
+        names = self._names
+        result = []
+        for row in rows:
+            row = list(row)
+            for column in columns:
+                row[column] = names.get(row[column])
+            result.append(tuple(row))
+        return result
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        return self._query(f"SELECT COUNT(*) FROM transactions{where}", params)[0][0]
+
+    def totals_by_day(self, utc_offset: float = 0, **filters) -> list:
+        """
+        Earnings per day.
+
+        Returns:
+            list: (day start as epoch seconds, earnings, count), oldest first
+        """
+        where, params = self._where(**filters)
+        return self._query(
+            f"SELECT CAST((time + ?) / 86400 AS INTEGER) * 86400 - ? AS day, SUM(earnings), COUNT(*) "
+            f"FROM transactions{where} GROUP BY day ORDER BY day",
+            [utc_offset, utc_offset] + params,
+        )
+
+    def totals_by_category(self, **filters) -> list:
+        """
+        Earnings per category.
+
+        Returns:
+            list: (category, earnings, count), largest earnings first
+        """
+        where, params = self._where(**filters)
+        return self._named(self._query(
+            f"SELECT category, SUM(earnings) AS total, COUNT(*) FROM transactions{where} "
+            f"GROUP BY category ORDER BY total DESC",
+            params,
+        ), 0)
+
+    def totals_by_system(self, limit: int = 10, **filters) -> list:
+        """
+        Most profitable systems.
+
+        Returns:
+            list: (system, earnings, count), largest earnings first
+        """
+        where, params = self._where(**filters)
+        where = (where + " AND" if where else " WHERE") + " system IS NOT NULL"
+        return self._named(self._query(
+            f"SELECT system, SUM(earnings) AS total, COUNT(*) FROM transactions{where} "
+            f"GROUP BY system ORDER BY total DESC LIMIT ?",
+            params + [limit],
+        ), 0)
+
+    def top_transactions(self, limit: int = 10, **filters) -> list:
+        """
+        Largest single transactions.
+
+        Returns:
+            list: (time, earnings, category, event, commander, system, station), largest first
+        """
+        where, params = self._where(**filters)
+        return self._named(self._query(
+            f"SELECT time, earnings, category, event, commander, system, station FROM transactions{where} "
+            f"ORDER BY earnings DESC LIMIT ?",
+            params + [limit],
+        ), 2, 3, 4, 5, 6)
+    #endregion
+
+    def __repr__(self):
+        return f"HistoryDatabase({self.path!r})"
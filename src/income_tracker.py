@@ -2,11 +2,32 @@
 EDMC Income Tracker Plugin - Core income tracking logic
 """
 
-import time
+import glob
 import json
+import os
+import threading
+import time
+from itertools import islice
 from config import config # type: ignore
-from src.constants import CFG_EARNINGS, CFG_SESSION_STATE
-from src.utils import Transaction, log_debug, log_info, log_critical
+from src.constants import (
+    CFG_EARNINGS, CFG_SESSION_STATE, CFG_ACTIVE_COMMANDER, LEDGER_FILE_NAME, LEDGER_FSYNC_INTERVAL, COMMANDERS_DIR_NAME,
+    IDLE_THRESHOLD_SECONDS, COMPACT_AFTER_DAYS, COMPACTION_PERIOD_SECONDS, COMPACTION_CHECK_EVERY, HISTORY_DB_FILE_NAME,
+    TRADE_COST_BASIS
+)
+from src.utils import get_data_dir, log_debug, log_info, log_warning, log_critical
+from src.ledger_file import LedgerFile
+from src.history_db import HistoryDatabase
+from src.persistence import WriteBehindConfig
+from src.instrumentation import instrumentation
+from src.transaction_store import TransactionStore
+from src.play_time import ActivePlayTime
+from src.commander_ledger import CommanderLedger, partition_dir, remove_state_files
+from src.trade_engine import TradeEngine
+from src.mission_tracker import MissionTracker
+from src.voucher_tracker import VoucherTracker
+from src.exploration_estimator import ExplorationEstimator
+from src.profit_index import ProfitIndex
+from src import compaction
 
 class EDMCIncome:
     """Main class for income tracking"""
@@ -14,47 +35,279 @@ class EDMCIncome:
     def __init__(self, ui_manager):
         self.ui = ui_manager
         self.saved_earnings = 0.0
-        self.transactions = []
-        self.current_credits = 0
+        self.idle_threshold = IDLE_THRESHOLD_SECONDS
+        self.trade_cost_basis = TRADE_COST_BASIS
+        self.data_dir = get_data_dir(config)
+        self.persistence = WriteBehindConfig(config)
+        self._lock = threading.RLock()
+
+        # One ledger per (commander, beta); only the active one has to be loaded
+        self.ledgers = {}
+        self.ledger = self._partition(None, False)
+
+        # Optional long-term SQLite history (None while disabled)
+        self.history = None
+
+        # Background compaction and history hydration state
+        self.compact_after_days = COMPACT_AFTER_DAYS
+        self._compaction_thread = None
+        self._hydration_thread = None
+        self._since_compaction = 0
+
+        # Ledgers and changed tracker state are synced to disk at most this long after a change
+        self.sync_interval = LEDGER_FSYNC_INTERVAL
+        self._sync_timer = None
+
+    #region Active partition
+    # The rest of the plugin reads the active commander's history through these
+    @property
+    def transactions(self) -> TransactionStore:
+        # The full history may still be loading after a snapshot start
+        self.ledger.hydrate()
+        return self.ledger.transactions
+
+    @property
+    def aggregates(self):
+        return self.ledger.aggregates
+
+    @property
+    def play_time(self) -> ActivePlayTime:
+        return self.ledger.play_time
+
+    @property
+    def rolling(self) -> dict:
+        return self.ledger.rolling
+
+    @property
+    def summaries(self) -> list:
+        self.ledger.hydrate()
+        return self.ledger.summaries
+
+    @property
+    def profit(self) -> ProfitIndex:
+        return self.ledger.profit
+
+    @property
+    def trades(self) -> TradeEngine:
+        return self.ledger.trades
+
+    @property
+    def missions(self) -> MissionTracker:
+        return self.ledger.missions
+
+    @property
+    def vouchers(self) -> VoucherTracker:
+        return self.ledger.vouchers
+
+    @property
+    def exploration(self) -> ExplorationEstimator:
+        return self.ledger.exploration
+
+    @property
+    def ledger_file(self) -> LedgerFile:
+        return self.ledger.ledger_file
+
+    @property
+    def current_credits(self) -> int:
+        return self.ledger.current_credits
+
+    @current_credits.setter
+    def current_credits(self, credits: int):
+        self.ledger.current_credits = credits
+
+    def _partition(self, cmdr: str, is_beta: bool) -> CommanderLedger:
+        """Get the ledger of a (commander, beta) partition without loading it"""
+        key = (cmdr, bool(is_beta))
+        ledger = self.ledgers.get(key)
+        if ledger is None:
+            ledger = CommanderLedger(cmdr, bool(is_beta), partition_dir(self.data_dir, cmdr, is_beta), self.idle_threshold, self._lock)
+            self.ledgers[key] = ledger
+        return ledger
+
+    def _activate(self, ledger: CommanderLedger) -> bool:
+        """Make a ledger the active one, loading it on first use; returns True if it was loaded now"""
+        loaded_now = False
+        if not ledger.loaded:
+            try:
+                ledger.load()
+            except Exception as e:
+                log_critical(f"Failed to load transaction ledger for {ledger.label()}: {e}")
+                ledger.set_aside()
+            loaded_now = True
+        ledger.set_idle_threshold(self.idle_threshold)
+        ledger.trades.set_method(self.trade_cost_basis)
+        self.ledger = ledger
+        return loaded_now
+
+    def switch_commander(self, cmdr: str, is_beta: bool) -> bool:
+        """
+        Make (cmdr, is_beta) the active partition.
+
+        Already loaded partitions are swapped in as they are (O(1)); others are
+        read from disk on first use.
+        """
+        key = (cmdr, bool(is_beta))
+        if key == self.ledger.key:
+            return False
+
+        with self._lock:
+            ledger = self.ledgers.get(key)
+            if ledger is None:
+                ledger = self._partition(cmdr, is_beta)
+                self._adopt_unpartitioned_ledger(ledger)
+            loaded_now = self._activate(ledger)
+        self.persistence.set(CFG_ACTIVE_COMMANDER, json.dumps([cmdr, bool(is_beta)]))
+        log_info(f"Active commander: {ledger.label()}")
+
+        if loaded_now:
+            self.schedule_hydration()
+            self.schedule_compaction()
+        self.update_window()
+        return True
+
+    def _adopt_unpartitioned_ledger(self, ledger: CommanderLedger):
+        """Move a ledger written before partitions existed to the first commander seen"""
+        if ledger.cmdr is None or os.path.isdir(os.path.join(self.data_dir, COMMANDERS_DIR_NAME)):
+            return
+        default = self._partition(None, False)
+        if default.ledger_file.is_empty():
+            return
+        default.close()
+        os.makedirs(ledger.directory, exist_ok=True)
+        os.replace(default.ledger_file.path, ledger.ledger_file.path)
+        for name in CommanderLedger.STATE_FILES:
+            if os.path.exists(os.path.join(default.directory, name)):
+                os.replace(os.path.join(default.directory, name), os.path.join(ledger.directory, name))
+        default.clear_memory()
+        default.loaded = False
+        log_info(f"Existing ledger assigned to {ledger.label()}")
+
+    def _partition_dirs(self) -> list:
+        """Directories of every partition on disk"""
+        directories = glob.glob(os.path.join(self.data_dir, COMMANDERS_DIR_NAME, "*", ""))
+        directories = [os.path.dirname(directory) for directory in directories]
+        directories.append(self.data_dir)
+        return directories
+    #endregion
 
     def save_state(self):
         state = {
             "saved_earnings": self.saved_earnings,
-            "transactions": [t.__dict__ for t in self.transactions],  # if Transaction is JSON-friendly
             "current_credits": self.current_credits,
         }
-        config.set(CFG_SESSION_STATE, json.dumps(state))
+        self.persistence.set(CFG_SESSION_STATE, json.dumps(state))
+        self.flush()
         log_info("Income Tracker state saved")
 
     def load_state(self, reset_on_close=True):
         if reset_on_close:
-            self.reset()
+            self.reset(all_commanders=True)
             return
 
+        state = {}
         state_json = config.get_str(CFG_SESSION_STATE, default="")
-        if not state_json:
-            self.reset()
-            log_info("Income Tracker state reset")
-            return
+        if state_json:
+            try:
+                state = json.loads(state_json)
+            except Exception as e:
+                log_critical(f"Failed to load saved state: {e}")
 
+        self.saved_earnings = state.get("saved_earnings", 0.0)
+
+        # Only the last active commander is loaded; the others load on first switch
+        cmdr, is_beta = None, False
         try:
-            state = json.loads(state_json)
-            self.saved_earnings = state.get("saved_earnings", 0.0)
-            self.current_credits = state.get("current_credits", 0)
-            self.transactions = [Transaction(**t) for t in state.get("transactions", [])]
-            log_info(f"Income Tracker state restored ({len(self.transactions)} transactions)")
-        except Exception as e:
-            log_critical(f"Failed to load saved state: {e}")
-            self.reset()
+            cmdr, is_beta = json.loads(config.get_str(CFG_ACTIVE_COMMANDER, default="") or "[null, false]")
+        except (ValueError, TypeError):
+            pass
 
+        with self._lock:
+            ledger = self._partition(cmdr, is_beta)
+            try:
+                ledger.ledger_file.open()
+                if "transactions" in state and ledger.ledger_file.is_empty():
+                    self._migrate_legacy_transactions(ledger, state["transactions"])
+            except Exception as e:
+                log_critical(f"Failed to migrate saved transactions: {e}")
+            self._activate(ledger)
+        self.current_credits = state.get("current_credits", 0)
 
-    def reset(self):
-        """Reset all tracking data (current session + previous sessions)"""
-        self.transactions = []
+        # Totals may come from the snapshot; the full history follows in the background
+        self.schedule_hydration()
+        self.schedule_compaction()
+
+    def _migrate_legacy_transactions(self, ledger, transactions):
+        """Move transactions stored in the config blob by older versions into the ledger file"""
+        if isinstance(transactions, dict):
+            legacy = TransactionStore.from_columns(transactions)
+        else:
+            legacy = TransactionStore.from_dicts(transactions)
+        for timestamp, earnings, category in legacy.rows():
+            ledger.ledger_file.append(timestamp, earnings, category)
+        ledger.ledger_file.sync()
+        log_info(f"Migrated {len(legacy)} transactions from config to {ledger.ledger_file.path}")
+
+    def _schedule_sync(self):
+        """Run sync() within sync_interval seconds unless it is already scheduled (call with the lock held)"""
+        if self._sync_timer:
+            return
+        self._sync_timer = threading.Timer(self.sync_interval, self.sync)
+        self._sync_timer.daemon = True
+        self._sync_timer.start()
+
+    def sync(self):
+        """Sync every ledger to disk and write the state files of changed trackers"""
+        with self._lock:
+            if self._sync_timer:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            for ledger in self.ledgers.values():
+                ledger.ledger_file.sync()
+                ledger.save_trackers()
+
+    def flush(self):
+        """Write pending config values, sync the ledgers and save their snapshots"""
+        self.persistence.flush()
+        self.sync()
+        for ledger in self.ledgers.values():
+            with self._lock:
+                ledger.save_snapshot()
+        if self.history:
+            self.history.flush()
+
+    def close(self):
+        """Flush pending writes and close the on-disk ledger"""
+        for thread in (self._hydration_thread, self._compaction_thread):
+            if thread:
+                thread.join(timeout=5.0)
+        self.persistence.flush()
+        with self._lock:
+            if self._sync_timer:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            for ledger in self.ledgers.values():
+                ledger.close()
+        if self.history:
+            self.history.close()
+        log_debug(f"Config writes: {self.persistence.stats()}")
+
+    def reset(self, all_commanders: bool = False):
+        """Reset all tracking data (current session + previous sessions) of the active commander, or of every commander"""
+        with self._lock:
+            if all_commanders:
+                for ledger in self.ledgers.values():
+                    ledger.clear()
+                loaded = {ledger.directory for ledger in self.ledgers.values()}
+                for directory in self._partition_dirs():
+                    if directory not in loaded:
+                        LedgerFile(os.path.join(directory, LEDGER_FILE_NAME)).truncate()
+                        remove_state_files(directory)
+            else:
+                self.ledger.clear()
         self.saved_earnings = 0.0
         self.update_window()
         self.save()
-        log_debug("Income Tracker reset: All data cleared")
+        log_debug(f"Income Tracker reset: All data cleared ({'all commanders' if all_commanders else self.ledger.label()})")
 
     def load(self):
         """Load saved earnings from config"""
@@ -70,69 +323,347 @@ class EDMCIncome:
     def save(self):
         """Save current earnings to config"""
         total_earnings = self.saved_earnings + self.trip_earnings()
-        config.set(CFG_EARNINGS, str(total_earnings))
-
-    def transaction(self, earnings: float, category: str = "unknown"):
-        """Record a transaction"""
-        log_debug(f"Recording transaction: {earnings:,.0f} Cr ({category})")
-        data = Transaction(earnings, category)
-        self.transactions.append(data)
-        log_debug(f"Total transactions: {len(self.transactions)}")
+        self.persistence.set(CFG_EARNINGS, str(total_earnings))
+
+    def transaction(self, earnings: float, category: str = "unknown", timestamp: float = None,
+                    event: str = None, cmdr: str = None, system: str = None, station: str = None):
+        """Record a transaction (at the current time unless a timestamp is given)"""
+        log_debug("Recording transaction: {:,.0f} Cr ({})", earnings, category)
+        with self._lock:
+            ledger = self.ledger
+            timestamp = ledger.add(earnings, category, timestamp, system, station)
+            self._schedule_sync()
+        if self.history:
+            self.history.add(timestamp, earnings, category, event, cmdr, system, station)
+        log_debug("Total transactions: {}", len(ledger.transactions))
+
+        self._since_compaction += 1
+        if self._since_compaction >= COMPACTION_CHECK_EVERY:
+            self.schedule_compaction()
+
         self.update_window()
         self.save()
-        log_debug(f"Transaction recorded: {earnings:,.0f} Cr ({category})")
+        log_debug("Transaction recorded: {:,.0f} Cr ({})", earnings, category)
 
     # Docking events are no longer needed - hourly rates are calculated
     # based on actual transaction timing, not docking events
 
     def trip_earnings(self) -> float:
-        """Calculate current trip earnings"""
-        return sum(x.earnings for x in self.transactions)
+        """Get current trip earnings"""
+        return self.aggregates.total
 
     def trip_earnings_by_category(self, category: str) -> float:
-        """Calculate current trip earnings for a specific category"""
-        total = sum(x.earnings for x in self.transactions if x.category == category)
-        log_debug(f"Category '{category}' earnings: {total:,.0f} Cr")
-        return total
+        """Get current trip earnings for a specific category"""
+        return self.aggregates.by_category(category)
+
+    def verify_aggregates(self) -> bool:
+        """Compare the running totals against a full recompute of the transactions"""
+        with self._lock:
+            ok = self.aggregates.matches(self.transactions, self.summaries)
+            ok = ok and self._rebuild_profit(self.ledger).matches(self.ledger.profit)
+        log_debug(f"Aggregate check over {len(self.transactions)} transactions and {len(self.summaries)} summaries: {'OK' if ok else 'MISMATCH'}")
+        return ok
+
+    def top_systems(self, count: int = 5) -> list:
+        """Most profitable systems of the active commander: (system, earnings, transactions)"""
+        return self.ledger.profit.top_systems(count)
+
+    def top_stations(self, count: int = 5) -> list:
+        """Most profitable stations of the active commander: (system, station, earnings, transactions)"""
+        return self.ledger.profit.top_stations(count)
+
+    #region Trade profit
+    def handle_trade_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: update the active commander's cargo lots and trade profit"""
+        with self._lock:
+            self.ledger.trades.handle_event(entry, timestamp)
+            self._schedule_sync()
+        self.update_window()
+
+    def set_trade_cost_basis(self, method: str):
+        """Change how sold cargo is costed ("fifo" or "average")"""
+        if method != self.trade_cost_basis:
+            log_debug(f"Trade cost basis changed: {self.trade_cost_basis} -> {method}")
+            self.trade_cost_basis = method
+        with self._lock:
+            self.ledger.trades.set_method(method)
+
+    def trade_profit(self) -> float:
+        """Realised trade profit of the active commander (sales minus their cost basis)"""
+        return self.ledger.trades.realised_profit()
+
+    def cargo_value(self) -> float:
+        """Cost basis of the active commander's unsold cargo"""
+        return self.ledger.trades.inventory_value()
+
+    def commodity_stats(self) -> list:
+        """Per-commodity profit, margin and profit/hour of the active commander"""
+        return self.ledger.trades.commodity_stats()
+    #endregion
+
+    #region Missions
+    def handle_mission_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: follow the active commander's missions by MissionID"""
+        with self._lock:
+            self.ledger.missions.handle_event(entry, timestamp)
+            self._schedule_sync()
+
+    def top_mission_types(self, count: int = 5) -> list:
+        """Most rewarding mission types: (type, earnings, per hour of mission time, completed, failed)"""
+        return self.ledger.missions.top_types(count)
+
+    def top_mission_factions(self, count: int = 5) -> list:
+        """Most rewarding mission factions: (faction, earnings, per hour of mission time, completed, failed)"""
+        return self.ledger.missions.top_factions(count)
+
+    def mission_rate(self) -> float:
+        """Mission earnings per hour of mission time (acceptance to outcome)"""
+        return self.ledger.missions.mission_rate()
+    #endregion
+
+    #region Unredeemed vouchers
+    def handle_voucher_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: track the active commander's bounties and combat bonds until redeemed"""
+        with self._lock:
+            self.ledger.vouchers.handle_event(entry, timestamp)
+            self._schedule_sync()
+        self.update_window()
+
+    def unredeemed(self) -> float:
+        """Value of the active commander's unredeemed bounty vouchers and combat bonds"""
+        return self.ledger.vouchers.unredeemed()
+
+    def projected_rate(self) -> float:
+        """Hourly value of bounties and combat bonds earned, as if already redeemed"""
+        return self.ledger.vouchers.projected_rate()
+
+    def unredeemed_by_faction(self) -> list:
+        """Unredeemed value per faction: (faction, voucher type, value)"""
+        return self.ledger.vouchers.by_faction()
+    #endregion
+
+    #region Unsold exploration data
+    def handle_exploration_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: estimate the active commander's unsold exploration data"""
+        with self._lock:
+            self.ledger.exploration.handle_event(entry, timestamp)
+            self._schedule_sync()
+        self.update_window()
+
+    def unsold_exploration_value(self) -> int:
+        """Estimated value of the active commander's unsold exploration data"""
+        return self.ledger.exploration.unsold_value()
+
+    def top_unsold_systems(self, count: int = 5) -> list:
+        """Most valuable unsold systems: (system, estimated value, bodies)"""
+        return self.ledger.exploration.top_systems(count)
+    #endregion
 
     def speed(self) -> float:
         """Calculate earning speed based on actual play time, not wall clock time"""
-        if not self.transactions:
-            return 0.0
+        return self.play_time.rate(self.trip_earnings())
+
+    def rolling_rate(self, window: str, category: str = None) -> float:
+        """Hourly rate over one of the ROLLING_WINDOWS (all categories, or one)"""
+        return self.rolling[window].rate(category)
 
-        total_earned = self.trip_earnings()
-        total_play_time = 0.0
+    def set_idle_threshold(self, seconds: float):
+        """Change the longest gap between transactions that still counts as active play"""
+        if seconds != self.idle_threshold:
+            log_debug(f"Idle threshold changed: {self.idle_threshold:.0f}s -> {seconds:.0f}s")
+            self.idle_threshold = seconds
+        # Other loaded commanders are updated when they become active
+        with self._lock:
+            self.ledger.set_idle_threshold(seconds)
 
-        for i in range(1, len(self.transactions)):
-            # Calculate time between consecutive transactions
-            time_diff = self.transactions[i].time - self.transactions[i-1].time
+    #region History database
+    def set_history_enabled(self, enabled: bool):
+        """Open or close the SQLite history database"""
+        if enabled and not self.history:
+            history = HistoryDatabase(os.path.join(get_data_dir(config), HISTORY_DB_FILE_NAME))
+            try:
+                history.open()
+                ledger = self.ledger
+                ledger.hydrate()
+                if not history.count() and len(ledger.transactions):
+                    # Seed a new database with what the active ledger still holds in detail
+                    with self._lock:
+                        imported = history.add_many(
+                            (timestamp, earnings, category, None, ledger.cmdr, system, station)
+                            for timestamp, earnings, category, system, station in ledger.transactions.located_rows()
+                        )
+                    log_info(f"History database seeded with {imported} transactions")
+            except Exception as e:
+                log_critical(f"Failed to open history database: {e}")
+                return
+            self.history = history
+        elif not enabled and self.history:
+            self.history.close()
+            self.history = None
+
+    def history_report(self, days: float = 7, limit: int = 5, now: float = None) -> dict:
+        """
+        Summarize the recent history from the SQLite database.
+
+        Returns:
+            dict: by_day, by_category, top_systems and top_transactions query results
+                  (empty if the database is disabled)
+        """
+        if not self.history:
+            return {}
+        start = (now if now is not None else time.time()) - days * 86400
+        return {
+            "by_day": self.history.totals_by_day(start=start),
+            "by_category": self.history.totals_by_category(start=start),
+            "top_systems": self.history.totals_by_system(limit, start=start),
+            "top_transactions": self.history.top_transactions(limit, start=start),
+        }
+    #endregion
+
+    #region History compaction
+    def set_compact_after_days(self, days: int):
+        """Change the age after which transactions are compacted (0 = never)"""
+        if days != self.compact_after_days:
+            log_debug(f"History compaction age changed: {self.compact_after_days} -> {days} days")
+            self.compact_after_days = days
+            self.schedule_compaction()
+
+    def schedule_compaction(self):
+        """Compact old history on a background thread (no-op if one is already running)"""
+        self._since_compaction = 0
+        if self.compact_after_days <= 0:
+            return
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(target=self.compact_history, name="IncomeTrackerCompaction", daemon=True)
+        self._compaction_thread.start()
+
+    def schedule_hydration(self):
+        """Read the active commander's full history on a background thread if only the snapshot was loaded"""
+        if self.ledger.hydrated:
+            return
+        if self._hydration_thread and self._hydration_thread.is_alive():
+            return
+        self._hydration_thread = threading.Thread(target=self.ledger.hydrate, name="IncomeTrackerHydration", daemon=True)
+        self._hydration_thread.start()
 
-            # Only count as "play time" if transactions are close together
-            # (e.g., max 30 minutes between transactions = active play)
-            if time_diff < 1800:  # 30 minutes
-                total_play_time += time_diff
+    def compact_history(self, now: float = None) -> int:
+        """
+        Fold the active commander's transactions older than compact_after_days into per-period summaries.
 
-        if total_play_time > 0:
-            return (total_earned * 3600.0) / total_play_time
+        The fold runs without holding the lock against a snapshot of the store;
+        totals, counts and active play time are compared before and after, and
+        only a matching result is written to the ledger and swapped in.
 
-        # Fallback: if no play time calculated, use current session time
-        if len(self.transactions) > 1:
-            started = self.transactions[0].time
-            now = time.time()
-            if now > started:
-                return total_earned * 3600.0 / (now - started)
+        Returns:
+            int: Number of transactions compacted
+        """
+        if self.compact_after_days <= 0:
+            return 0
+        try:
+            # Compaction works on the full history
+            hydration = self._hydration_thread
+            if hydration and hydration is not threading.current_thread():
+                hydration.join()
+            ledger = self.ledger
+            ledger.hydrate()
+            with self._lock:
+                if ledger is not self.ledger or not ledger.hydrated:
+                    return 0
+                generation = ledger.generation
+                snapshot = len(ledger.transactions)
+                existing = list(ledger.summaries)
+                existing_locations = ledger.location_summaries
+                idle_threshold = ledger.play_time.idle_threshold
 
-        return 0.0
+            cutoff = (now if now is not None else time.time()) - self.compact_after_days * 86400
+            count = min(compaction.count_older_than(ledger.transactions, cutoff), snapshot)
+            if not count:
+                return 0
+
+            previous_time = max((s.last_time for s in existing), default=None)
+            folded = compaction.summarize(ledger.transactions, count, COMPACTION_PERIOD_SECONDS, idle_threshold, previous_time)
+            # Summaries are mutated by merge_summaries, so fold into copies
+            merged = compaction.merge_summaries([compaction.HistorySummary.from_record(s.to_record()) for s in existing], folded)
+            merged_locations = compaction.merge_locations(existing_locations, compaction.summarize_locations(ledger.transactions, count))
+
+            if not self._verify_compaction(ledger, existing, merged, count, snapshot, idle_threshold) \
+                    or not self._verify_locations(ledger, existing_locations, merged_locations, count, snapshot):
+                log_warning(f"History compaction aborted: totals differ after folding {count} transactions")
+                return 0
+
+            with self._lock:
+                if generation != ledger.generation:
+                    return 0
+                ledger.ledger_file.rewrite(
+                    merged,
+                    islice(ledger.transactions.located_rows(), count, None),
+                    [[system, station, earnings, total] for (system, station), (earnings, total) in merged_locations.items()],
+                )
+                ledger.transactions.drop_prefix(count)
+                ledger.summaries = merged
+                ledger.location_summaries = merged_locations
+                # The rewrite invalidated the snapshot's ledger offset
+                ledger.save_snapshot()
+            log_info(f"Compacted {count} transactions of {ledger.label()} into {len(merged)} summaries")
+            return count
+        except Exception as e:
+            log_critical(f"History compaction failed: {e}")
+            return 0
+
+    @staticmethod
+    def _verify_compaction(ledger, existing, merged, count: int, snapshot: int, idle_threshold: float) -> bool:
+        """Check that compaction preserves per-category totals, counts and active play time"""
+        before_rows = list(islice(ledger.transactions.rows(), snapshot))
+        after_rows = before_rows[count:]
+
+        before = compaction.totals(existing, before_rows)
+        after = compaction.totals(merged, after_rows)
+        if set(before) != set(after):
+            return False
+        for category, (earnings, total_count) in before.items():
+            if total_count != after[category][1] or abs(earnings - after[category][0]) > 1e-6:
+                return False
+
+        play_times = []
+        for summaries, rows in ((existing, before_rows), (merged, after_rows)):
+            play_time = ActivePlayTime(idle_threshold)
+            for summary in summaries:
+                play_time.add_summary(summary)
+            for timestamp, _, _ in rows:
+                play_time.add(timestamp)
+            play_times.append(play_time)
+        before_time, after_time = play_times
+        return (before_time.count == after_time.count
+                and before_time.first_time == after_time.first_time
+                and before_time.last_time == after_time.last_time
+                and abs(before_time.play_time - after_time.play_time) < 1e-6)
+
+    @staticmethod
+    def _rebuild_profit(ledger, locations: dict = None, start: int = 0, stop: int = None) -> ProfitIndex:
+        """Recompute a profit index from location summaries and a slice of the stored transactions"""
+        index = ProfitIndex()
+        for (system, station), (earnings, total) in (ledger.location_summaries if locations is None else locations).items():
+            index.add(earnings, system, station, total)
+        for _, earnings, _, system, station in islice(ledger.transactions.located_rows(), start, stop):
+            index.add(earnings, system, station)
+        return index
+
+    def _verify_locations(self, ledger, existing: dict, merged: dict, count: int, snapshot: int) -> bool:
+        """Check that compaction preserves the per-system and per-station totals"""
+        before = self._rebuild_profit(ledger, existing, 0, snapshot)
+        return before.matches(self._rebuild_profit(ledger, merged, count, snapshot))
+    #endregion
 
     def update_window(self):
-        """Update the display widgets"""
+        """Request a repaint of the display widgets"""
         if self.ui:
-            self.ui.update_display()
+            self.ui.request_update()
 
     def update_credits(self, credits: int):
         """Update current credit balance from journal state"""
         if self.current_credits != credits:
-            log_debug(f"[CREDITS] Credits updated: {self.current_credits:,} -> {credits:,}")
+            log_debug("[CREDITS] Credits updated: {:,} -> {:,}", self.current_credits, credits)
             self.current_credits = credits
             self.update_window()
 
@@ -145,3 +676,9 @@ class EDMCIncome:
         log_debug("Refreshing UI")
         if self.ui:
             self.ui.refresh_ui()
+
+
+# Hot-path timers (only wrapped while instrumentation is enabled)
+instrumentation.register(EDMCIncome, "transaction")
+instrumentation.register(EDMCIncome, "save")
+instrumentation.register(EDMCIncome, "save_state")
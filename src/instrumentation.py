@@ -0,0 +1,136 @@
+"""
+EDMC Income Tracker Plugin - Hot path timing instrumentation
+
+Hooks are registered up front but only wrapped with a timer while
+instrumentation is enabled, so a disabled hook is the original function
+with no extra call or check.
+"""
+
+import functools
+import json
+import time
+from bisect import bisect_left
+
+# Histogram bucket upper bounds in microseconds; one extra overflow bucket follows
+BUCKET_BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 50_000, 100_000, 1_000_000)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    __slots__ = ("bounds_ns", "counts", "count", "total_ns", "max_ns")
+
+    def __init__(self, bounds_us=BUCKET_BOUNDS_US):
+        self.bounds_ns = [b * 1000 for b in bounds_us]
+        self.counts = [0] * (len(bounds_us) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int):
+        self.counts[bisect_left(self.bounds_ns, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (microseconds) of the bucket containing the given percentile"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.bounds_ns):
+                    return self.bounds_ns[index] / 1000.0
+                return self.max_ns / 1000.0
+        return self.max_ns / 1000.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000.0 if self.count else 0.0,
+            "p50_us": self.percentile(0.50),
+            "p99_us": self.percentile(0.99),
+            "max_us": self.max_ns / 1000.0,
+            "buckets_us": [b // 1000 for b in self.bounds_ns] + ["inf"],
+            "counts": list(self.counts),
+        }
+
+
+class Instrumentation:
+    """Registry of timed hooks and their histograms"""
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self._hooks = []        # (owner, attribute, hook name)
+        self._originals = {}    # (id(owner), attribute) -> original
+
+    def register(self, owner, attribute: str, name: str = None):
+        """Register a function/method to be timed while instrumentation is enabled"""
+        name = name or f"{getattr(owner, '__name__', owner)}.{attribute}"
+        self._hooks.append((owner, attribute, name))
+        self.histograms.setdefault(name, Histogram())
+        if self.enabled:
+            self._wrap(owner, attribute, name)
+
+    def _wrap(self, owner, attribute, name):
+        key = (id(owner), attribute)
+        if key in self._originals:
+            return
+        original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+        histogram = self.histograms[name]
+        clock = time.perf_counter_ns
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+
+        self._originals[key] = (owner, original)
+        setattr(owner, attribute, timed)
+
+    def enable(self):
+        """Start timing all registered hooks"""
+        if self.enabled:
+            return
+        self.enabled = True
+        for owner, attribute, name in self._hooks:
+            self._wrap(owner, attribute, name)
+
+    def disable(self):
+        """Stop timing and restore the original functions"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        for (_, attribute), (owner, original) in self._originals.items():
+            setattr(owner, attribute, original)
+        self._originals = {}
+
+    def reset(self):
+        """Clear all recorded timings"""
+        for name in self.histograms:
+            self.histograms[name] = Histogram()
+        if self.enabled:
+            # Re-wrap so the timers point at the fresh histograms
+            self.disable()
+            self.enable()
+
+    def snapshot(self) -> dict:
+        """Get per-hook counters and histograms"""
+        return {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+
+    def dump(self, path: str):
+        """Write a snapshot to a JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"enabled": self.enabled, "created": time.time(), "hooks": self.snapshot()}, f, indent=2)
+
+
+# Shared instance used by all plugin modules
+instrumentation = Instrumentation()
@@ -2,64 +2,139 @@
 EDMC Income Tracker Plugin - Journal entry processing
 """
 
-from src.utils import log_debug
+from src.utils import log_debug, parse_journal_timestamp
 from src.constants import JOURNAL_EVENT_CATEGORIES, JOURNAL_FIELDS
 
+
+def build_dispatch_table(tracked: dict) -> dict:
+    """
+    Compile JOURNAL_EVENT_CATEGORIES into a flat lookup table.
+
+    Args:
+        tracked: Category name -> whether it is tracked (maintenance is always tracked)
+
+    Returns:
+        dict: event -> tuple of (category, journal_field, sign)
+    """
+    table = {}
+    for category, events in JOURNAL_EVENT_CATEGORIES.items():
+        if category != "maintenance" and not tracked.get(category, False):
+            continue
+
+        for event, (key_names, signs) in events.items():
+            fields = []
+            for key_name, sign in zip(key_names, signs):
+                journal_key = JOURNAL_FIELDS.get(key_name)
+                if not journal_key:
+                    log_debug(f"Unknown field key: {key_name} in event {event}")
+                    continue
+                fields.append((category, journal_key, sign))
+            table[event] = table.get(event, ()) + tuple(fields)
+    return table
+
+
 class JournalProcessor:
     """Handles processing of Elite Dangerous journal entries"""
 
     def __init__(self, income_tracker, preferences_manager):
         self.income_tracker = income_tracker
         self.preferences = preferences_manager
+        self.dispatch_table = {}
+        self._dispatch_tracked = None
+        self.event_hooks = []   # (category, events, handler) registered by trackers
+        self.event_table = {}   # event -> (income fields or None, handlers or None), tracked categories only
+        self._commander = None  # (cmdr, is_beta) of the last entry
+
+        # Record transactions at the entry's own timestamp instead of now (used for replays)
+        self.use_entry_timestamps = False
+        self.rebuild_dispatch_table()
+
+    def rebuild_dispatch_table(self) -> bool:
+        """Recompile the event dispatch table if the tracked categories changed"""
+        tracked = self.preferences.tracked_categories()
+        if tracked == self._dispatch_tracked:
+            return False
+        self.dispatch_table = build_dispatch_table(tracked)
+        self._dispatch_tracked = tracked
+        self._compile_event_table()
+        log_debug(f"Dispatch table compiled: {len(self.dispatch_table)} events")
+        return True
+
+    def register_event_hook(self, category: str, events, handler):
+        """
+        Call handler(entry, timestamp) for the given events while the category is tracked.
+
+        Hooks run before the income transactions of the same entry are recorded.
+        """
+        self.event_hooks.append((category, tuple(events), handler))
+        self._compile_event_table()
+
+    def _compile_event_table(self):
+        """Merge the dispatch table and the hooks of tracked categories, so each entry needs one lookup"""
+        tracked = self._dispatch_tracked or {}
+        hooks = {}
+        for category, events, handler in self.event_hooks:
+            if category != "maintenance" and not tracked.get(category, False):
+                continue
+            for event in events:
+                hooks[event] = hooks.get(event, ()) + (handler,)
+        self.event_table = {
+            event: (self.dispatch_table.get(event), hooks.get(event))
+            for event in self.dispatch_table.keys() | hooks.keys()
+        }
+
+    def process_journal_entry(self, cmdr, is_beta, system, station, entry, state, synthetic=False):
+        """
+        Process a journal entry and update income tracking.
+
+        Synthetic entries (debug tools) are recorded for the active commander: they
+        never switch partitions, so they cannot create one or move a pre-partition
+        ledger to their commander.
+        """
+        # Route everything to the right commander's ledger (LoadGame or any later entry)
+        if not synthetic and cmdr is not None and (cmdr, is_beta) != self._commander:
+            self._commander = (cmdr, is_beta)
+            self.income_tracker.switch_commander(cmdr, is_beta)
 
-    def process_journal_entry(self, cmdr, is_beta, system, station, entry, state):
-        """Process a journal entry and update income tracking."""
         # Always handle credits state
         if 'Credits' in state:
-            log_debug(f"[CREDITS] {state['Credits']:,}")
+            log_debug("[CREDITS] {:,}", state['Credits'])
             self.income_tracker.update_credits(state['Credits'])
 
         if 'IsDocked' in state:
-            log_debug(f"[STATE] IsDocked: {state['IsDocked']}")
+            log_debug("[STATE] IsDocked: {}", state['IsDocked'])
 
         event = entry.get("event")
         if not event:
             return "No event found"
 
-        prefs = self.preferences
-        track_map = {
-            "trading": prefs.cached_track_trading,
-            "combat": prefs.cached_track_combat,
-            "exploration": prefs.cached_track_exploration,
-            "missions": prefs.cached_track_missions,
-        }
+        compiled = self.event_table.get(event)
+        if compiled is None:
+            return None
+        fields, hooks = compiled
 
-        for category, events in JOURNAL_EVENT_CATEGORIES.items():
-            if category != "maintenance" and not track_map.get(category, False):
-                continue
+        timestamp = None
+        if self.use_entry_timestamps and "timestamp" in entry:
+            timestamp = parse_journal_timestamp(entry["timestamp"])
 
-            if event not in events:
-                continue
-
-            key_names, signs = events[event]
-            amounts_found = False
-
-            for key_name, sign in zip(key_names, signs):
-                journal_key = JOURNAL_FIELDS.get(key_name)
-                if not journal_key:
-                    log_debug(f"Unknown field key: {key_name} in event {event}")
-                    continue
+        if hooks:
+            for handler in hooks:
+                handler(entry, timestamp)
+        if fields is None:
+            return None
 
-                amount = entry.get(journal_key, 0)
-                if amount:
-                    self.income_tracker.transaction(sign * amount, category)
-                    amounts_found = True
+        recorded = None
+        for category, journal_key, sign in fields:
+            amount = entry.get(journal_key, 0)
+            if amount:
+                self.income_tracker.transaction(sign * amount, category, timestamp, event, cmdr, system, station)
+                recorded = category
 
-            if amounts_found:
-                log_debug(f"Processed event `{event}` in category `{category}`")
-                return f"Event: {event}"
+        if recorded:
+            log_debug("Processed event `{}` in category `{}`", event, recorded)
+            return f"Event: {event}"
 
-        log_debug(f"Skipping unknown or untracked event: {event}")
+        log_debug("Skipping event without amounts: {}", event)
         return None
 
     def process_dashboard_entry(self, cmdr, is_beta, entry):
@@ -0,0 +1,264 @@
+"""
+EDMC Income Tracker Plugin - Append-only on-disk transaction ledger
+"""
+
+import hashlib
+import json
+import os
+import time
+from src.constants import LEDGER_FSYNC_EVERY, LEDGER_FSYNC_INTERVAL
+from src.utils import log_debug, log_warning, log_error
+
+_CHUNK_SIZE = 64 * 1024
+_FINGERPRINT_BYTES = 256
+
+
+def _check_record(kind: str, value):
+    """Raise ValueError or TypeError unless value is a well-formed summary or location record"""
+    if kind == "summary":
+        period_start, category, earnings, count, play_time, first_time, last_time = value[:7]
+        if not isinstance(category, str):
+            raise TypeError("summary category is not a string")
+        period_start + earnings + count + play_time + first_time + last_time  # All numbers
+    elif kind == "location":
+        system, station, earnings, count = value[:4]
+        earnings + count
+    else:
+        raise ValueError(f"unknown record kind {kind!r}")
+
+
+class LedgerFile:
+    """
+    One JSON array per line: [time, earnings, category] or, when the location
+    is known, [time, earnings, category, system, station]. Compacted history
+    is stored as {"summary": [...]} and {"location": [...]} lines (see
+    src.compaction) ahead of them.
+
+    Appends are written straight through to the OS and fsynced every
+    LEDGER_FSYNC_EVERY records or LEDGER_FSYNC_INTERVAL seconds, whichever
+    comes first. A torn or corrupt tail left by a crash is truncated on open.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    #region Opening and recovery
+    def open(self):
+        """Recover the file tail and open it for appending"""
+        if self._file:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:  # A bare file name lives in the working directory
+            os.makedirs(directory, exist_ok=True)
+        self._recover()
+        self._file = open(self.path, "ab")
+        self._last_sync = time.monotonic()
+
+    def _recover(self):
+        """Truncate any incomplete or unparseable records at the end of the file"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = self._line_start(f, end)
+                f.seek(start)
+                line = f.read(end - start)
+                if line.endswith(b"\n"):
+                    try:
+                        json.loads(line)
+                        break
+                    except ValueError:
+                        pass
+                # Partial or corrupt record: drop it and check the one before
+                end = start
+
+            if end < size:
+                f.truncate(end)
+                log_warning(f"Ledger recovery: truncated {size - end} bytes from {self.path}")
+
+    @staticmethod
+    def _line_start(f, end: int) -> int:
+        """Find the offset where the line ending at `end` begins"""
+        pos = end - 1  # Skip the line's own terminator
+        while pos > 0:
+            chunk_start = max(0, pos - _CHUNK_SIZE)
+            f.seek(chunk_start)
+            chunk = f.read(pos - chunk_start)
+            index = chunk.rfind(b"\n")
+            if index != -1:
+                return chunk_start + index + 1
+            pos = chunk_start
+        return 0
+    #endregion
+
+    #region Writing
+    @staticmethod
+    def _encode(record) -> bytes:
+        """Serialize a (time, earnings, category[, system, station]) record, leaving out an unknown location"""
+        if len(record) > 3 and record[3] is None and record[4] is None:
+            record = record[:3]
+        return json.dumps(list(record), separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def append(self, timestamp: float, earnings: float, category: str, system: str = None, station: str = None):
+        """Append a single transaction record"""
+        if not self._file:
+            self.open()
+        self._file.write(self._encode((timestamp, earnings, category, system, station)))
+        self._file.flush()
+
+        self._unsynced += 1
+        if self._unsynced >= LEDGER_FSYNC_EVERY or time.monotonic() - self._last_sync >= LEDGER_FSYNC_INTERVAL:
+            self.sync()
+
+    def append_many(self, records):
+        """Append an iterable of (time, earnings, category[, system, station]) records and sync once"""
+        if not self._file:
+            self.open()
+        write = self._file.write
+        encode = self._encode
+        count = 0
+        for record in records:
+            write(encode(record))
+            count += 1
+        self._file.flush()
+        self._unsynced += count
+        self.sync()
+        return count
+
+    def sync(self):
+        """Force written records to disk"""
+        if not self._file or not self._unsynced:
+            return
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            log_error(f"Ledger fsync failed: {e}")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def truncate(self):
+        """Discard every record"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            with open(self.path, "wb"):
+                pass
+        self._unsynced = 0
+        log_debug(f"Ledger truncated: {self.path}")
+
+    def rewrite(self, summaries, records, locations=()):
+        """
+        Atomically replace the file with summary and location lines followed by records.
+
+        The new contents are written and fsynced to a temporary file which then
+        replaces the ledger, so a crash leaves either the old or the new file.
+        """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            for summary in summaries:
+                f.write(json.dumps({"summary": summary.to_record()}, separators=(",", ":")).encode("utf-8") + b"\n")
+            for location in locations:
+                f.write(json.dumps({"location": location}, separators=(",", ":")).encode("utf-8") + b"\n")
+            for record in records:
+                f.write(self._encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+
+        if self._file:
+            self._file.close()
+            self._file = None
+        os.replace(temp_path, self.path)
+        self._unsynced = 0
+        self.open()
+
+    def close(self):
+        """Sync and close the file"""
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+    #endregion
+
+    #region Reading
+    def entries(self, start: int = 0, stop: int = None):
+        """
+        Stream (kind, value) pairs from disk:
+        ("summary", record), ("location", record) or ("transaction", (time, earnings, category, system, station))
+
+        Lines that are not valid JSON, records of an unknown kind and malformed
+        records are skipped (and counted in one warning).
+
+        start and stop are byte offsets of line boundaries (see size()) to read part of the file.
+        """
+        if self._file:
+            self._file.flush()
+        if not os.path.exists(self.path):
+            return
+
+        skipped = 0
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            position = start
+            for line in f:
+                position += len(line)
+                if stop is not None and position > stop:
+                    break
+                try:
+                    value = json.loads(line)
+                    if isinstance(value, dict):
+                        kind, = value
+                        _check_record(kind, value[kind])
+                        entry = (kind, value[kind])
+                    else:
+                        timestamp, earnings, category = value[:3]
+                        timestamp + earnings  # Both numbers
+                        system, station = (value[3:5] + [None, None])[:2]
+                        entry = ("transaction", (timestamp, earnings, category, system, station))
+                except (ValueError, TypeError, KeyError):
+                    skipped += 1
+                    continue
+                yield entry
+
+        if skipped:
+            log_warning(f"Ledger: skipped {skipped} unreadable records in {self.path}")
+
+    def records(self):
+        """Stream (time, earnings, category) tuples from disk (summary lines are skipped)"""
+        for kind, value in self.entries():
+            if kind == "transaction":
+                yield value[:3]
+
+    def is_empty(self) -> bool:
+        return not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+    def size(self) -> int:
+        """Bytes written so far (always a line boundary)"""
+        if self._file:
+            self._file.flush()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def fingerprint(self, size: int) -> str:
+        """Hash of the bytes just before `size`, to check the file still starts with the same records"""
+        if self._file:
+            self._file.flush()
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(max(0, size - _FINGERPRINT_BYTES))
+                data = f.read(min(size, _FINGERPRINT_BYTES))
+        except OSError:
+            return ""
+        if len(data) != min(size, _FINGERPRINT_BYTES):
+            return ""
+        return hashlib.sha1(data).hexdigest()
+    #endregion
+
+    def __repr__(self):
+        return f"LedgerFile({self.path!r})"
+
@@ -0,0 +1,189 @@
+"""
+EDMC Income Tracker Plugin - Mission lifecycle tracking
+"""
+
+import time
+from collections import OrderedDict
+from src.constants import MISSION_ACTIVE_LIMIT, MISSION_EXPIRY_GRACE_SECONDS
+from src.utils import parse_journal_timestamp
+
+
+def mission_type(name: str) -> str:
+    """Readable mission type from the journal Name ("Mission_Courier_Elections_name" -> "Courier Elections")"""
+    if name.lower().startswith("mission_"):
+        name = name[8:]
+    if name.lower().endswith("_name"):
+        name = name[:-5]
+    return name.replace("_", " ").strip() or "Unknown"
+
+
+class MissionStats:
+    """Outcome totals of a group of missions (one mission type or one faction)"""
+
+    __slots__ = ("completed", "failed", "earnings", "timed_earnings", "duration")
+
+    def __init__(self, completed=0, failed=0, earnings=0.0, timed_earnings=0.0, duration=0.0):
+        self.completed = completed
+        self.failed = failed
+        self.earnings = earnings              # Rewards minus donations and fines
+        self.timed_earnings = timed_earnings  # Earnings of the missions whose acceptance was seen
+        self.duration = duration              # Seconds from acceptance to outcome of those missions
+
+    def add(self, earnings: float, completed: bool, duration: float = None):
+        if completed:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.earnings += earnings
+        if duration is not None:
+            self.timed_earnings += earnings
+            self.duration += duration
+
+    def rate(self) -> float:
+        """Earnings per hour of mission time"""
+        return self.timed_earnings * 3600.0 / self.duration if self.duration > 0 else 0.0
+
+    def to_record(self) -> list:
+        return [self.completed, self.failed, self.earnings, self.timed_earnings, self.duration]
+
+
+class MissionTracker:
+    """
+    Missions from acceptance to completion, failure or abandonment.
+
+    Active missions are kept in a dict keyed by MissionID, so each event is
+    a single lookup. At most MISSION_ACTIVE_LIMIT are kept (the game allows
+    20); past that, expired missions and then the oldest ones are dropped.
+    """
+
+    EVENTS = ("MissionAccepted", "MissionCompleted", "MissionFailed", "MissionAbandoned", "Missions")
+
+    def __init__(self, limit: int = MISSION_ACTIVE_LIMIT):
+        self.limit = limit
+        self.reset()
+
+    def reset(self):
+        """Forget all missions and results"""
+        self.active = OrderedDict()  # MissionID -> [accepted time, expiry time or None, type, faction]
+        self.by_type = {}            # mission type -> MissionStats
+        self.by_faction = {}         # faction -> MissionStats
+        self.dirty = False
+
+    def handle_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: follow a mission through its lifecycle"""
+        event = entry.get("event")
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        if event == "Missions":
+            self._reconcile(entry)
+            return
+
+        mission_id = entry.get("MissionID")
+        if mission_id is None:
+            return
+
+        if event == "MissionAccepted":
+            expiry = None
+            if entry.get("Expiry"):
+                try:
+                    expiry = parse_journal_timestamp(entry["Expiry"])
+                except ValueError:
+                    pass
+            self.active[mission_id] = [timestamp, expiry, mission_type(entry.get("Name", "")), entry.get("Faction", "")]
+            if len(self.active) > self.limit:
+                self._prune(timestamp)
+            self.dirty = True
+            return
+
+        mission = self.active.pop(mission_id, None)
+        if event == "MissionCompleted":
+            earnings = entry.get("Reward", 0) - entry.get("Donated", 0)
+        elif event in ("MissionFailed", "MissionAbandoned"):
+            earnings = -entry.get("Fine", 0)
+        else:
+            return
+
+        if mission:
+            accepted, _, name, faction = mission
+            duration = max(timestamp - accepted, 0.0)
+        else:
+            # Accepted before tracking started: counted, but without a duration
+            name, faction, duration = mission_type(entry.get("Name", "")), entry.get("Faction", ""), None
+
+        completed = event == "MissionCompleted"
+        for index, key in ((self.by_type, name), (self.by_faction, faction)):
+            stats = index.get(key)
+            if stats is None:
+                stats = index[key] = MissionStats()
+            stats.add(earnings, completed, duration)
+        self.dirty = True
+
+    def _prune(self, now: float):
+        """Drop expired missions, then the oldest, until within the limit"""
+        expired = [mission_id for mission_id, (_, expiry, _, _) in self.active.items()
+                   if expiry is not None and expiry + MISSION_EXPIRY_GRACE_SECONDS < now]
+        for mission_id in expired:
+            del self.active[mission_id]
+        while len(self.active) > self.limit:
+            self.active.popitem(last=False)
+
+    def _reconcile(self, entry: dict):
+        """Forget missions the game no longer lists as active (sent on every login)"""
+        listed = {mission.get("MissionID") for mission in entry.get("Active", [])}
+        stale = [mission_id for mission_id in self.active if mission_id not in listed]
+        for mission_id in stale:
+            del self.active[mission_id]
+        if stale:
+            self.dirty = True
+
+    #region Queries
+    def active_count(self) -> int:
+        return len(self.active)
+
+    @staticmethod
+    def _ranked(index: dict, count: int) -> list:
+        best = sorted(index.items(), key=lambda item: item[1].earnings, reverse=True)[:count]
+        return [(key, stats.earnings, stats.rate(), stats.completed, stats.failed) for key, stats in best]
+
+    def top_types(self, count: int = 5) -> list:
+        """
+        Most rewarding mission types.
+
+        Returns:
+            list: (type, earnings, earnings per hour of mission time, completed, failed)
+        """
+        return self._ranked(self.by_type, count)
+
+    def top_factions(self, count: int = 5) -> list:
+        """
+        Most rewarding factions.
+
+        Returns:
+            list: (faction, earnings, earnings per hour of mission time, completed, failed)
+        """
+        return self._ranked(self.by_faction, count)
+
+    def mission_rate(self) -> float:
+        """Mission earnings per hour of mission time, over every timed mission"""
+        stats = MissionStats()
+        for item in self.by_type.values():
+            stats.timed_earnings += item.timed_earnings
+            stats.duration += item.duration
+        return stats.rate()
+    #endregion
+
+    #region Persistence
+    def to_dict(self) -> dict:
+        return {
+            "active": [[mission_id] + mission for mission_id, mission in self.active.items()],
+            "types": {key: stats.to_record() for key, stats in self.by_type.items()},
+            "factions": {key: stats.to_record() for key, stats in self.by_faction.items()},
+        }
+
+    def load_dict(self, data: dict):
+        self.reset()
+        for mission_id, accepted, expiry, name, faction in data.get("active", []):
+            self.active[mission_id] = [accepted, expiry, name, faction]
+        self.by_type = {key: MissionStats(*record) for key, record in data.get("types", {}).items()}
+        self.by_faction = {key: MissionStats(*record) for key, record in data.get("factions", {}).items()}
+    #endregion
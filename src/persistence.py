@@ -0,0 +1,79 @@
+"""
+EDMC Income Tracker Plugin - Write-behind config persistence
+"""
+
+import threading
+import time
+from src.constants import CONFIG_FLUSH_INTERVAL
+from src.utils import log_debug, log_error
+
+
+class WriteBehindConfig:
+    """
+    Coalesces config writes.
+
+    set() only records the latest value for a key. Pending values are written
+    to EDMC's config at most once every `interval` seconds from a background
+    timer, or immediately via flush().
+    """
+
+    def __init__(self, config, interval: float = CONFIG_FLUSH_INTERVAL):
+        self.config = config
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._last_flush = 0.0
+
+        # Counters
+        self.writes_requested = 0
+        self.writes_performed = 0
+        self.flushes = 0
+
+    @property
+    def writes_coalesced(self) -> int:
+        """Number of requested writes that were superseded before reaching config"""
+        return self.writes_requested - self.writes_performed - len(self._pending)
+
+    def set(self, key: str, value):
+        """Mark a config value dirty; it is written on the next flush"""
+        with self._lock:
+            self._pending[key] = value
+            self.writes_requested += 1
+            if self._timer:
+                return
+            delay = max(0.0, self._last_flush + self.interval - time.monotonic())
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write all pending values to config now"""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return
+
+        for key, value in pending.items():
+            try:
+                self.config.set(key, value)
+            except Exception as e:
+                log_error(f"Failed to write config value {key}: {e}")
+        self.writes_performed += len(pending)
+        self.flushes += 1
+        log_debug(f"Config flushed: {len(pending)} values ({self.writes_coalesced} writes coalesced so far)")
+
+    def stats(self) -> dict:
+        """Get write counters"""
+        return {
+            "requested": self.writes_requested,
+            "performed": self.writes_performed,
+            "coalesced": self.writes_coalesced,
+            "flushes": self.flushes,
+            "pending": len(self._pending),
+        }
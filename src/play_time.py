@@ -0,0 +1,90 @@
+"""
+EDMC Income Tracker Plugin - Incremental active play time tracking
+"""
+
+import time
+from src.constants import IDLE_THRESHOLD_SECONDS
+
+
+class ActivePlayTime:
+    """Accumulates "active play" time from the gaps between consecutive transactions"""
+
+    def __init__(self, idle_threshold: float = IDLE_THRESHOLD_SECONDS):
+        self.idle_threshold = idle_threshold
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded activity"""
+        self.first_time = None
+        self.last_time = None
+        self.play_time = 0.0
+        self.count = 0
+
+    def add(self, timestamp: float):
+        """Account for a transaction at the given time"""
+        if self.count:
+            # Only count as "play time" if transactions are close together
+            time_diff = timestamp - self.last_time
+            if time_diff < self.idle_threshold:
+                self.play_time += time_diff
+        else:
+            self.first_time = timestamp
+        self.last_time = timestamp
+        self.count += 1
+
+    def add_summary(self, summary):
+        """
+        Account for a compacted HistorySummary.
+
+        Summaries carry the play time their transactions contributed, so they
+        can be added in any order as long as they come before the remaining
+        raw transactions.
+        """
+        if self.count:
+            self.first_time = min(self.first_time, summary.first_time)
+            self.last_time = max(self.last_time, summary.last_time)
+        else:
+            self.first_time = summary.first_time
+            self.last_time = summary.last_time
+        self.play_time += summary.play_time
+        self.count += summary.count
+
+    def rebuild(self, transactions, summaries=()):
+        """Replay a transaction history (after any compacted summaries)"""
+        self.reset()
+        for summary in summaries:
+            self.add_summary(summary)
+        for t in transactions:
+            self.add(t.time)
+
+    def set_idle_threshold(self, idle_threshold: float, transactions, summaries=()):
+        """
+        Change the idle threshold and replay the history with it.
+
+        Play time inside compacted summaries keeps the threshold it was folded with.
+        """
+        self.idle_threshold = idle_threshold
+        self.rebuild(transactions, summaries)
+
+    def to_record(self) -> list:
+        return [self.first_time, self.last_time, self.play_time, self.count]
+
+    def load_record(self, record):
+        """Restore activity saved with to_record() (the idle threshold is not part of it)"""
+        self.first_time, self.last_time, self.play_time, self.count = record
+
+    def rate(self, total_earned: float, now: float = None) -> float:
+        """Calculate hourly earnings over active play time"""
+        if not self.count:
+            return 0.0
+
+        if self.play_time > 0:
+            return (total_earned * 3600.0) / self.play_time
+
+        # Fallback: if no play time calculated, use current session time
+        if self.count > 1:
+            now = now if now is not None else time.time()
+            if now > self.first_time:
+                return total_earned * 3600.0 / (now - self.first_time)
+
+        return 0.0
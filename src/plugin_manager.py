@@ -2,12 +2,19 @@
 EDMC Income Tracker Plugin - Plugin Manager for component lifecycle
 """
 
-import tkinter as tk
-from src.utils import log_debug, log_warning, log_critical
+from typing import TYPE_CHECKING
+from src.utils import enable_log_buffer, log_debug, log_warning, log_critical
 from src.preferences import PreferencesManager
-from src.ui import IncomeTrackerUI
 from src.income_tracker import EDMCIncome
 from src.journal_processor import JournalProcessor
+from src.trade_engine import TradeEngine
+from src.mission_tracker import MissionTracker
+from src.voucher_tracker import VoucherTracker
+from src.exploration_estimator import ExplorationEstimator
+from src.instrumentation import instrumentation
+
+if TYPE_CHECKING:
+    import tkinter as tk
 
 
 class PluginManager:
@@ -37,6 +44,13 @@ class PluginManager:
             log_critical("Failed to import constants or utils")
             pass
 
+        from src.constants import DEBUG_MODE, INSTRUMENTATION_ENABLED, LOG_BUFFER_SIZE
+        if DEBUG_MODE:
+            enable_log_buffer(LOG_BUFFER_SIZE)
+        if INSTRUMENTATION_ENABLED:
+            instrumentation.enable()
+            log_debug("Hot-path instrumentation enabled")
+
         # Initialize components
         self.preferences_manager = PreferencesManager()
         self.preferences_manager.load_settings()
@@ -46,13 +60,21 @@ class PluginManager:
 
         # Initialize the income tracker
         self.income_tracker = EDMCIncome(self.ui_manager)
+        self.income_tracker.idle_threshold = self.preferences_manager.cached_idle_threshold
+        self.income_tracker.compact_after_days = self.preferences_manager.cached_compact_after_days
+        self.income_tracker.trade_cost_basis = self.preferences_manager.cached_trade_cost_basis
         self.income_tracker.load()
 
         # Initialize journal processor
         self.journal_processor = JournalProcessor(self.income_tracker, self.preferences_manager)
+        self.journal_processor.register_event_hook("trading", TradeEngine.EVENTS, self.income_tracker.handle_trade_event)
+        self.journal_processor.register_event_hook("missions", MissionTracker.EVENTS, self.income_tracker.handle_mission_event)
+        self.journal_processor.register_event_hook("combat", VoucherTracker.EVENTS, self.income_tracker.handle_voucher_event)
+        self.journal_processor.register_event_hook("exploration", ExplorationEstimator.EVENTS, self.income_tracker.handle_exploration_event)
 
         # Load state
         self.income_tracker.load_state(self.preferences_manager.cached_reset_on_close)
+        self.income_tracker.set_history_enabled(self.preferences_manager.cached_history_db)
 
         from src.constants import PLUGIN_NAME
         return PLUGIN_NAME
@@ -65,15 +87,19 @@ class PluginManager:
 
         # Clear income data on app close
         if self.income_tracker:
-            if self.preferences_manager and self.preferences_manager.cached_reset_on_close:
-                # Reset clears both current session and previous sessions
-                self.income_tracker.reset()
-                log_debug("Income Tracker data cleared on app close (all sessions)")
-            else:
-                self.income_tracker.save_state()
-                log_debug("Income Tracker data NOT cleared on app close due to preference")
-
-    def setup_ui(self, parent: tk.Frame) -> tk.Frame:
+            try:
+                if self.preferences_manager and self.preferences_manager.cached_reset_on_close:
+                    # Reset clears both current session and previous sessions, for every commander
+                    self.income_tracker.reset(all_commanders=True)
+                    log_debug("Income Tracker data cleared on app close (all sessions)")
+                else:
+                    self.income_tracker.save_state()
+                    log_debug("Income Tracker data NOT cleared on app close due to preference")
+            finally:
+                # Always write out anything still pending
+                self.income_tracker.close()
+
+    def setup_ui(self, parent: "tk.Frame") -> "tk.Frame":
         """
         Set up the plugin's main UI.
 
@@ -83,6 +109,9 @@ class PluginManager:
         Returns:
             The frame containing our plugin's UI
         """
+        # Imported here: the Tk UI is only needed once EDMC builds the main window
+        from src.ui import IncomeTrackerUI
+
         # Initialize UI manager
         self.ui_manager = IncomeTrackerUI(self.income_tracker, self.preferences_manager, self.journal_processor)
 
@@ -95,7 +124,7 @@ class PluginManager:
         # Create and return the UI
         return self.ui_manager.create_main_ui(parent)
 
-    def create_preferences_ui(self, parent) -> tk.Frame:
+    def create_preferences_ui(self, parent) -> "tk.Frame":
         """
         Create the plugin's preferences/settings panel.
 
@@ -118,8 +147,18 @@ class PluginManager:
         if self.preferences_manager:
             self.preferences_manager.save_settings()
 
+            # Only recompiles when tracking flags actually changed
+            if self.journal_processor:
+                self.journal_processor.rebuild_dispatch_table()
+
             # Update the display if income tracker exists
             if self.income_tracker:
+                self.income_tracker.set_idle_threshold(self.preferences_manager.cached_idle_threshold)
+                self.income_tracker.set_compact_after_days(self.preferences_manager.cached_compact_after_days)
+                self.income_tracker.set_history_enabled(self.preferences_manager.cached_history_db)
+                self.income_tracker.set_trade_cost_basis(self.preferences_manager.cached_trade_cost_basis)
+                self.income_tracker.flush()
+
                 log_debug("Updating display after preferences change")
                 self.income_tracker.update_window()
 
@@ -2,21 +2,68 @@
 EDMC Income Tracker Plugin - Preferences and configuration management
 """
 
-import tkinter as tk
-from tkinter import ttk
+import os
+import threading
 from config import config # type: ignore
-import myNotebook as nb # type: ignore
-from ttkHyperlinkLabel import HyperlinkLabel # type: ignore
 from src.constants import (
     CFG_TRACK_TRADING, CFG_TRACK_COMBAT, CFG_TRACK_EXPLORATION, CFG_TRACK_MISSIONS,
-    CFG_RESET_ON_CLOSE, CFG_SHOW_TOTAL_CREDITS, GITHUB_REPO_URL, PLUGIN_VERSION, GITHUB_API_URL, PLUGIN_NAME
+    CFG_RESET_ON_CLOSE, CFG_SHOW_TOTAL_CREDITS, GITHUB_REPO_URL, PLUGIN_VERSION, GITHUB_API_URL, PLUGIN_NAME,
+    CFG_IDLE_THRESHOLD, IDLE_THRESHOLD_SECONDS, UPDATE_CACHE_FILE_NAME, UPDATE_POLL_INTERVAL_MS,
+    CFG_COMPACT_AFTER_DAYS, COMPACT_AFTER_DAYS, CFG_HISTORY_DB, CFG_TRADE_COST_BASIS, TRADE_COST_BASIS,
+    EXPORT_FILE_NAME, JOURNAL_EVENT_CATEGORIES
 )
-from src.update_checker import check_for_updates
-from src.utils import get_config_bool, log_debug, Tooltip
+from src.utils import get_config_bool, get_data_dir, log_debug, log_warning, Tooltip
+
+
+# Idle threshold dropdown options (display text -> seconds)
+IDLE_THRESHOLD_OPTIONS = {
+    "5 minutes": 300,
+    "10 minutes": 600,
+    "15 minutes": 900,
+    "30 minutes": 1800,
+    "1 hour": 3600,
+}
+
+# History compaction dropdown options (display text -> days, 0 = never)
+COMPACT_AFTER_OPTIONS = {
+    "Never": 0,
+    "7 days": 7,
+    "30 days": 30,
+    "90 days": 90,
+    "1 year": 365,
+}
+
+# Trade cost basis dropdown options (display text -> method)
+TRADE_COST_BASIS_OPTIONS = {
+    "First in, first out": "fifo",
+    "Average cost": "average",
+}
+
+# Transaction export commander dropdown: every commander, and transactions recorded before any commander was known
+ALL_COMMANDERS = "All commanders"
+NO_COMMANDER = "(no commander)"
+
+# Tk and EDMC's widget modules, bound by _import_widgets() when the panel is built
+tk = ttk = filedialog = nb = HyperlinkLabel = None
+
+
+def _import_widgets():
+    """Import the modules the settings panel is built from (not needed until EDMC's settings window opens)"""
+    global tk, ttk, filedialog, nb, HyperlinkLabel
+    import tkinter as tk
+    from tkinter import ttk, filedialog
+    import myNotebook as nb # type: ignore
+    from ttkHyperlinkLabel import HyperlinkLabel # type: ignore
 
 
 class PreferencesManager:
-    """Manages plugin preferences and settings"""
+    """
+    Manages plugin preferences and settings.
+
+    Settings are read at startup, but the panel is only built when EDMC's
+    settings window is opened, so Tk widgets, EDMC's widget modules and the
+    update checker (requests) are imported by create_preferences_ui().
+    """
 
     def _create_checkbox(self, frame, text, variable, tooltip_text=None, columnspan=2):
         """Create a checkbox with consistent styling and optional tooltip"""
@@ -82,6 +129,15 @@ class PreferencesManager:
         title_label.grid(row=0, column=0, sticky=tk.W)
 
         # Update link (if available)
+        self._show_update_link(title_frame, update_info)
+
+        # Auto-increment row for next element
+        self.current_row += 1
+
+        return title_frame
+
+    def _show_update_link(self, title_frame, update_info):
+        """Add the update link next to the title if a newer version exists"""
         if update_info and update_info.get('has_update'):
             log_debug(f"[VERSIONCODE] Preferences UI: Showing update link for v{update_info['latest_version']}")
             update_label = HyperlinkLabel(title_frame,
@@ -94,10 +150,143 @@ class PreferencesManager:
         else:
             log_debug("[VERSIONCODE] Preferences UI: No update available, not showing update link")
 
+    def _poll_update_check(self, title_frame):
+        """Fill in the update link once the background check has finished"""
+        if not title_frame.winfo_exists():
+            return
+        if not self.update_check.done:
+            title_frame.after(UPDATE_POLL_INTERVAL_MS, self._poll_update_check, title_frame)
+            return
+        log_debug(f"[VERSIONCODE] Preferences UI: Version check result: {self.update_check.result}")
+        self._show_update_link(title_frame, self.update_check.result)
+
+    def _create_export_section(self, frame):
+        """Create the transaction export filters, button and status label"""
+        from src.export import ledger_sources
+
+        # Date range (UTC dates, either end open)
+        self.export_start = tk.StringVar(value="")
+        self.export_end = tk.StringVar(value="")
+        label = nb.Label(frame, text="Export Dates:")
+        label.grid(row=self.current_row, column=0, sticky=tk.W, pady=(0, 5))
+        Tooltip(label, "Only export transactions from the first date to the second (both included), as YYYY-MM-DD in UTC.\n\nLeave either empty for no limit.")
+        dates = nb.Frame(frame)
+        dates.grid(row=self.current_row, column=1, sticky=tk.W, pady=(0, 5))
+        nb.Entry(dates, textvariable=self.export_start, width=12).grid(row=0, column=0)
+        nb.Label(dates, text="to").grid(row=0, column=1, padx=5)
+        nb.Entry(dates, textvariable=self.export_end, width=12).grid(row=0, column=2)
+        self.current_row += 1
+
+        # Income categories
+        label = nb.Label(frame, text="Export Categories:")
+        label.grid(row=self.current_row, column=0, sticky=tk.W, pady=(0, 5))
+        categories = nb.Frame(frame)
+        categories.grid(row=self.current_row, column=1, sticky=tk.W, pady=(0, 5))
+        self.export_categories = {}
+        for column, category in enumerate(JOURNAL_EVENT_CATEGORIES):
+            var = tk.BooleanVar(value=True)
+            nb.Checkbutton(categories, text=category.capitalize(), variable=var).grid(row=0, column=column, sticky=tk.W)
+            self.export_categories[category] = var
+        self.current_row += 1
+
+        # Commander (display text -> partition label, None for every commander)
+        self.export_commanders = {ALL_COMMANDERS: None}
+        for commander, _ in ledger_sources(get_data_dir(config)):
+            self.export_commanders[commander or NO_COMMANDER] = commander
+        self.export_commander = tk.StringVar(value=ALL_COMMANDERS)
+        self._create_dropdown(
+            frame,
+            "Export Commander:",
+            self.export_commander,
+            self.export_commanders.keys(),
+            "Export every commander's transactions, or only one commander's"
+        )
+
+        status = nb.Label(frame, text="")
+        button = nb.Button(frame, text="Export Transactions...", command=lambda: self._start_export(status))
+        button.grid(row=self.current_row, column=0, sticky=tk.W, pady=(0, 5))
+        status.grid(row=self.current_row, column=1, sticky=tk.W, pady=(0, 5))
+        Tooltip(button, "Saves the selected transactions as CSV or JSON Lines.\n\nCompacted history is exported as one summary row per day and category.")
+
         # Auto-increment row for next element
         self.current_row += 1
 
-        return title_frame
+        return button
+
+    def export_filters(self) -> dict:
+        """
+        The export filters chosen in the panel.
+
+        Returns:
+            dict: start, end, categories and commanders arguments (None when not filtered)
+
+        Raises:
+            ValueError: A date is not YYYY-MM-DD (or a full UTC time), or no category is selected
+        """
+        from src.export import parse_time
+        start, end = (value.get().strip() for value in (self.export_start, self.export_end))
+        categories = {category for category, var in self.export_categories.items() if var.get()}
+        if not categories:
+            raise ValueError("No category selected")
+        commander = self.export_commanders.get(self.export_commander.get())
+        return {
+            "start": parse_time(start) if start else None,
+            # A date on its own includes that whole day
+            "end": (parse_time(end) + (86400 if "T" not in end else 0)) if end else None,
+            "categories": None if len(categories) == len(self.export_categories) else categories,
+            "commanders": None if commander is None else {commander},
+        }
+
+    def _start_export(self, status):
+        """Ask for a file and export to it on a background thread"""
+        if self.export_thread and self.export_thread.is_alive():
+            return
+        try:
+            filters = self.export_filters()
+        except ValueError as e:
+            status.config(text=f"Cannot export: {e}")
+            return
+        path = filedialog.asksaveasfilename(
+            parent=status,
+            title="Export Transactions",
+            initialfile=EXPORT_FILE_NAME,
+            defaultextension=".csv",
+            filetypes=(("CSV", "*.csv"), ("JSON Lines", "*.jsonl")),
+        )
+        if not path:
+            return
+
+        data_dir = get_data_dir(config)
+        self.export_result = None
+
+        def run():
+            from src.export import export_file, ledger_sources
+            try:
+                sources = ledger_sources(data_dir, commanders=filters["commanders"])
+                self.export_result = export_file(path, sources, start=filters["start"], end=filters["end"],
+                                                 categories=filters["categories"])
+            except Exception as e:
+                self.export_result = {"error": str(e)}
+
+        status.config(text="Exporting...")
+        self.export_thread = threading.Thread(target=run, name="IncomeTrackerExport", daemon=True)
+        self.export_thread.start()
+        self._poll_export(status)
+
+    def _poll_export(self, status):
+        """Show the export result once the background export has finished"""
+        if not status.winfo_exists():
+            return
+        if self.export_thread.is_alive():
+            status.after(UPDATE_POLL_INTERVAL_MS, self._poll_export, status)
+            return
+        result = self.export_result or {}
+        if "error" in result:
+            log_warning(f"Transaction export failed: {result['error']}")
+            status.config(text="Export failed")
+        else:
+            log_debug(f"Exported {result.get('rows', 0)} transactions in {result.get('seconds', 0):.2f}s")
+            status.config(text=f"Exported {result.get('rows', 0):,} rows")
 
     def __init__(self):
         # Cached tracking settings (updated only when preferences change)
@@ -115,6 +304,18 @@ class PreferencesManager:
         # Show Total Credits setting
         self.cached_show_total_credits = True
 
+        # Longest gap between transactions that still counts as active play
+        self.cached_idle_threshold = IDLE_THRESHOLD_SECONDS
+
+        # Age after which old transactions are folded into daily summaries
+        self.cached_compact_after_days = COMPACT_AFTER_DAYS
+
+        # Keep every transaction in a local SQLite database
+        self.cached_history_db = False
+
+        # How the cost of sold cargo is worked out for trade profit
+        self.cached_trade_cost_basis = TRADE_COST_BASIS
+
         # UI variables
         self.track_trading = None
         self.track_combat = None
@@ -123,10 +324,26 @@ class PreferencesManager:
         self.reset_on_close = None
         self.view_mode = None
         self.show_total_credits = None
+        self.idle_threshold = None
+        self.compact_after_days = None
+        self.history_db = None
+        self.trade_cost_basis = None
 
         # UI row tracking
         self.current_row = 0
 
+        # Background version check (reused while still running)
+        self.update_check = None
+
+        # Background transaction export
+        self.export_thread = None
+        self.export_result = None
+        self.export_start = None
+        self.export_end = None
+        self.export_categories = {}
+        self.export_commanders = {}
+        self.export_commander = None
+
     def load_settings(self):
         """Load settings from config"""
         # Load settings with True as default (tracking enabled by default)
@@ -139,6 +356,20 @@ class PreferencesManager:
 
         self.cached_view_mode = config.get_str("view_mode", default="full")
         self.cached_show_total_credits = get_config_bool(config, CFG_SHOW_TOTAL_CREDITS, default=True)
+        self.cached_idle_threshold = config.get_int(CFG_IDLE_THRESHOLD) or IDLE_THRESHOLD_SECONDS
+        # 0 is a valid choice ("Never"), so only fall back when the key is missing
+        self.cached_compact_after_days = config.get_int(CFG_COMPACT_AFTER_DAYS, default=COMPACT_AFTER_DAYS)
+        self.cached_history_db = get_config_bool(config, CFG_HISTORY_DB, default=False)
+        self.cached_trade_cost_basis = config.get_str(CFG_TRADE_COST_BASIS, default=TRADE_COST_BASIS) or TRADE_COST_BASIS
+
+    def tracked_categories(self) -> dict:
+        """Get the tracking flag for each income category"""
+        return {
+            "trading": self.cached_track_trading,
+            "combat": self.cached_track_combat,
+            "exploration": self.cached_track_exploration,
+            "missions": self.cached_track_missions,
+        }
 
     def save_settings(self):
         """Save settings to config"""
@@ -149,6 +380,7 @@ class PreferencesManager:
         config.set(CFG_TRACK_MISSIONS, self.track_missions.get())
         config.set(CFG_RESET_ON_CLOSE, self.reset_on_close.get())
         config.set(CFG_SHOW_TOTAL_CREDITS, self.show_total_credits.get())
+        config.set(CFG_HISTORY_DB, self.history_db.get())
 
         # Convert display text back to internal key for view mode
         view_mode_options = {
@@ -158,6 +390,18 @@ class PreferencesManager:
         internal_view_mode = view_mode_options.get(self.view_mode.get(), "full")
         config.set("view_mode", internal_view_mode)
 
+        # Convert display text back to seconds for idle threshold
+        internal_idle_threshold = IDLE_THRESHOLD_OPTIONS.get(self.idle_threshold.get(), IDLE_THRESHOLD_SECONDS)
+        config.set(CFG_IDLE_THRESHOLD, internal_idle_threshold)
+
+        # Convert display text back to days for history compaction
+        internal_compact_after_days = COMPACT_AFTER_OPTIONS.get(self.compact_after_days.get(), COMPACT_AFTER_DAYS)
+        config.set(CFG_COMPACT_AFTER_DAYS, internal_compact_after_days)
+
+        # Convert display text back to the cost basis method
+        internal_trade_cost_basis = TRADE_COST_BASIS_OPTIONS.get(self.trade_cost_basis.get(), TRADE_COST_BASIS)
+        config.set(CFG_TRADE_COST_BASIS, internal_trade_cost_basis)
+
         # Update cached settings
         self.cached_track_trading = self.track_trading.get()
         self.cached_track_combat = self.track_combat.get()
@@ -165,12 +409,18 @@ class PreferencesManager:
         self.cached_track_missions = self.track_missions.get()
         self.cached_reset_on_close = self.reset_on_close.get()
         self.cached_show_total_credits = self.show_total_credits.get()
+        self.cached_history_db = self.history_db.get()
         self.cached_view_mode = internal_view_mode
+        self.cached_idle_threshold = internal_idle_threshold
+        self.cached_compact_after_days = internal_compact_after_days
+        self.cached_trade_cost_basis = internal_trade_cost_basis
 
         log_debug("Income Tracker Plugin preferences saved")
 
     def create_preferences_ui(self, parent):
         """Create the preferences UI"""
+        from src.update_checker import BackgroundUpdateCheck
+        _import_widgets()
         # Load current settings first
         self.load_settings()
 
@@ -178,16 +428,18 @@ class PreferencesManager:
         frame = nb.Frame(parent)
         frame.columnconfigure(1, weight=1)
 
-        # Check for updates
-        log_debug("[VERSIONCODE] Preferences UI: Starting version check...")
-        update_info = check_for_updates(PLUGIN_VERSION, GITHUB_API_URL)
-        log_debug(f"[VERSIONCODE] Preferences UI: Version check result: {update_info}")
+        # Check for updates in the background so the panel renders immediately
+        if self.update_check is None or self.update_check.done:
+            log_debug("[VERSIONCODE] Preferences UI: Starting version check...")
+            cache_path = os.path.join(get_data_dir(config), UPDATE_CACHE_FILE_NAME)
+            self.update_check = BackgroundUpdateCheck(PLUGIN_VERSION, GITHUB_API_URL, cache_path).start()
 
         #region Title
         # Title
         # Create title section
         self.current_row = 0
-        self._create_title_section(frame, PLUGIN_NAME, PLUGIN_VERSION, GITHUB_REPO_URL, update_info)
+        title_frame = self._create_title_section(frame, PLUGIN_NAME, PLUGIN_VERSION, GITHUB_REPO_URL)
+        self._poll_update_check(title_frame)
         #endregion
 
         #region Plugin Settings
@@ -209,6 +461,51 @@ class PreferencesManager:
             "Full: Shows all information including maintenance and category breakdown\n\nCompact: Shows only essential information (title, reset, hourly, income)"
         )
 
+        # Idle threshold
+        idle_display = next(
+            (text for text, seconds in IDLE_THRESHOLD_OPTIONS.items() if seconds == self.cached_idle_threshold),
+            "30 minutes"
+        )
+        self.idle_threshold = tk.StringVar(value=idle_display)
+
+        self._create_dropdown(
+            frame,
+            "Idle After:",
+            self.idle_threshold,
+            IDLE_THRESHOLD_OPTIONS.keys(),
+            "Gaps between transactions longer than this are not counted as play time when calculating the hourly rate"
+        )
+
+        # History compaction
+        compact_display = next(
+            (text for text, days in COMPACT_AFTER_OPTIONS.items() if days == self.cached_compact_after_days),
+            "30 days"
+        )
+        self.compact_after_days = tk.StringVar(value=compact_display)
+
+        self._create_dropdown(
+            frame,
+            "Compact History:",
+            self.compact_after_days,
+            COMPACT_AFTER_OPTIONS.keys(),
+            "Transactions older than this are folded into daily per-category summaries to keep saved history small.\n\nTotals and the hourly rate are unchanged."
+        )
+
+        # Trade cost basis
+        cost_basis_display = next(
+            (text for text, method in TRADE_COST_BASIS_OPTIONS.items() if method == self.cached_trade_cost_basis),
+            "First in, first out"
+        )
+        self.trade_cost_basis = tk.StringVar(value=cost_basis_display)
+
+        self._create_dropdown(
+            frame,
+            "Cost Basis:",
+            self.trade_cost_basis,
+            TRADE_COST_BASIS_OPTIONS.keys(),
+            "How the purchase cost of sold cargo is worked out for trade profit.\n\nFirst in, first out: cargo bought first is sold first\n\nAverage cost: every unit costs the average price paid"
+        )
+
         # Show Total Credits option
         self.show_total_credits = tk.BooleanVar(value=self.cached_show_total_credits)
         self._create_checkbox(
@@ -227,6 +524,18 @@ class PreferencesManager:
             "Enabled: All current session earnings will be reset when EDMC is closed.\n\nDisabled: Earnings persist between sessions.",
             columnspan=2
         )
+
+        # Long-term history database
+        self.history_db = tk.BooleanVar(value=self.cached_history_db)
+        self._create_checkbox(
+            frame,
+            "Keep full history database",
+            self.history_db,
+            "Stores every transaction with its commander, system and station in a local SQLite file for historical queries.\n\nThe database is not cleared by resets or history compaction."
+        )
+
+        # Transaction export
+        self._create_export_section(frame)
         #endregion
 
         self._create_divider(frame)
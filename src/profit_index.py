@@ -0,0 +1,92 @@
+"""
+EDMC Income Tracker Plugin - Per-system and per-station profit index
+"""
+
+import heapq
+
+
+class ProfitIndex:
+    """
+    Net earnings and transaction counts per system and per (system, station).
+
+    Updated incrementally as transactions are recorded; top-N queries use a
+    bounded heap (heapq.nlargest) instead of sorting every location.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all locations"""
+        self.systems = {}   # system -> [earnings, count]
+        self.stations = {}  # (system, station) -> [earnings, count]
+
+    def add(self, earnings: float, system: str = None, station: str = None, count: int = 1):
+        """Account for earnings made at a location (unknown parts are skipped)"""
+        if system is None:
+            return
+        entry = self.systems.get(system)
+        if entry is None:
+            self.systems[system] = [earnings, count]
+        else:
+            entry[0] += earnings
+            entry[1] += count
+
+        if station is None:
+            return
+        key = (system, station)
+        entry = self.stations.get(key)
+        if entry is None:
+            self.stations[key] = [earnings, count]
+        else:
+            entry[0] += earnings
+            entry[1] += count
+
+    def by_system(self, system: str) -> float:
+        entry = self.systems.get(system)
+        return entry[0] if entry else 0.0
+
+    def by_station(self, system: str, station: str) -> float:
+        entry = self.stations.get((system, station))
+        return entry[0] if entry else 0.0
+
+    def top_systems(self, count: int = 5) -> list:
+        """
+        Most profitable systems.
+
+        Returns:
+            list: (system, earnings, transactions), largest earnings first
+        """
+        best = heapq.nlargest(count, self.systems.items(), key=lambda item: item[1][0])
+        return [(system, earnings, transactions) for system, (earnings, transactions) in best]
+
+    def top_stations(self, count: int = 5) -> list:
+        """
+        Most profitable stations.
+
+        Returns:
+            list: (system, station, earnings, transactions), largest earnings first
+        """
+        best = heapq.nlargest(count, self.stations.items(), key=lambda item: item[1][0])
+        return [(system, station, earnings, transactions) for (system, station), (earnings, transactions) in best]
+
+    def to_record(self) -> dict:
+        return {
+            "systems": [[system, earnings, count] for system, (earnings, count) in self.systems.items()],
+            "stations": [[system, station, earnings, count] for (system, station), (earnings, count) in self.stations.items()],
+        }
+
+    def load_record(self, record: dict):
+        """Restore an index saved with to_record()"""
+        self.systems = {system: [earnings, count] for system, earnings, count in record.get("systems", [])}
+        self.stations = {(system, station): [earnings, count] for system, station, earnings, count in record.get("stations", [])}
+
+    def matches(self, other: "ProfitIndex") -> bool:
+        """Check two indexes hold the same totals"""
+        for mine, theirs in ((self.systems, other.systems), (self.stations, other.stations)):
+            if set(mine) != set(theirs):
+                return False
+            for key, (earnings, count) in mine.items():
+                if count != theirs[key][1] or abs(earnings - theirs[key][0]) > 1e-6:
+                    return False
+        return True
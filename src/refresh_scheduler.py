@@ -0,0 +1,62 @@
+"""
+EDMC Income Tracker Plugin - Coalesced UI refresh scheduling
+"""
+
+import time
+from src.constants import UI_REFRESH_INTERVAL_MS
+
+
+class RefreshScheduler:
+    """
+    Collapses repaint requests into at most one repaint per interval.
+
+    request() only marks the display dirty. The repaint itself runs on the Tk
+    event loop via widget.after(), so any number of model changes in between
+    are drawn in a single pass.
+    """
+
+    def __init__(self, widget, callback, interval_ms: int = UI_REFRESH_INTERVAL_MS):
+        self.widget = widget
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self._after_id = None
+        self._last_run = 0.0
+
+        # Metrics
+        self.requested = 0
+        self.performed = 0
+
+    def request(self):
+        """Ask for a repaint; coalesced with any repaint already scheduled"""
+        self.requested += 1
+        if self._after_id is not None:
+            return
+        elapsed_ms = (time.monotonic() - self._last_run) * 1000.0
+        delay = max(0, int(self.interval_ms - elapsed_ms))
+        self._after_id = self.widget.after(delay, self._run)
+
+    def flush(self):
+        """Repaint now if a repaint is pending"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._run()
+
+    def cancel(self):
+        """Drop any pending repaint"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self):
+        self._after_id = None
+        self._last_run = time.monotonic()
+        self.performed += 1
+        self.callback()
+
+    def stats(self) -> dict:
+        """Get requested vs. performed repaint counts"""
+        return {
+            "requested": self.requested,
+            "performed": self.performed,
+            "coalesced": self.requested - self.performed - (1 if self._after_id is not None else 0),
+        }
@@ -0,0 +1,101 @@
+"""
+EDMC Income Tracker Plugin - Rolling time-window income rates
+"""
+
+import time
+
+
+class RollingRate:
+    """
+    Earnings over the last `window` seconds, kept in a ring of fixed-width buckets.
+
+    Each slot holds the per-category sums of one bucket. Running totals are
+    updated as buckets enter and leave the window, so add(), tick() and the
+    rate queries are O(1) regardless of history size (advancing the ring
+    touches at most one full turn of slots).
+    """
+
+    def __init__(self, window: float, bucket_width: float):
+        self.window = window
+        self.bucket_width = bucket_width
+        self.size = max(1, int(round(window / bucket_width)))
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded earnings"""
+        self.slots = [None] * self.size
+        self.totals = {}
+        self.total = 0.0
+        self.filled = 0   # Number of non-empty slots
+        self.head = None  # Absolute index of the newest bucket in the window
+
+    def _expire(self, slot: int):
+        bucket = self.slots[slot]
+        if not bucket:
+            return
+        for category, amount in bucket.items():
+            self.totals[category] -= amount
+            self.total -= amount
+        self.slots[slot] = None
+        self.filled -= 1
+
+    def _advance(self, index: int):
+        """Move the window forward so that `index` is the newest bucket"""
+        if self.head is None:
+            self.head = index
+            return
+        if index <= self.head:
+            return
+        for step in range(self.head + 1, self.head + 1 + min(index - self.head, self.size)):
+            self._expire(step % self.size)
+        self.head = index
+        if not self.filled:
+            # Window is empty: drop accumulated float error
+            self.totals = {}
+            self.total = 0.0
+
+    def add(self, timestamp: float, earnings: float, category: str):
+        """Account for a transaction"""
+        index = int(timestamp // self.bucket_width)
+        self._advance(index)
+        if index <= self.head - self.size:
+            return  # Older than the window
+
+        slot = index % self.size
+        bucket = self.slots[slot]
+        if bucket is None:
+            bucket = self.slots[slot] = {}
+            self.filled += 1
+        bucket[category] = bucket.get(category, 0.0) + earnings
+        self.totals[category] = self.totals.get(category, 0.0) + earnings
+        self.total += earnings
+
+    def to_record(self) -> list:
+        return [self.head, [[slot, bucket] for slot, bucket in enumerate(self.slots) if bucket]]
+
+    def load_record(self, record):
+        """Restore buckets saved with to_record()"""
+        self.reset()
+        head, slots = record
+        self.head = head
+        for slot, bucket in slots:
+            self.slots[slot] = dict(bucket)
+            self.filled += 1
+            for category, amount in bucket.items():
+                self.totals[category] = self.totals.get(category, 0.0) + amount
+                self.total += amount
+
+    def tick(self, now: float = None):
+        """Let buckets age out while no transactions arrive"""
+        self._advance(int((now if now is not None else time.time()) // self.bucket_width))
+
+    def earned(self, category: str = None, now: float = None) -> float:
+        """Earnings inside the window (all categories, or one)"""
+        self.tick(now)
+        if category is None:
+            return self.total
+        return self.totals.get(category, 0.0)
+
+    def rate(self, category: str = None, now: float = None) -> float:
+        """Hourly rate over the window"""
+        return self.earned(category, now) * 3600.0 / self.window
@@ -0,0 +1,244 @@
+"""
+EDMC Income Tracker Plugin - Per-commodity trade profit and cost basis
+"""
+
+import time
+from collections import deque
+from src.constants import IDLE_THRESHOLD_SECONDS, TRADE_COST_BASIS
+from src.play_time import ActivePlayTime
+
+COST_BASIS_METHODS = ("fifo", "average")
+
+
+class CommodityBook:
+    """
+    Cargo lots and realised profit of one commodity.
+
+    Lots are [count, unit cost] pairs. With FIFO, sales consume the oldest
+    lots first; each lot is consumed at most once, so a sale is amortised
+    O(1). With average cost the book keeps a single lot at the average price.
+    """
+
+    __slots__ = ("name", "lots", "quantity", "cost", "revenue", "cost_of_sales", "sold", "written_off", "activity")
+
+    def __init__(self, name: str, idle_threshold: float = IDLE_THRESHOLD_SECONDS):
+        self.name = name
+        self.lots = deque()
+        self.quantity = 0          # Units held
+        self.cost = 0.0            # Cost basis of the units held
+        self.revenue = 0.0         # Sales
+        self.cost_of_sales = 0.0   # Cost basis of the units sold
+        self.sold = 0              # Units sold
+        self.written_off = 0.0     # Cost basis of cargo ejected or lost
+        self.activity = ActivePlayTime(idle_threshold)  # Time spent trading this commodity
+
+    @property
+    def profit(self) -> float:
+        """Realised profit"""
+        return self.revenue - self.cost_of_sales
+
+    def margin(self) -> float:
+        """Realised profit as a fraction of sales"""
+        return self.profit / self.revenue if self.revenue else 0.0
+
+    def profit_per_hour(self, now: float = None) -> float:
+        """Realised profit per hour of active trading in this commodity"""
+        return self.activity.rate(self.profit, now)
+
+    def buy(self, count: int, unit_cost: float, method: str):
+        if count <= 0:
+            return
+        if method == "average" and self.lots:
+            self.lots[0][0] += count
+            self.lots[0][1] = (self.cost + count * unit_cost) / self.lots[0][0]
+        else:
+            self.lots.append([count, unit_cost])
+        self.quantity += count
+        self.cost += count * unit_cost
+
+    def take(self, count: int, fallback_unit_cost: float = 0.0) -> float:
+        """Remove units from the held lots (oldest first) and return their cost basis"""
+        cost = 0.0
+        remaining = count
+        lots = self.lots
+        while remaining and lots:
+            lot = lots[0]
+            used = min(remaining, lot[0])
+            cost += used * lot[1]
+            lot[0] -= used
+            remaining -= used
+            if not lot[0]:
+                lots.popleft()
+        taken = count - remaining
+        self.quantity -= taken
+        self.cost = self.cost - cost if lots else 0.0
+        # Units we never saw being bought (bought before tracking, mined, collected)
+        return cost + remaining * fallback_unit_cost
+
+    def sell(self, count: int, unit_price: float, fallback_unit_cost: float = 0.0) -> float:
+        """Realise a sale and return its profit"""
+        cost = self.take(count, fallback_unit_cost)
+        revenue = count * unit_price
+        self.revenue += revenue
+        self.cost_of_sales += cost
+        self.sold += count
+        return revenue - cost
+
+    def to_average(self):
+        """Collapse the lots into one at the average cost"""
+        if len(self.lots) > 1:
+            self.lots = deque([[self.quantity, self.cost / self.quantity]])
+
+    def to_dict(self) -> dict:
+        return {
+            "lots": [list(lot) for lot in self.lots],
+            "revenue": self.revenue,
+            "cost_of_sales": self.cost_of_sales,
+            "sold": self.sold,
+            "written_off": self.written_off,
+            "activity": self.activity.to_record(),
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict, idle_threshold: float = IDLE_THRESHOLD_SECONDS) -> "CommodityBook":
+        book = cls(name, idle_threshold)
+        book.lots = deque([int(count), float(unit_cost)] for count, unit_cost in data.get("lots", []))
+        book.quantity = sum(lot[0] for lot in book.lots)
+        book.cost = sum(lot[0] * lot[1] for lot in book.lots)
+        book.revenue = data.get("revenue", 0.0)
+        book.cost_of_sales = data.get("cost_of_sales", 0.0)
+        book.sold = data.get("sold", 0)
+        book.written_off = data.get("written_off", 0.0)
+        book.activity.load_record(data.get("activity", [None, None, 0.0, 0]))
+        return book
+
+
+class TradeEngine:
+    """Cost basis and realised profit per commodity, driven by market and cargo journal events"""
+
+    EVENTS = ("MarketBuy", "MarketSell", "MiningRefined", "EjectCargo", "Died")
+
+    def __init__(self, method: str = TRADE_COST_BASIS, idle_threshold: float = IDLE_THRESHOLD_SECONDS):
+        self.method = method if method in COST_BASIS_METHODS else TRADE_COST_BASIS
+        self.idle_threshold = idle_threshold
+        self.books = {}      # commodity symbol -> CommodityBook
+        self.names = {}      # commodity symbol -> localised name
+        self.dirty = False
+
+    def reset(self):
+        """Forget all cargo lots and results"""
+        self.books = {}
+        self.names = {}
+        self.dirty = False
+
+    @staticmethod
+    def symbol(commodity: str) -> str:
+        """Commodity symbol as used by the market events ("$painite_name;" -> "painite")"""
+        symbol = commodity.lower()
+        if symbol.startswith("$") and symbol.endswith("_name;"):
+            symbol = symbol[1:-6]
+        return symbol
+
+    def _book(self, entry: dict) -> CommodityBook:
+        symbol = self.symbol(entry.get("Type", ""))
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = CommodityBook(symbol, self.idle_threshold)
+        localised = entry.get("Type_Localised")
+        if localised:
+            self.names[symbol] = localised
+        return book
+
+    def set_method(self, method: str):
+        """
+        Switch between FIFO and average cost.
+
+        Held FIFO lots are merged at their average cost; going back to FIFO
+        keeps that single lot, since the original lots are gone.
+        """
+        if method not in COST_BASIS_METHODS or method == self.method:
+            return
+        self.method = method
+        if method == "average":
+            for book in self.books.values():
+                book.to_average()
+        self.dirty = self.dirty or bool(self.books)
+
+    def handle_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: update the lots and realised profit"""
+        event = entry.get("event")
+        if event == "Died":
+            for book in self.books.values():
+                book.written_off += book.cost
+                book.take(book.quantity)
+            self.dirty = True
+            return
+        if "Type" not in entry:
+            return
+
+        book = self._book(entry)
+        count = entry.get("Count", 1)
+        if event == "MarketBuy":
+            book.buy(count, entry.get("BuyPrice", 0), self.method)
+        elif event == "MarketSell":
+            # AvgPricePaid covers cargo bought before tracking started
+            book.sell(count, entry.get("SellPrice", 0), entry.get("AvgPricePaid", 0))
+        elif event == "MiningRefined":
+            book.buy(1, 0.0, self.method)
+        elif event == "EjectCargo":
+            book.written_off += book.take(count)
+        else:
+            return
+        if event in ("MarketBuy", "MarketSell"):
+            book.activity.add(timestamp if timestamp is not None else time.time())
+        self.dirty = True
+
+    #region Queries
+    def realised_profit(self) -> float:
+        return sum(book.profit for book in self.books.values())
+
+    def inventory_value(self) -> float:
+        """Cost basis of all cargo held and not yet sold"""
+        return sum(book.cost for book in self.books.values())
+
+    def commodity_stats(self, now: float = None) -> list:
+        """
+        Per-commodity results, most profitable first.
+
+        Returns:
+            list: dicts with name, profit, margin, profit_per_hour, sold, held and held_cost
+        """
+        stats = [
+            {
+                "name": self.names.get(symbol, symbol.capitalize()),
+                "profit": book.profit,
+                "margin": book.margin(),
+                "profit_per_hour": book.profit_per_hour(now),
+                "sold": book.sold,
+                "held": book.quantity,
+                "held_cost": book.cost,
+            }
+            for symbol, book in self.books.items()
+            if book.sold or book.quantity
+        ]
+        stats.sort(key=lambda item: item["profit"], reverse=True)
+        return stats
+    #endregion
+
+    #region Persistence
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "names": self.names,
+            "commodities": {symbol: book.to_dict() for symbol, book in self.books.items()},
+        }
+
+    def load_dict(self, data: dict):
+        self.names = dict(data.get("names", {}))
+        self.books = {
+            symbol: CommodityBook.from_dict(symbol, book, self.idle_threshold)
+            for symbol, book in data.get("commodities", {}).items()
+        }
+        self.set_method(data.get("method", self.method))
+        self.dirty = False
+    #endregion
@@ -0,0 +1,169 @@
+"""
+EDMC Income Tracker Plugin - Compact columnar transaction storage
+"""
+
+import time
+from array import array
+
+
+class TransactionView:
+    """Read-only view of a single stored transaction"""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def earnings(self) -> float:
+        return self._store.amounts[self._index]
+
+    @property
+    def category(self) -> str:
+        return self._store.category_names[self._store.codes[self._index]]
+
+    @property
+    def time(self) -> float:
+        return self._store.times[self._index]
+
+    @property
+    def system(self) -> str:
+        return self._store.location_names[self._store.systems[self._index]]
+
+    @property
+    def station(self) -> str:
+        return self._store.location_names[self._store.stations[self._index]]
+
+    def to_dict(self) -> dict:
+        return {"earnings": self.earnings, "category": self.category, "time": self.time,
+                "system": self.system, "station": self.station}
+
+    def __repr__(self):
+        return f"TransactionView(earnings={self.earnings!r}, category={self.category!r}, time={self.time!r})"
+
+
+class TransactionStore:
+    """Array-backed transaction history with interned category, system and station names"""
+
+    def __init__(self):
+        self.times = array('d')
+        self.amounts = array('d')
+        self.codes = array('H')
+        self.category_names = []
+        self._category_codes = {}
+        self._reset_locations()
+
+    def _reset_locations(self):
+        # System and station names share one string table; code 0 is "unknown"
+        self.systems = array('I')
+        self.stations = array('I')
+        self.location_names = [None]
+        self._location_codes = {None: 0}
+
+    def _intern(self, category: str) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self.category_names)
+            self.category_names.append(category)
+            self._category_codes[category] = code
+        return code
+
+    def _intern_location(self, name: str) -> int:
+        code = self._location_codes.get(name)
+        if code is None:
+            code = len(self.location_names)
+            self.location_names.append(name)
+            self._location_codes[name] = code
+        return code
+
+    def append(self, earnings: float, category: str = "unknown", timestamp: float = None,
+               system: str = None, station: str = None) -> TransactionView:
+        """Store a transaction and return a view of it"""
+        self.times.append(timestamp if timestamp is not None else time.time())
+        self.amounts.append(earnings)
+        self.codes.append(self._intern(category))
+        self.systems.append(self._intern_location(system))
+        self.stations.append(self._intern_location(station))
+        return TransactionView(self, len(self.amounts) - 1)
+
+    def clear(self):
+        """Remove all transactions"""
+        self.times = array('d')
+        self.amounts = array('d')
+        self.codes = array('H')
+        self.category_names = []
+        self._category_codes = {}
+        self._reset_locations()
+
+    def drop_prefix(self, count: int):
+        """Remove the first `count` transactions (the name tables are kept)"""
+        del self.times[:count]
+        del self.amounts[:count]
+        del self.codes[:count]
+        del self.systems[:count]
+        del self.stations[:count]
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __getitem__(self, index: int) -> TransactionView:
+        if index < 0:
+            index += len(self.amounts)
+        if not 0 <= index < len(self.amounts):
+            raise IndexError("transaction index out of range")
+        return TransactionView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.amounts)):
+            yield TransactionView(self, index)
+
+    def rows(self):
+        """Iterate (time, earnings, category) tuples without creating views"""
+        names = self.category_names
+        for timestamp, earnings, code in zip(self.times, self.amounts, self.codes):
+            yield timestamp, earnings, names[code]
+
+    def located_rows(self):
+        """Iterate (time, earnings, category, system, station) tuples"""
+        names = self.category_names
+        locations = self.location_names
+        for timestamp, earnings, code, system, station in zip(self.times, self.amounts, self.codes, self.systems, self.stations):
+            yield timestamp, earnings, names[code], locations[system], locations[station]
+
+    def to_columns(self) -> dict:
+        """Serialize to a JSON-friendly column layout"""
+        return {
+            "time": self.times.tolist(),
+            "earnings": self.amounts.tolist(),
+            "category": self.codes.tolist(),
+            "categories": list(self.category_names),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "TransactionStore":
+        """Rebuild a store from to_columns() output"""
+        store = cls()
+        store.times = array('d', columns.get("time", []))
+        store.amounts = array('d', columns.get("earnings", []))
+        store.codes = array('H', columns.get("category", []))
+        for name in columns.get("categories", []):
+            store._intern(name)
+        if not len(store.times) == len(store.amounts) == len(store.codes):
+            raise ValueError("transaction columns have different lengths")
+        # The column layout predates locations
+        store.systems = array('I', [0]) * len(store.times)
+        store.stations = array('I', [0]) * len(store.times)
+        return store
+
+    @classmethod
+    def from_dicts(cls, transactions) -> "TransactionStore":
+        """Rebuild a store from a list of transaction dicts (legacy state format)"""
+        store = cls()
+        for t in transactions:
+            store.append(t["earnings"], t.get("category", "unknown"), t.get("time"), t.get("system"), t.get("station"))
+        return store
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the column buffers"""
+        return sum(column.buffer_info()[1] * column.itemsize for column in (self.times, self.amounts, self.codes, self.systems, self.stations))
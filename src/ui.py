@@ -4,8 +4,10 @@ EDMC Income Tracker Plugin - Main UI
 
 import tkinter as tk
 from l10n import Locale # type: ignore
-from src.utils import log_debug
-from src.constants import UI_ELEMENT_STATES, DEBUG_MODE
+from src.utils import log_debug, Tooltip
+from src.refresh_scheduler import RefreshScheduler
+from src.instrumentation import instrumentation
+from src.constants import UI_ELEMENT_STATES, DEBUG_MODE, ROLLING_WINDOWS, ROLLING_TICK_MS, TOP_LOCATIONS_COUNT, TOP_COMMODITIES_COUNT
 
 
 class IncomeTrackerUI:
@@ -15,6 +17,7 @@ class IncomeTrackerUI:
         self.income_tracker = income_tracker
         self.preferences = preferences_manager
         self.journal_processor = journal_processor
+        self.refresh_scheduler = None
 
     #region UI creation helpers
     def _create_title_and_reset(self, frame):
@@ -97,7 +100,7 @@ class IncomeTrackerUI:
             element.grid_remove()
 
     def _update_element_visibility(self, force_hide=False):
-        log_debug(f"_update_element_visibility called with force_hide={force_hide}")
+        log_debug("_update_element_visibility called with force_hide={}", force_hide)
         for name in UI_ELEMENT_STATES:
             if force_hide:
                 # When force hiding, only show elements that always_show
@@ -129,22 +132,43 @@ class IncomeTrackerUI:
 
         rows = [
             ("Hourly", "speed", "0 Cr/hr"),
+            *[(title, name, "0 Cr/hr") for name, (title, _) in ROLLING_WINDOWS.items()],
             ("Income", "earned"),
             ("Maintenance", "maintenance"),
             ("Total", "total_credits"),
+            ("Top Station", "top_station", "-"),
         ]
         for i, (title, cat, *default) in enumerate(rows, start=1):
             self._create_income_row(frame, title, cat, i, *default)
+        self.top_station_tooltip = Tooltip(self.top_station_widget, "No station income yet")
 
-        self._create_breakdown_toggle(frame, 5)
+        toggle_row = len(rows) + 1
+        self._create_breakdown_toggle(frame, toggle_row)
 
         categories = ["trading", "combat", "exploration", "missions"]
-        for i, cat in enumerate(categories, start=6):
+        for i, cat in enumerate(categories, start=toggle_row + 1):
             self._create_income_row(frame, cat.capitalize(), cat, i)
 
+        trade_row = toggle_row + len(categories) + 1
+        self._create_income_row(frame, "Trade Profit", "trade_profit", trade_row)
+        self._create_income_row(frame, "Cargo Value", "cargo_value", trade_row + 1)
+        self._create_income_row(frame, "Unredeemed", "unredeemed", trade_row + 2)
+        self._create_income_row(frame, "Projected", "projected", trade_row + 3, "0 Cr/hr")
+        self.unredeemed_tooltip = Tooltip(self.unredeemed_widget, "No unredeemed vouchers")
+        Tooltip(self.projected_label, "Hourly value of bounties and combat bonds earned, as if they were all redeemed")
+        self._create_income_row(frame, "Unsold Data", "unsold_data", trade_row + 4)
+        self.unsold_data_tooltip = Tooltip(self.unsold_data_widget, "No unsold exploration data")
+        self.trade_profit_tooltip = Tooltip(self.trade_profit_widget, "No commodities traded yet")
+        self.missions_tooltip = Tooltip(self.missions_widget, "No missions finished yet")
+
+        # Repaints are coalesced and run on the Tk event loop
+        # (looked up on each run so instrumentation can wrap update_display)
+        self.refresh_scheduler = RefreshScheduler(frame, lambda: self.update_display())
+
         # Make sure the income labels are up-to-date
         self._update_element_visibility()
         self.income_tracker.update_window()
+        self._schedule_rolling_tick(frame)
 
         # --- DEBUG MODE ---
 
@@ -165,6 +189,21 @@ class IncomeTrackerUI:
     #endregion
 
     #region Display updates
+    def request_update(self):
+        """Mark the display dirty; it is repainted on the next scheduler pass"""
+        if self.refresh_scheduler:
+            self.refresh_scheduler.request()
+        else:
+            self.update_display()
+
+    def _schedule_rolling_tick(self, frame):
+        """Periodically repaint so rolling rates decay while no transactions arrive"""
+        def tick():
+            if frame.winfo_exists():
+                self.request_update()
+                frame.after(ROLLING_TICK_MS, tick)
+        frame.after(ROLLING_TICK_MS, tick)
+
     def update_display(self):
         log_debug("update_display() called")
         if not self.income_tracker:
@@ -201,7 +240,13 @@ class IncomeTrackerUI:
     def _update_all_values(self):
         if hasattr(self, 'speed_widget'):
             speed = self.income_tracker.speed()
-            self.speed_widget.after(0, self.speed_widget.config, {"text": f"{Locale.string_from_number(speed, 2)} Cr/hr"})
+            self.speed_widget.config(text=f"{Locale.string_from_number(speed, 2)} Cr/hr")
+
+        for name in ROLLING_WINDOWS:
+            widget = getattr(self, f"{name}_widget", None)
+            if widget:
+                rate = self.income_tracker.rolling_rate(name)
+                widget.config(text=f"{Locale.string_from_number(rate, 2)} Cr/hr")
 
         total = sum(
             self.income_tracker.trip_earnings_by_category(cat)
@@ -214,17 +259,39 @@ class IncomeTrackerUI:
         ) + self.income_tracker.saved_earnings + self.income_tracker.trip_earnings_by_category("maintenance")
 
         if hasattr(self, 'earned_widget'):
-            self.earned_widget.after(0, self.earned_widget.config, {"text": f"{Locale.string_from_number(total, 2)} Cr"})
+            self.earned_widget.config(text=f"{Locale.string_from_number(total, 2)} Cr")
 
         if hasattr(self, 'maintenance_widget'):
             maint = self.income_tracker.trip_earnings_by_category("maintenance")
-            self.maintenance_widget.after(0, self.maintenance_widget.config, {"text": f"{Locale.string_from_number(maint, 2)} Cr"})
+            self.maintenance_widget.config(text=f"{Locale.string_from_number(maint, 2)} Cr")
 
         if hasattr(self, 'total_credits_widget'):
             credits = self.income_tracker.get_current_credits()
-            self.total_credits_widget.after(0, self.total_credits_widget.config, {"text": f"{Locale.string_from_number(credits, 0)} Cr"})
+            self.total_credits_widget.config(text=f"{Locale.string_from_number(credits, 0)} Cr")
 
+        self._update_top_locations()
         self._update_category_widgets()
+        self._update_trade_widgets()
+        self._update_mission_tooltip()
+        self._update_voucher_widgets()
+        self._update_exploration_widgets()
+
+    def _update_top_locations(self):
+        if not hasattr(self, 'top_station_widget'):
+            return
+        stations = self.income_tracker.top_stations(TOP_LOCATIONS_COUNT)
+        if not stations:
+            self.top_station_widget.config(text="-")
+            self.top_station_tooltip.text = "No station income yet"
+            return
+
+        system, station, earnings, _ = stations[0]
+        self.top_station_widget.config(text=f"{station} ({Locale.string_from_number(earnings, 0)} Cr)")
+        lines = ["Stations:"]
+        lines += [f"{station} ({system}): {Locale.string_from_number(earnings, 0)} Cr" for system, station, earnings, _ in stations]
+        lines.append("Systems:")
+        lines += [f"{system}: {Locale.string_from_number(earnings, 0)} Cr" for system, earnings, _ in self.income_tracker.top_systems(TOP_LOCATIONS_COUNT)]
+        self.top_station_tooltip.text = "\n".join(lines)
 
     def _update_category_widgets(self):
         for cat, track in [
@@ -236,10 +303,85 @@ class IncomeTrackerUI:
             widget = getattr(self, f"{cat}_widget", None)
             if widget and track:
                 value = self.income_tracker.trip_earnings_by_category(cat)
-                widget.after(0, widget.config, {"text": f"{Locale.string_from_number(value, 2)} Cr"})
+                widget.config(text=f"{Locale.string_from_number(value, 2)} Cr")
+
+    def _update_trade_widgets(self):
+        if not hasattr(self, 'trade_profit_widget') or not self.preferences.cached_track_trading:
+            return
+        profit = self.income_tracker.trade_profit()
+        self.trade_profit_widget.config(text=f"{Locale.string_from_number(profit, 2)} Cr")
+        self.cargo_value_widget.config(text=f"{Locale.string_from_number(self.income_tracker.cargo_value(), 2)} Cr")
+
+        stats = self.income_tracker.commodity_stats()
+        if not stats:
+            self.trade_profit_tooltip.text = "No commodities traded yet"
+            return
+        self.trade_profit_tooltip.text = "\n".join(
+            f"{item['name']}: {Locale.string_from_number(item['profit'], 0)} Cr "
+            f"({item['margin'] * 100:.1f}%, {Locale.string_from_number(item['profit_per_hour'], 0)} Cr/hr)"
+            + (f", {item['held']} held" if item['held'] else "")
+            for item in stats[:TOP_COMMODITIES_COUNT]
+        )
+
+    def _update_voucher_widgets(self):
+        if not hasattr(self, 'unredeemed_widget') or not self.preferences.cached_track_combat:
+            return
+        self.unredeemed_widget.config(text=f"{Locale.string_from_number(self.income_tracker.unredeemed(), 2)} Cr")
+        self.projected_widget.config(text=f"{Locale.string_from_number(self.income_tracker.projected_rate(), 2)} Cr/hr")
+
+        factions = self.income_tracker.unredeemed_by_faction()
+        if not factions:
+            self.unredeemed_tooltip.text = "No unredeemed vouchers"
+            return
+        names = {"bounty": "bounties", "combatbond": "combat bonds"}
+        self.unredeemed_tooltip.text = "\n".join(
+            f"{faction or 'Unknown'} ({names.get(kind, kind)}): {Locale.string_from_number(value, 0)} Cr"
+            for faction, kind, value in factions[:TOP_LOCATIONS_COUNT]
+        )
+
+    def _update_exploration_widgets(self):
+        if not hasattr(self, 'unsold_data_widget') or not self.preferences.cached_track_exploration:
+            return
+        value = self.income_tracker.unsold_exploration_value()
+        self.unsold_data_widget.config(text=f"~{Locale.string_from_number(value, 0)} Cr")
+
+        systems = self.income_tracker.top_unsold_systems(TOP_LOCATIONS_COUNT)
+        if not systems:
+            self.unsold_data_tooltip.text = "No unsold exploration data"
+            return
+        exploration = self.income_tracker.exploration
+        lines = [f"Estimated from {exploration.body_count()} bodies in {exploration.system_count()} systems"]
+        lines += [f"{system}: {Locale.string_from_number(value, 0)} Cr ({bodies} bodies)" for system, value, bodies in systems]
+        self.unsold_data_tooltip.text = "\n".join(lines)
+
+    def _update_mission_tooltip(self):
+        if not hasattr(self, 'missions_tooltip') or not self.preferences.cached_track_missions:
+            return
+        types = self.income_tracker.top_mission_types(TOP_LOCATIONS_COUNT)
+        if not types:
+            self.missions_tooltip.text = "No missions finished yet"
+            return
+
+        def line(name, earnings, rate, completed, failed):
+            return f"{name}: {Locale.string_from_number(earnings, 0)} Cr ({Locale.string_from_number(rate, 0)} Cr/hr, {completed} done, {failed} failed)"
+
+        lines = [f"Mission time rate: {Locale.string_from_number(self.income_tracker.mission_rate(), 0)} Cr/hr",
+                 f"Active missions: {self.income_tracker.missions.active_count()}", "Types:"]
+        lines += [line(*item) for item in types]
+        lines.append("Factions:")
+        lines += [line(*item) for item in self.income_tracker.top_mission_factions(TOP_LOCATIONS_COUNT)]
+        self.missions_tooltip.text = "\n".join(lines)
 
     def refresh_ui(self):
         log_debug("Refreshing UI visibility")
         self._update_element_visibility()
         self._update_category_widgets()
+        self._update_trade_widgets()
+        self._update_mission_tooltip()
+        self._update_voucher_widgets()
+        self._update_exploration_widgets()
     #endregion
+
+
+# Hot-path timers (only wrapped while instrumentation is enabled)
+instrumentation.register(IncomeTrackerUI, "update_display")
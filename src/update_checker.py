@@ -2,19 +2,75 @@
 EDMC Income Tracker Plugin - Standalone version checking
 """
 
-import requests # type: ignore
+import json
+import os
+import threading
+import time
 import logging
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
-def check_for_updates(current_version, api_url):
+# Re-check GitHub at most this often (seconds); cached results are used in between
+DEFAULT_CACHE_TTL = 6 * 60 * 60
+
+
+def _load_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"[VERSIONCODE] Ignoring unreadable update cache: {e}")
+        return {}
+
+
+def _save_cache(cache_path, cache):
+    if not cache_path:
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"[VERSIONCODE] Failed to write update cache: {e}")
+
+
+def _update_info(current_version, release):
+    """Build the update info dict from a (cached) release"""
+    latest_version = release['tag_name'].lstrip('v')  # Remove 'v' prefix
+    download_url = release['zipball_url']  # Direct zip download
+
+    # Simple string comparison (semver)
+    logger.debug(f"[VERSIONCODE] Comparing versions: '{current_version}' vs '{latest_version}'")
+    if latest_version > current_version:
+        logger.debug(f"[VERSIONCODE] UPDATE AVAILABLE: {current_version} -> {latest_version}")
+        return {
+            'has_update': True,
+            'latest_version': latest_version,
+            'download_url': download_url
+        }
+
+    logger.debug("[VERSIONCODE] No update available - current version is up to date")
+    return {'has_update': False}
+
+
+def check_for_updates(current_version, api_url, cache_path=None, cache_ttl=DEFAULT_CACHE_TTL):
     """
     Check if there's a newer version available on GitHub
 
+    Results are cached on disk. Within `cache_ttl` no request is made; after
+    that the cached release is revalidated with If-None-Match, and if GitHub
+    can't be reached the cached release is used.
+
     Args:
         current_version: Current plugin version string
         api_url: GitHub API URL to check for releases
+        cache_path: Optional JSON file used to cache the latest release
+        cache_ttl: Seconds a cached release is trusted without revalidation
 
     Returns:
         dict: Update information with keys:
@@ -27,45 +83,95 @@ def check_for_updates(current_version, api_url):
     logger.debug(f"[VERSIONCODE] Current plugin version: {current_version}")
     logger.debug(f"[VERSIONCODE] GitHub API URL: {api_url}")
 
+    cache = _load_cache(cache_path)
+    cached_release = cache.get('release') if cache.get('url') == api_url else None
+
+    if cached_release and time.time() - cache.get('checked_at', 0) < cache_ttl:
+        logger.debug("[VERSIONCODE] Using cached release data")
+        return _update_info(current_version, cached_release)
+
+    # Imported on first use: requests is slow to import and only needed here
+    import requests # type: ignore
+
     try:
+        headers = {}
+        if cached_release and cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+
         logger.debug("[VERSIONCODE] Sending HTTP request to GitHub API...")
-        response = requests.get(api_url, timeout=10)
+        response = requests.get(api_url, headers=headers, timeout=10)
+
+        if response.status_code == 304 and cached_release:
+            logger.debug("[VERSIONCODE] Release not modified since last check")
+            cache['checked_at'] = time.time()
+            _save_cache(cache_path, cache)
+            return _update_info(current_version, cached_release)
+
         response.raise_for_status()
         logger.debug("[VERSIONCODE] GitHub API response received successfully")
 
         release_data = response.json()
-        latest_version = release_data['tag_name'].lstrip('v')  # Remove 'v' prefix
-        download_url = release_data['zipball_url']  # Direct zip download
-
-        logger.debug(f"[VERSIONCODE] GitHub release data parsed - Tag: {release_data['tag_name']}")
-        logger.debug(f"[VERSIONCODE] Latest version (cleaned): {latest_version}")
-        logger.debug(f"[VERSIONCODE] Download URL: {download_url}")
-
-        # Simple string comparison (semver)
-        logger.debug(f"[VERSIONCODE] Comparing versions: '{current_version}' vs '{latest_version}'")
-        if latest_version > current_version:
-            logger.debug(f"[VERSIONCODE] UPDATE AVAILABLE: {current_version} -> {latest_version}")
-            logger.debug(f"[VERSIONCODE] Returning update info with download URL")
-            return {
-                'has_update': True,
-                'latest_version': latest_version,
-                'download_url': download_url
-            }
-        else:
-            logger.debug(f"[VERSIONCODE] No update available - current version is up to date")
-            return {'has_update': False}
+        release = {
+            'tag_name': release_data['tag_name'],
+            'zipball_url': release_data['zipball_url'],
+        }
+        logger.debug(f"[VERSIONCODE] GitHub release data parsed - Tag: {release['tag_name']}")
+
+        _save_cache(cache_path, {
+            'url': api_url,
+            'etag': response.headers.get('ETag'),
+            'checked_at': time.time(),
+            'release': release,
+        })
+        return _update_info(current_version, release)
 
     except requests.exceptions.Timeout:
         error_msg = "Update check timed out"
-        logger.warning(f"[VERSIONCODE] {error_msg}")
-        return {'has_update': False, 'error': error_msg}
 
     except requests.exceptions.RequestException as e:
         error_msg = f"Network error: {e}"
-        logger.warning(f"[VERSIONCODE] {error_msg}")
-        return {'has_update': False, 'error': error_msg}
 
     except Exception as e:
         error_msg = f"Update check failed: {e}"
-        logger.warning(f"[VERSIONCODE] {error_msg}")
-        return {'has_update': False, 'error': error_msg}
+
+    logger.warning(f"[VERSIONCODE] {error_msg}")
+    if cached_release:
+        logger.debug("[VERSIONCODE] Falling back to cached release data")
+        return _update_info(current_version, cached_release)
+    return {'has_update': False, 'error': error_msg}
+
+
+class BackgroundUpdateCheck:
+    """
+    Runs check_for_updates() on a daemon thread.
+
+    The result is only stored, never delivered to Tk from the worker thread;
+    UI code polls `done` (e.g. with widget.after) and reads `result`.
+    """
+
+    def __init__(self, current_version, api_url, cache_path=None, cache_ttl=DEFAULT_CACHE_TTL):
+        self.args = (current_version, api_url, cache_path, cache_ttl)
+        self.result = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="IncomeTrackerUpdateCheck", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the check finishes; returns the result (None on timeout)"""
+        self._done.wait(timeout)
+        return self.result
+
+    def _run(self):
+        try:
+            self.result = check_for_updates(*self.args)
+        except Exception as e:
+            self.result = {'has_update': False, 'error': f"Update check failed: {e}"}
+        finally:
+            self._done.set()
@@ -2,11 +2,14 @@
 EDMC Income Tracker Plugin - Utility functions and constants
 """
 
+import collections
+import json
 import logging
 import os
 import sys
 import time
-import tkinter as tk
+from datetime import datetime
+from src.constants import PLUGIN_TECH_NAME
 
 # Plugin information
 plugin_name = os.path.basename(os.path.dirname(__file__))
@@ -35,6 +38,7 @@ class Tooltip:
         self.widget.bind('<Button-1>', self.hide_tooltip)  # Hide on click too
 
     def show_tooltip(self, event=None):
+        import tkinter as tk
         try:
             # Get widget position
             x = self.widget.winfo_rootx() + self.widget.winfo_width() + 5
@@ -76,23 +80,108 @@ def get_config_bool(config, key: str, default: bool = True) -> bool:
         return bool(config.get_int(key))
     return default
 
-def log_info(message: str) -> None:
+def parse_journal_timestamp(value: str) -> float:
+    """Convert a journal timestamp (ISO 8601, UTC) to epoch seconds"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+def get_data_dir(config) -> str:
+    """Get the directory where the plugin keeps its data files"""
+    return os.path.join(str(config.app_dir_path), PLUGIN_TECH_NAME)
+
+def load_json_file(path: str, default=None):
+    """Read a JSON file, or return the default if it is missing or unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        log_warning(f"Ignoring unreadable file {path}: {e}")
+        return default
+
+def save_json_file(path: str, data) -> bool:
+    """Atomically replace a JSON file (written to a temporary file first)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return True
+    except OSError as e:
+        log_error(f"Failed to write {path}: {e}")
+        return False
+
+#region Logging
+# Messages may be str.format templates with their arguments passed separately, e.g.
+#   log_debug("Recording transaction: {:,.0f} Cr ({})", earnings, category)
+# Formatting then only happens if the level is enabled (or the record is viewed
+# from the in-memory buffer).
+
+class LogBuffer:
+    """Bounded in-memory ring of recent log records, formatted only when read"""
+
+    def __init__(self, size: int):
+        self.records = collections.deque(maxlen=size)
+
+    def append(self, level: int, message: str, args: tuple):
+        self.records.append((time.time(), level, message, args))
+
+    def clear(self):
+        self.records.clear()
+
+    def lines(self, count: int = None):
+        """Format the most recent records (oldest first)"""
+        records = list(self.records)[-count:] if count else list(self.records)
+        return [
+            f"{time.strftime('%H:%M:%S', time.localtime(created))} {logging.getLevelName(level)[0]} {_format(message, args)}"
+            for created, level, message, args in records
+        ]
+
+# Recent records for the debug panel; None when the buffer is off
+this.log_buffer = None
+
+def enable_log_buffer(size: int) -> LogBuffer:
+    """Start keeping the last `size` log records in memory"""
+    this.log_buffer = LogBuffer(size)
+    return this.log_buffer
+
+def disable_log_buffer() -> None:
+    this.log_buffer = None
+
+def _format(message: str, args: tuple) -> str:
+    if not args:
+        return message
+    try:
+        return message.format(*args)
+    except (IndexError, KeyError, ValueError) as e:
+        return f"{message} {args!r} (format error: {e})"
+
+def _log(level: int, prefix: str, message: str, args: tuple) -> None:
+    if this.log_buffer is not None:
+        this.log_buffer.append(level, message, args)
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s %s", prefix, _format(message, args))
+
+def log_info(message: str, *args) -> None:
     """Log info message"""
-    logger.info(f"[Income Tracker - Info] {message}")
+    _log(logging.INFO, "[Income Tracker - Info]", message, args)
 
-def log_warning(message: str) -> None:
+def log_warning(message: str, *args) -> None:
     """Log warning message"""
-    logger.warning(f"[Income Tracker - Warning] {message}")
+    _log(logging.WARNING, "[Income Tracker - Warning]", message, args)
 
-def log_error(message: str) -> None:
+def log_error(message: str, *args) -> None:
     """Log error message"""
-    logger.error(f"[Income Tracker - Error] {message}")
+    _log(logging.ERROR, "[Income Tracker - Error]", message, args)
 
-def log_critical(message: str) -> None:
+def log_critical(message: str, *args) -> None:
     """Log critical message"""
-    logger.critical(f"[Income Tracker - Critical] {message}")
+    _log(logging.CRITICAL, "[Income Tracker - Critical]", message, args)
 
-def log_debug(message: str) -> None:
+def log_debug(message: str, *args) -> None:
     """Log debug message"""
-    logger.debug(f"[Income Tracker - Debug] {message}")
-
+    if this.log_buffer is None and not logger.isEnabledFor(logging.DEBUG):
+        return
+    _log(logging.DEBUG, "[Income Tracker - Debug]", message, args)
+#endregion
@@ -0,0 +1,154 @@
+"""
+EDMC Income Tracker Plugin - Unredeemed bounty and combat bond tracking
+"""
+
+import time
+from collections import deque
+from src.constants import VOUCHER_EXPIRY_SECONDS, VOUCHER_BUCKET_SECONDS, IDLE_THRESHOLD_SECONDS
+from src.play_time import ActivePlayTime
+
+BOUNTY = "bounty"
+COMBAT_BOND = "combatbond"
+
+
+class VoucherTracker:
+    """
+    Bounty vouchers and combat bonds earned but not yet redeemed.
+
+    Pending values are indexed by (voucher type, faction). Each entry keeps
+    its value in time buckets of VOUCHER_BUCKET_SECONDS, so vouchers older
+    than VOUCHER_EXPIRY_SECONDS can be dropped from the front. RedeemVoucher
+    clears the entries of the factions it lists, in O(factions).
+    """
+
+    EVENTS = ("Bounty", "FactionKillBond", "RedeemVoucher", "Died")
+
+    def __init__(self, idle_threshold: float = IDLE_THRESHOLD_SECONDS):
+        self.idle_threshold = idle_threshold
+        self.reset()
+
+    def reset(self):
+        """Forget all vouchers"""
+        self.pending = {}    # (type, faction) -> deque of [bucket start, value]
+        self.total = 0.0     # Sum of every pending value
+        self.earned = 0.0    # Value of all vouchers earned, redeemed or not
+        self.activity = ActivePlayTime(self.idle_threshold)  # Time spent earning vouchers
+        self.dirty = False
+
+    def _add(self, voucher_type: str, faction: str, value: float, timestamp: float):
+        if not value:
+            return
+        buckets = self.pending.get((voucher_type, faction))
+        if buckets is None:
+            buckets = self.pending[(voucher_type, faction)] = deque()
+        start = timestamp - timestamp % VOUCHER_BUCKET_SECONDS
+        if buckets and buckets[-1][0] == start:
+            buckets[-1][1] += value
+        else:
+            buckets.append([start, value])
+        self.total += value
+        self.earned += value
+
+    def _clear(self, key) -> float:
+        buckets = self.pending.pop(key, None)
+        if not buckets:
+            return 0.0
+        value = sum(bucket[1] for bucket in buckets)
+        self.total -= value
+        return value
+
+    def handle_event(self, entry: dict, timestamp: float = None):
+        """Journal event hook: add vouchers as they are earned and clear them when redeemed"""
+        event = entry.get("event")
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        if event == "Bounty":
+            rewards = entry.get("Rewards")
+            if rewards is None:
+                # On-foot and skimmer bounties have a single faction
+                rewards = [{"Faction": entry.get("Faction", ""), "Reward": entry.get("Reward", 0)}]
+            for reward in rewards:
+                self._add(BOUNTY, reward.get("Faction", ""), reward.get("Reward", 0), timestamp)
+            self.activity.add(timestamp)
+        elif event == "FactionKillBond":
+            self._add(COMBAT_BOND, entry.get("AwardingFaction", ""), entry.get("Reward", 0), timestamp)
+            self.activity.add(timestamp)
+        elif event == "RedeemVoucher":
+            voucher_type = entry.get("Type", "").lower()
+            if voucher_type not in (BOUNTY, COMBAT_BOND):
+                return
+            # Brokers (BrokerPercentage) pay out less, but the vouchers are gone all the same
+            factions = [item.get("Faction", "") for item in entry.get("Factions", [])]
+            if "Faction" in entry:
+                factions.append(entry["Faction"])
+            if factions:
+                for faction in factions:
+                    self._clear((voucher_type, faction))
+            else:
+                for key in [key for key in self.pending if key[0] == voucher_type]:
+                    self._clear(key)
+        elif event == "Died":
+            # Unredeemed vouchers are lost on death
+            self.pending = {}
+            self.total = 0.0
+        else:
+            return
+        self.expire(timestamp)
+        self.dirty = True
+
+    def expire(self, now: float = None) -> float:
+        """Drop vouchers older than VOUCHER_EXPIRY_SECONDS and return their value"""
+        cutoff = (now if now is not None else time.time()) - VOUCHER_EXPIRY_SECONDS
+        dropped = 0.0
+        for key in list(self.pending):
+            buckets = self.pending[key]
+            while buckets and buckets[0][0] + VOUCHER_BUCKET_SECONDS <= cutoff:
+                dropped += buckets.popleft()[1]
+            if not buckets:
+                del self.pending[key]
+        if dropped:
+            self.total -= dropped
+            self.dirty = True
+        return dropped
+
+    #region Queries
+    def unredeemed(self, voucher_type: str = None) -> float:
+        """Value of the pending vouchers (all, or one type)"""
+        if voucher_type is None:
+            return self.total
+        return sum(bucket[1] for (kind, _), buckets in self.pending.items() if kind == voucher_type for bucket in buckets)
+
+    def projected_rate(self, now: float = None) -> float:
+        """Value of vouchers earned per hour of active combat, as if they were all redeemed"""
+        return self.activity.rate(self.earned, now)
+
+    def by_faction(self) -> list:
+        """
+        Pending value per faction.
+
+        Returns:
+            list: (faction, voucher type, value), largest first
+        """
+        items = [(faction, kind, sum(bucket[1] for bucket in buckets)) for (kind, faction), buckets in self.pending.items()]
+        items.sort(key=lambda item: item[2], reverse=True)
+        return items
+    #endregion
+
+    #region Persistence
+    def to_dict(self) -> dict:
+        return {
+            "pending": [[kind, faction, [list(bucket) for bucket in buckets]] for (kind, faction), buckets in self.pending.items()],
+            "earned": self.earned,
+            "activity": self.activity.to_record(),
+        }
+
+    def load_dict(self, data: dict):
+        self.reset()
+        for kind, faction, buckets in data.get("pending", []):
+            self.pending[(kind, faction)] = deque([start, value] for start, value in buckets)
+        self.total = float(sum(bucket[1] for buckets in self.pending.values() for bucket in buckets))
+        self.earned = data.get("earned", 0.0)
+        self.activity.load_record(data.get("activity", [None, None, 0.0, 0]))
+        self.expire()
+        self.dirty = False
+    #endregion
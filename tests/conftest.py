@@ -0,0 +1,120 @@
+"""
+EDMC Income Tracker Plugin - Shared test fixtures
+
+The EDMC modules are replaced by the headless stand-ins (src/headless) before
+any plugin module is imported; each test gets its own data directory.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.headless import edmc_stubs  # noqa: E402
+from src.headless.replay import DEFAULT_CONFIG  # noqa: E402
+
+CONFIG = edmc_stubs.install()
+
+TEST_CONFIG = dict(DEFAULT_CONFIG, **{
+    "EDMCIncomeTracker_reset_on_close": 0,
+    "EDMCIncomeTracker_compact_after_days": 0,
+})
+
+
+@pytest.fixture
+def edmc_config(tmp_path):
+    """The stand-in EDMC config, pointed at a fresh app directory"""
+    CONFIG.app_dir_path = tmp_path
+    CONFIG.values = dict(TEST_CONFIG)
+    CONFIG.writes = 0
+    return CONFIG
+
+
+@pytest.fixture
+def make_tracker(edmc_config):
+    """Create loaded EDMCIncome instances on the test's data directory (closed at teardown)"""
+    from src.income_tracker import EDMCIncome
+
+    trackers = []
+
+    def make(compact_after_days: int = 0, idle_threshold: float = None):
+        tracker = EDMCIncome(None)
+        tracker.compact_after_days = compact_after_days
+        if idle_threshold is not None:
+            tracker.idle_threshold = idle_threshold
+        tracker.load_state(reset_on_close=False)
+        trackers.append(tracker)
+        return tracker
+
+    yield make
+    for tracker in trackers:
+        tracker.close()
+
+
+@pytest.fixture
+def settle():
+    """Wait for a tracker's background hydration and compaction threads"""
+    def wait(tracker):
+        for thread in (tracker._hydration_thread, tracker._compaction_thread):
+            if thread:
+                thread.join()
+    return wait
+
+
+#region Tk stand-ins
+class FakeWidget:
+    """Accepts any widget call; the settings panel is built without a display"""
+
+    def __init__(self, *args, **kwargs):
+        self.options = kwargs
+        self.after_calls = []
+
+    def cget(self, key):
+        return ""
+
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+
+    def winfo_exists(self):
+        return True
+
+    def after(self, ms, func, *args):
+        self.after_calls.append((func, args))
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakeVar:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+@pytest.fixture
+def fake_tk(monkeypatch):
+    """Replace EDMC's widget modules and the Tk widgets and variables the panel uses; returns the widget class"""
+    import tkinter
+    from tkinter import ttk
+
+    notebook = types.ModuleType("myNotebook")
+    for name in ("Frame", "Label", "Entry", "Checkbutton", "OptionMenu", "Button"):
+        setattr(notebook, name, FakeWidget)
+    hyperlink = types.ModuleType("ttkHyperlinkLabel")
+    hyperlink.HyperlinkLabel = FakeWidget
+    monkeypatch.setitem(sys.modules, "myNotebook", notebook)
+    monkeypatch.setitem(sys.modules, "ttkHyperlinkLabel", hyperlink)
+    monkeypatch.setattr(tkinter, "StringVar", FakeVar)
+    monkeypatch.setattr(tkinter, "BooleanVar", FakeVar)
+    monkeypatch.setattr(ttk, "Separator", FakeWidget)
+    return FakeWidget
+#endregion
@@ -0,0 +1,83 @@
+"""
+EDMC Income Tracker Plugin - Running aggregates against a full recompute
+"""
+
+import random
+
+import pytest
+
+CATEGORIES = ("trading", "combat", "exploration", "missions", "maintenance")
+SYSTEMS = ("Sol", "Lave", "Diso", None)
+STATIONS = ("Abraham Lincoln", "Lave Station", None)
+
+
+def random_transactions(count: int, seed: int, start: float = 1_700_000_000.0):
+    rng = random.Random(seed)
+    timestamp = start
+    records = []
+    for _ in range(count):
+        timestamp += rng.uniform(1, 3000)
+        records.append((rng.uniform(-50_000, 900_000), rng.choice(CATEGORIES), timestamp,
+                        rng.choice(SYSTEMS), rng.choice(STATIONS)))
+    return records
+
+
+def record(tracker, records):
+    for earnings, category, timestamp, system, station in records:
+        tracker.transaction(earnings, category, timestamp, system=system, station=station)
+
+
+def assert_matches_full_resum(tracker, records):
+    """Every aggregate accessor equals a sum over the recorded transactions, in order"""
+    assert tracker.trip_earnings() == sum(earnings for earnings, *_ in records)
+    for category in CATEGORIES:
+        expected = sum(earnings for earnings, cat, *_ in records if cat == category)
+        assert tracker.trip_earnings_by_category(category) == expected
+    assert tracker.aggregates.count == len(records)
+    assert len(tracker.transactions) == len(records)
+
+    systems = {}
+    for earnings, _, _, system, _ in records:
+        if system is not None:
+            systems[system] = systems.get(system, 0.0) + earnings
+    assert {system: earnings for system, earnings, _ in tracker.top_systems(len(SYSTEMS))} == pytest.approx(systems)
+    assert tracker.verify_aggregates()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_append_matches_full_resum(make_tracker, seed):
+    tracker = make_tracker()
+    records = random_transactions(500, seed)
+    for index in range(0, len(records), 50):
+        record(tracker, records[index:index + 50])
+        assert_matches_full_resum(tracker, records[:index + 50])
+
+
+def test_reset_clears_every_total(make_tracker):
+    tracker = make_tracker()
+    record(tracker, random_transactions(200, 4))
+    tracker.reset()
+    assert_matches_full_resum(tracker, [])
+
+    records = random_transactions(100, 5)
+    record(tracker, records)
+    assert_matches_full_resum(tracker, records)
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_reload_matches_full_resum(make_tracker, settle, snapshot):
+    tracker = make_tracker()
+    records = random_transactions(300, 6)
+    record(tracker, records)
+    if snapshot:
+        tracker.flush()
+    tracker.close()
+
+    reloaded = make_tracker()
+    settle(reloaded)
+    assert_matches_full_resum(reloaded, records)
+
+    # And keeps matching as new transactions come in
+    more = random_transactions(100, 7, start=records[-1][2])
+    record(reloaded, more)
+    assert_matches_full_resum(reloaded, records + more)
@@ -0,0 +1,84 @@
+"""
+EDMC Income Tracker Plugin - Historical journal backfill
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from src import backfill
+from src.ledger_file import LedgerFile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_journals(journal_dir, files: int, events_per_file: int, seed: int = 1) -> list:
+    """Write journal files with interleaving time ranges; returns the expected (time, earnings, category) records"""
+    rng = random.Random(seed)
+    os.makedirs(journal_dir, exist_ok=True)
+    expected = []
+    for index in range(files):
+        timestamp = 1_700_000_000 + index * 600
+        path = os.path.join(journal_dir, f"Journal.2023-11-{index:04d}.01.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp)), "event": "Fileheader"}) + "\n")
+            for _ in range(events_per_file):
+                timestamp += rng.randint(1, 3000)
+                stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+                kind = rng.choice(("MarketSell", "RefuelAll", "Music"))
+                if kind == "MarketSell":
+                    amount = rng.randint(1000, 900_000)
+                    f.write(json.dumps({"timestamp": stamp, "event": "MarketSell", "TotalSale": amount}) + "\n")
+                    expected.append((float(timestamp), amount, "trading"))
+                elif kind == "RefuelAll":
+                    amount = rng.randint(10, 5000)
+                    f.write(json.dumps({"timestamp": stamp, "event": "RefuelAll", "Cost": amount}) + "\n")
+                    expected.append((float(timestamp), -amount, "maintenance"))
+                else:
+                    f.write(json.dumps({"timestamp": stamp, "event": "Music", "MusicTrack": "Exploration"}) + "\n")
+    return expected
+
+
+def ledger_records(path: str) -> list:
+    return [tuple(record) for record in LedgerFile(path).records()]
+
+
+def test_cli_with_bare_output_file_name(tmp_path):
+    expected = write_journals(tmp_path / "journals", files=3, events_per_file=50)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+
+    result = subprocess.run(
+        [sys.executable, "-m", "src.backfill", str(tmp_path / "journals"), "--output", "ledger.jsonl", "--workers", "2"],
+        cwd=work_dir, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    records = ledger_records(str(work_dir / "ledger.jsonl"))
+    assert sorted(records) == sorted(expected)
+    assert [r[0] for r in records] == sorted(r[0] for r in records)
+
+
+def test_merge_beyond_fan_in_is_ordered_and_complete(tmp_path, monkeypatch):
+    # More files than the fan-in forces intermediate merge passes
+    monkeypatch.setattr(backfill, "MERGE_FAN_IN", 3)
+    expected = write_journals(tmp_path / "journals", files=11, events_per_file=40, seed=2)
+    output = str(tmp_path / "out" / "ledger.jsonl")
+
+    stats = backfill.backfill(str(tmp_path / "journals"), output, workers=2)
+    records = ledger_records(output)
+    assert stats["files"] == 11
+    assert stats["transactions"] == len(expected)
+    assert sorted(records) == sorted(expected)
+    assert [r[0] for r in records] == sorted(r[0] for r in records)
+
+
+def test_spill_files_are_removed(tmp_path, monkeypatch):
+    spill_dirs = []
+    make_temp_dir = backfill.tempfile.mkdtemp
+    monkeypatch.setattr(backfill.tempfile, "mkdtemp", lambda **kw: spill_dirs.append(make_temp_dir(dir=tmp_path, **kw)) or spill_dirs[-1])
+    write_journals(tmp_path / "journals", files=2, events_per_file=10)
+    backfill.backfill(str(tmp_path / "journals"), str(tmp_path / "ledger.jsonl"), workers=1)
+    assert spill_dirs and not os.path.exists(spill_dirs[0])
@@ -0,0 +1,56 @@
+"""
+EDMC Income Tracker Plugin - History compaction preserves totals and the hourly rate
+"""
+
+import random
+
+import pytest
+
+CATEGORIES = ("trading", "combat", "exploration", "missions", "maintenance")
+START = 1_700_000_000.0
+DAY = 86400
+
+
+def record_days(tracker, days: int, per_day: int, seed: int):
+    """Whole-credit transactions at whole-second times, spread over the given number of days"""
+    rng = random.Random(seed)
+    for day in range(days):
+        timestamp = START + day * DAY
+        for _ in range(per_day):
+            timestamp += rng.choice((rng.randint(1, 240), rng.randint(1000, 4000)))
+            tracker.transaction(float(rng.randint(-50_000, 900_000)), rng.choice(CATEGORIES), timestamp,
+                                system=rng.choice(("Sol", "Lave", None)))
+
+
+def totals(tracker) -> dict:
+    return {
+        "trip_earnings": tracker.trip_earnings(),
+        "categories": {category: tracker.trip_earnings_by_category(category) for category in CATEGORIES},
+        "speed": tracker.speed(),
+        "play_time": tracker.play_time.play_time,
+        "count": tracker.play_time.count,
+    }
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_compaction_leaves_totals_and_speed_unchanged(make_tracker, settle, snapshot):
+    tracker = make_tracker()
+    record_days(tracker, days=20, per_day=40, seed=1)
+    before = totals(tracker)
+
+    tracker.compact_after_days = 7
+    compacted = tracker.compact_history(now=START + 20 * DAY)
+    assert compacted > 0
+    assert tracker.summaries
+    assert totals(tracker) == before
+    assert tracker.verify_aggregates()
+
+    # And after reloading from the compacted ledger
+    if snapshot:
+        tracker.flush()
+    tracker.close()
+    reloaded = make_tracker()
+    settle(reloaded)
+    assert len(reloaded.transactions) == 20 * 40 - compacted
+    assert totals(reloaded) == before
+    assert reloaded.verify_aggregates()
@@ -0,0 +1,83 @@
+"""
+EDMC Income Tracker Plugin - Debug test events and commander partitions
+"""
+
+import glob
+import json
+import os
+
+import pytest
+
+from src.constants import COMMANDERS_DIR_NAME
+from src.headless.replay import replay
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def plugin(edmc_config):
+    from src.plugin_manager import PluginManager
+
+    manager = PluginManager()
+    manager.initialize()
+    yield manager
+    manager.cleanup()
+
+
+def debug_event(plugin, category: str, event: str):
+    from src.debug.debug import DebugInterface
+
+    DebugInterface(plugin.journal_processor, plugin.income_tracker)._test_event_from_file(category, event)
+
+
+def legacy_ledger(plugin, count: int = 3) -> str:
+    """Transactions recorded before any commander is known (a pre-partition install)"""
+    tracker = plugin.income_tracker
+    for index in range(count):
+        tracker.transaction(1000.0, "trading", START + index)
+    return tracker.ledger_file.path
+
+
+def partition_dirs(plugin) -> list:
+    return glob.glob(os.path.join(plugin.income_tracker.data_dir, COMMANDERS_DIR_NAME, "*"))
+
+
+def test_debug_event_keeps_the_unpartitioned_ledger(plugin):
+    path = legacy_ledger(plugin)
+    debug_event(plugin, "maintenance", "RefuelAll")
+
+    tracker = plugin.income_tracker
+    assert tracker.ledger.key == (None, False)
+    assert tracker.ledger_file.path == path
+    assert len(tracker.transactions) == 4
+    assert tracker.trip_earnings() == 3000 - 500
+    assert partition_dirs(plugin) == []
+
+
+def test_debug_event_goes_to_the_active_commander(plugin):
+    replay([json.dumps({"timestamp": "2026-01-01T10:00:00Z", "event": "LoadGame", "Commander": "Jameson", "Credits": 0})], plugin)
+    tracker = plugin.income_tracker
+    assert tracker.ledger.key == ("Jameson", False)
+
+    debug_event(plugin, "maintenance", "RefuelAll")
+    assert tracker.ledger.key == ("Jameson", False)
+    assert tracker.trip_earnings() == -500
+    assert len(partition_dirs(plugin)) == 1
+
+
+def test_synthetic_commander_does_not_adopt_the_legacy_ledger(plugin):
+    path = legacy_ledger(plugin)
+    processor = plugin.journal_processor
+    refuel = {"event": "RefuelAll", "Cost": 500}
+
+    processor.process_journal_entry("TestCommander", False, None, None, refuel, {}, synthetic=True)
+    tracker = plugin.income_tracker
+    assert tracker.ledger.key == (None, False)
+    assert tracker.trip_earnings() == 3000 - 500
+    assert partition_dirs(plugin) == []
+
+    # The first real commander still gets the pre-partition history
+    processor.process_journal_entry("Jameson", False, None, None, refuel, {})
+    assert tracker.ledger.key == ("Jameson", False)
+    assert tracker.trip_earnings() == 3000 - 1000
+    assert not os.path.exists(path)
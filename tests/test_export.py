@@ -0,0 +1,141 @@
+"""
+EDMC Income Tracker Plugin - Transaction export: summaries, filters and the settings panel
+"""
+
+import csv
+import json
+import random
+
+import pytest
+
+from src.export import export_file, ledger_sources, parse_time
+
+CATEGORIES = ("trading", "combat", "exploration", "missions", "maintenance")
+START = parse_time("2026-01-01")
+DAY = 86400
+
+
+def record_days(tracker, days: int, per_day: int, seed: int):
+    """Whole-credit transactions at whole-second times, spread over the given number of days"""
+    rng = random.Random(seed)
+    for day in range(days):
+        timestamp = START + day * DAY
+        for _ in range(per_day):
+            timestamp += rng.randint(1, 600)
+            tracker.transaction(float(rng.randint(-50_000, 900_000)), rng.choice(CATEGORIES), timestamp,
+                                system=rng.choice(("Sol", "Lave", None)))
+
+
+def read_export(path: str) -> list:
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row["time"], row["earnings"], row["count"] = float(row["time"]), float(row["earnings"]), int(row["count"])
+    return rows
+
+
+@pytest.fixture
+def compacted(make_tracker, edmc_config):
+    """Two commanders' ledgers; Jameson's first 7 of 14 days are compacted into summaries"""
+    tracker = make_tracker()
+    tracker.switch_commander("Jameson", False)
+    record_days(tracker, days=14, per_day=30, seed=1)
+    tracker.compact_after_days = 7
+    assert tracker.compact_history(now=START + 14 * DAY) > 0
+    tracker.compact_after_days = 0
+    expected = {category: tracker.trip_earnings_by_category(category) for category in CATEGORIES}
+    expected["total"] = tracker.trip_earnings()
+    expected["count"] = tracker.aggregates.count
+
+    tracker.switch_commander("Vega", False)
+    record_days(tracker, days=2, per_day=10, seed=2)
+    tracker.flush()
+    return tracker, expected
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_export_totals_match_the_tracker_after_compaction(compacted, tmp_path, extension):
+    tracker, expected = compacted
+    output = str(tmp_path / f"export.{extension}")
+    stats = export_file(output, ledger_sources(tracker.data_dir, commanders={"Jameson"}))
+    rows = read_export(output)
+
+    assert stats["rows"] == len(rows)
+    assert {row["commander"] for row in rows} == {"Jameson"}
+    assert {row["type"] for row in rows} == {"summary", "transaction"}
+    assert sum(row["earnings"] for row in rows) == expected["total"]
+    assert sum(row["count"] for row in rows) == expected["count"]
+    for category in CATEGORIES:
+        assert sum(row["earnings"] for row in rows if row["category"] == category) == expected[category]
+    assert [row["time"] for row in rows] == sorted(row["time"] for row in rows)
+
+
+def test_export_filters(compacted, tmp_path):
+    tracker, _ = compacted
+    data_dir = tracker.data_dir
+    # The tracker opened the pre-partition ledger before the first commander was known
+    assert [label for label, _ in ledger_sources(data_dir)] == ["", "Jameson", "Vega"]
+    assert [label for label, _ in ledger_sources(data_dir, commanders={"Vega"})] == ["Vega"]
+
+    output = str(tmp_path / "export.csv")
+    start, end = START + 2 * DAY, START + 9 * DAY
+    export_file(output, ledger_sources(data_dir), start=start, end=end, categories={"combat", "trading"})
+    rows = read_export(output)
+    assert rows
+    assert all(start <= row["time"] < end for row in rows)
+    assert {row["category"] for row in rows} <= {"combat", "trading"}
+    # Summaries are filtered by the start of their day like transactions by their time
+    assert {row["time"] for row in rows if row["type"] == "summary"} == {START + day * DAY for day in range(2, 7)}
+
+
+def test_settings_panel_export(compacted, tmp_path, fake_tk, monkeypatch):
+    from src import preferences
+
+    tracker, _ = compacted
+    manager = preferences.PreferencesManager()
+    manager.create_preferences_ui(fake_tk())
+    assert list(manager.export_commanders) == [preferences.ALL_COMMANDERS, preferences.NO_COMMANDER, "Jameson", "Vega"]
+    assert manager.export_filters() == {"start": None, "end": None, "categories": None, "commanders": None}
+
+    manager.export_start.set("2026-01-03")
+    manager.export_end.set("2026-01-09")
+    manager.export_categories["missions"].set(False)
+    manager.export_commander.set("Jameson")
+    filters = manager.export_filters()
+    assert filters == {
+        "start": START + 2 * DAY,
+        "end": START + 9 * DAY,  # The end date is included
+        "categories": {"trading", "combat", "exploration", "maintenance"},
+        "commanders": {"Jameson"},
+    }
+
+    output = str(tmp_path / "panel.jsonl")
+    monkeypatch.setattr(preferences.filedialog, "asksaveasfilename", lambda **kwargs: output)
+    status = fake_tk()
+    manager._start_export(status)
+    manager.export_thread.join(5)
+    assert "error" not in manager.export_result
+    rows = read_export(output)
+    assert rows and {row["commander"] for row in rows} == {"Jameson"}
+    assert all(filters["start"] <= row["time"] < filters["end"] and row["category"] != "missions" for row in rows)
+
+
+@pytest.mark.parametrize("start, categories", [("01/02/2026", CATEGORIES), ("", ())])
+def test_settings_panel_rejects_bad_filters(edmc_config, fake_tk, start, categories):
+    from src import preferences
+
+    manager = preferences.PreferencesManager()
+    manager.create_preferences_ui(fake_tk())
+    manager.export_start.set(start)
+    for category, var in manager.export_categories.items():
+        var.set(category in categories)
+    with pytest.raises(ValueError):
+        manager.export_filters()
+
+    status = fake_tk()
+    manager._start_export(status)
+    assert manager.export_thread is None
+    assert status.options["text"].startswith("Cannot export")
@@ -0,0 +1,27 @@
+"""
+EDMC Income Tracker Plugin - SQLite history filters
+"""
+
+import os
+
+from src.history_db import HistoryDatabase
+
+START = 1_700_000_000.0
+
+
+def test_filters_see_names_that_are_only_pending(tmp_path):
+    history = HistoryDatabase(os.path.join(tmp_path, "history.sqlite3"))
+    history.add(START, 1000.0, "trading", "MarketSell", "Jameson", "Sol", "Abraham Lincoln")
+    history.add(START + 60, -200.0, "maintenance", "RefuelAll", "Jameson", "Sol", "Abraham Lincoln")
+
+    # Nothing is written yet: every name is new in the pending rows
+    assert history.count(commander="Jameson") == 2
+    assert history.count(category="trading", system="Sol") == 1
+    assert history.totals_by_category(commander="Jameson") == [("trading", 1000.0, 1), ("maintenance", -200.0, 1)]
+    assert history.count(commander="Vega") == 0
+    history.close()
+
+    # Reopened: the names are loaded before the filters are resolved
+    reopened = HistoryDatabase(history.path)
+    assert reopened.count(system="Sol", start=START + 30) == 1
+    reopened.close()
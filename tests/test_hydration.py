@@ -0,0 +1,79 @@
+"""
+EDMC Income Tracker Plugin - Background history hydration against resets
+"""
+
+import threading
+
+import pytest
+
+from src import ledger_file
+from src.ledger_file import LedgerFile
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    messages = []
+    monkeypatch.setattr(ledger_file, "log_warning", lambda message, *args: messages.append(message))
+    return messages
+
+
+@pytest.fixture
+def paused_reads(monkeypatch):
+    """Hold LedgerFile.entries() after its first entry until resumed (or briefly, if nobody resumes it)"""
+    started = threading.Event()
+    resume = threading.Event()
+    entries = LedgerFile.entries
+
+    def paused(self, start=0, stop=None):
+        for index, entry in enumerate(entries(self, start, stop)):
+            yield entry
+            if index == 0 and not started.is_set():
+                started.set()
+                resume.wait(0.2)
+
+    monkeypatch.setattr(LedgerFile, "entries", paused)
+    return started, resume
+
+
+def snapshot_ledger(make_tracker, count: int):
+    """Write a ledger with a current snapshot, so the next tracker hydrates in the background"""
+    tracker = make_tracker()
+    for index in range(count):
+        tracker.transaction(1000.0 + index, "trading", START + index * 10, system="Sol")
+    tracker.flush()
+    tracker.close()
+
+
+def test_reset_during_hydration(make_tracker, settle, warnings, paused_reads):
+    snapshot_ledger(make_tracker, 20_000)
+    started, resume = paused_reads
+
+    tracker = make_tracker()
+    assert not tracker.ledger.hydrated
+    assert started.wait(5)
+    tracker.reset()
+    resume.set()
+    settle(tracker)
+
+    assert warnings == []
+    assert tracker.ledger.hydrated
+    assert len(tracker.transactions) == 0
+    assert tracker.trip_earnings() == 0
+    assert tracker.verify_aggregates()
+    assert list(tracker.ledger_file.records()) == []
+
+    tracker.transaction(500.0, "combat", START)
+    assert len(tracker.transactions) == 1
+    assert tracker.verify_aggregates()
+
+
+def test_hydration_completes_without_reset(make_tracker, settle, warnings):
+    snapshot_ledger(make_tracker, 2_000)
+    tracker = make_tracker()
+    settle(tracker)
+    assert warnings == []
+    assert tracker.ledger.hydrated
+    assert len(tracker.transactions) == 2_000
+    assert tracker.verify_aggregates()
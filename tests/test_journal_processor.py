@@ -0,0 +1,55 @@
+"""
+EDMC Income Tracker Plugin - Journal event dispatch
+"""
+
+import pytest
+
+from src import journal_processor
+
+
+@pytest.fixture
+def plugin(edmc_config):
+    from src.plugin_manager import PluginManager
+
+    manager = PluginManager()
+    manager.initialize()
+    yield manager
+    manager.cleanup()
+
+
+@pytest.fixture
+def debug_log(monkeypatch):
+    messages = []
+    monkeypatch.setattr(journal_processor, "log_debug", lambda message, *args: messages.append(message.format(*args)))
+    return messages
+
+
+def test_one_table_lookup_per_event(plugin):
+    processor = plugin.journal_processor
+    calls = []
+    processor.register_event_hook("combat", ("Died", "RedeemVoucher"), lambda entry, timestamp: calls.append(entry["event"]))
+    processor.register_event_hook("trading", ("Music",), lambda entry, timestamp: calls.append("untracked"))
+    processor.preferences.cached_track_trading = False
+    processor.rebuild_dispatch_table()
+
+    table = processor.event_table
+    assert all(table[event][0] == fields for event, fields in processor.dispatch_table.items())
+    fields, hooks = table["RedeemVoucher"]
+    assert fields == processor.dispatch_table["RedeemVoucher"] and len(hooks) == 2  # With the voucher tracker's
+    assert table["Died"][0] is None
+    assert "MarketSell" not in table and "Music" not in table
+
+    assert processor.process_journal_entry(None, False, None, None, {"event": "Music"}, {}) is None
+    assert processor.process_journal_entry(None, False, None, None, {"event": "Died"}, {}) is None
+    assert calls == ["Died"]
+
+
+def test_log_names_the_category_of_the_recorded_amount(plugin, debug_log):
+    processor = plugin.journal_processor
+    entry = {"event": "MissionCompleted", "MissionID": 1, "Reward": 250_000, "Donation": 0}
+    assert processor.process_journal_entry(None, False, None, None, entry, {}) == "Event: MissionCompleted"
+    assert "Processed event `MissionCompleted` in category `missions`" in debug_log
+
+    entry = {"event": "RefuelAll", "Cost": 0}
+    assert processor.process_journal_entry(None, False, None, None, entry, {}) is None
+    assert debug_log[-1] == "Skipping event without amounts: RefuelAll"
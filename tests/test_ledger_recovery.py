@@ -0,0 +1,108 @@
+"""
+EDMC Income Tracker Plugin - Loading damaged ledgers never loses history
+"""
+
+import json
+import os
+
+import pytest
+
+from src import ledger_file
+from src.commander_ledger import CommanderLedger
+from src.constants import SNAPSHOT_FILE_NAME, VOUCHERS_FILE_NAME
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    messages = []
+    monkeypatch.setattr(ledger_file, "log_warning", lambda message, *args: messages.append(message))
+    return messages
+
+
+def write_ledger(make_tracker, count: int = 5):
+    """A closed tracker with `count` transactions and no snapshot; returns its ledger path"""
+    tracker = make_tracker()
+    for index in range(count):
+        tracker.transaction(1000.0 * (index + 1), "trading", START + index * 60)
+    tracker.close()
+    path = tracker.ledger_file.path
+    os.remove(os.path.join(os.path.dirname(path), SNAPSHOT_FILE_NAME))
+    return path
+
+
+def append_lines(path: str, *values):
+    with open(path, "a", encoding="utf-8") as f:
+        for value in values:
+            f.write((value if isinstance(value, str) else json.dumps(value)) + "\n")
+
+
+@pytest.mark.parametrize("line", [
+    {"x": 5},
+    {"summary": 5},
+    {"summary": [START, "trading", "lots", 1, 0.0, START, START]},
+    {"summary": [START, "trading", 1.0]},
+    {"location": "Sol"},
+    {"location": ["Sol", None, None, 1]},
+    ["soon", 5.0, "trading"],
+    [START, None, "trading"],
+    "not json",
+])
+def test_unexpected_records_are_skipped(make_tracker, settle, warnings, line):
+    path = write_ledger(make_tracker)
+    # Followed by a good record (a bad last line is a torn write, and is cut on open)
+    append_lines(path, line, [START + 3600, 0.0, "combat"])
+    size = os.path.getsize(path)
+
+    tracker = make_tracker()
+    settle(tracker)
+    assert len(tracker.transactions) == 6
+    assert tracker.trip_earnings() == 15_000
+    assert tracker.verify_aggregates()
+    assert os.path.getsize(path) == size
+    assert len(warnings) == 1 and "skipped 1 unreadable records" in warnings[0]
+
+
+def test_load_failure_sets_the_ledger_aside(make_tracker, settle, monkeypatch):
+    path = write_ledger(make_tracker)
+    with open(path, "rb") as f:
+        original = f.read()
+    directory = os.path.dirname(path)
+    with open(os.path.join(directory, VOUCHERS_FILE_NAME), "w", encoding="utf-8") as f:
+        f.write("{}")
+
+    def unreadable(self):
+        raise OSError("device not ready")
+
+    monkeypatch.setattr(CommanderLedger, "_load_full", unreadable)
+    tracker = make_tracker()
+    settle(tracker)
+    monkeypatch.undo()
+
+    # Nothing was deleted: the ledger is kept aside, the tracker files stay
+    with open(path + ".bad", "rb") as f:
+        assert f.read() == original
+    assert os.path.exists(os.path.join(directory, VOUCHERS_FILE_NAME))
+    assert len(tracker.transactions) == 0
+    assert tracker.trip_earnings() == 0
+
+    # New history starts in a fresh ledger, and reloads consistently
+    tracker.transaction(500.0, "combat", START + 3600)
+    tracker.flush()
+    tracker.close()
+    reloaded = make_tracker()
+    settle(reloaded)
+    assert reloaded.trip_earnings() == 500.0
+    assert reloaded.verify_aggregates()
+
+
+def test_second_failure_keeps_the_first_bad_file(make_tracker, monkeypatch):
+    path = write_ledger(make_tracker)
+    with open(path + ".bad", "w", encoding="utf-8") as f:
+        f.write("earlier\n")
+    monkeypatch.setattr(CommanderLedger, "_load_full", lambda self: 1 / 0)
+    make_tracker()
+    with open(path + ".bad", encoding="utf-8") as f:
+        assert f.read() == "earlier\n"
+    assert os.path.exists(path + ".bad1")
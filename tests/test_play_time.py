@@ -0,0 +1,87 @@
+"""
+EDMC Income Tracker Plugin - Incremental active play time against the full scan
+"""
+
+import random
+
+import pytest
+
+from src.play_time import ActivePlayTime
+
+THRESHOLDS = (60, 300, 1800, 3600)
+
+
+def full_scan_play_time(times, idle_threshold: float) -> float:
+    """The original speed() loop: sum the gaps between consecutive transactions shorter than the threshold"""
+    play_time = 0.0
+    for i in range(1, len(times)):
+        time_diff = times[i] - times[i - 1]
+        if time_diff < idle_threshold:
+            play_time += time_diff
+    return play_time
+
+
+def full_scan_speed(records, idle_threshold: float) -> float:
+    play_time = full_scan_play_time([timestamp for _, timestamp in records], idle_threshold)
+    return sum(earnings for earnings, _ in records) * 3600.0 / play_time if play_time > 0 else 0.0
+
+
+def random_session(count: int, seed: int, start: float = 1_700_000_000.0):
+    """(earnings, time) pairs with short gaps, idle breaks and gaps exactly on a threshold"""
+    rng = random.Random(seed)
+    timestamp = start
+    records = []
+    for _ in range(count):
+        timestamp += rng.choice((rng.uniform(1, 120), rng.uniform(120, 5000), rng.choice(THRESHOLDS)))
+        records.append((rng.uniform(-20_000, 500_000), timestamp))
+    return records
+
+
+@pytest.mark.parametrize("idle_threshold", THRESHOLDS)
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_matches_full_scan(idle_threshold, seed):
+    times = [timestamp for _, timestamp in random_session(1000, seed)]
+    play_time = ActivePlayTime(idle_threshold)
+    for index, timestamp in enumerate(times, start=1):
+        play_time.add(timestamp)
+        if index % 100 == 0:
+            assert play_time.play_time == full_scan_play_time(times[:index], idle_threshold)
+    assert play_time.count == len(times)
+    assert play_time.first_time == times[0]
+    assert play_time.last_time == times[-1]
+
+
+def test_idle_threshold_changes_match_full_scan(make_tracker):
+    tracker = make_tracker(idle_threshold=1800)
+    records = random_session(800, 4)
+    for earnings, timestamp in records:
+        tracker.transaction(earnings, "trading", timestamp)
+
+    for idle_threshold in (300, 3600, 60, 1800):
+        tracker.set_idle_threshold(idle_threshold)
+        assert tracker.play_time.play_time == full_scan_play_time([t for _, t in records], idle_threshold)
+        assert tracker.speed() == full_scan_speed(records, idle_threshold)
+
+    # New transactions after a change keep using the new threshold
+    tracker.set_idle_threshold(300)
+    more = random_session(200, 5, start=records[-1][1])
+    for earnings, timestamp in more:
+        tracker.transaction(earnings, "combat", timestamp)
+    assert tracker.speed() == full_scan_speed(records + more, 300)
+
+
+@pytest.mark.parametrize("idle_threshold", [1800, 300])
+def test_snapshot_restore_matches_full_scan(make_tracker, settle, idle_threshold):
+    tracker = make_tracker(idle_threshold=1800)
+    records = random_session(600, 6)
+    for earnings, timestamp in records:
+        tracker.transaction(earnings, "missions", timestamp)
+    tracker.flush()
+    tracker.close()
+
+    # Restored from the snapshot taken at 1800 s, with the same or a different threshold
+    reloaded = make_tracker(idle_threshold=idle_threshold)
+    settle(reloaded)
+    assert reloaded.play_time.idle_threshold == idle_threshold
+    assert reloaded.play_time.play_time == full_scan_play_time([t for _, t in records], idle_threshold)
+    assert reloaded.speed() == full_scan_speed(records, idle_threshold)
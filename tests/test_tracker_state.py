@@ -0,0 +1,50 @@
+"""
+EDMC Income Tracker Plugin - Tracker state reaches disk without a flush
+"""
+
+import os
+import time
+
+from src.constants import VOUCHERS_FILE_NAME, TRADES_FILE_NAME
+
+BOND = {"event": "FactionKillBond", "Reward": 25_000, "AwardingFaction": "Lave Radio", "VictimFaction": "Pirates"}
+NOW = time.time()  # Vouchers older than VOUCHER_EXPIRY_SECONDS are dropped on load
+PURCHASE = {"event": "MarketBuy", "Type": "gold", "Count": 10, "BuyPrice": 9_000, "TotalCost": 90_000}
+
+
+def wait_for_sync(tracker):
+    timer = tracker._sync_timer
+    assert timer is not None
+    timer.join(5)
+
+
+def test_changed_trackers_are_saved_on_the_sync_interval(make_tracker):
+    tracker = make_tracker()
+    tracker.sync_interval = 0.05
+    tracker.handle_voucher_event(BOND, NOW)
+    tracker.handle_trade_event(PURCHASE, NOW + 10)
+    tracker.transaction(-90_000, "trading", NOW + 10)
+    wait_for_sync(tracker)
+
+    assert os.path.exists(os.path.join(tracker.ledger.directory, VOUCHERS_FILE_NAME))
+    assert os.path.exists(os.path.join(tracker.ledger.directory, TRADES_FILE_NAME))
+    assert not any(t.dirty for t in tracker.ledger.trackers.values())
+    assert tracker._sync_timer is None
+
+    # A tracker started without the first one being flushed or closed (a crash) sees the same state
+    restarted = make_tracker()
+    assert restarted.unredeemed() == 25_000
+    assert restarted.cargo_value() == tracker.cargo_value() > 0
+    assert restarted.trip_earnings() == -90_000
+
+
+def test_sync_is_coalesced(make_tracker):
+    tracker = make_tracker()
+    tracker.sync_interval = 0.5
+    tracker.handle_voucher_event(BOND, NOW)
+    timer = tracker._sync_timer
+    for offset in range(1, 20):
+        tracker.handle_voucher_event(BOND, NOW + offset)
+        assert tracker._sync_timer is timer
+    wait_for_sync(tracker)
+    assert make_tracker().unredeemed() == 20 * 25_000
@@ -0,0 +1,145 @@
+"""
+EDMC Income Tracker Plugin - Update checks against a local stub GitHub API
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.constants import UPDATE_CACHE_FILE_NAME
+from src.update_checker import check_for_updates
+from src.utils import get_data_dir
+
+RELEASE = {"tag_name": "v9.9.9", "zipball_url": "https://example.invalid/release.zip"}
+ETAG = '"release-etag"'
+
+
+class StubGitHub:
+    """Serves a latest-release endpoint on localhost and records the requests it gets"""
+
+    def __init__(self):
+        self.requests = []
+        self.release = dict(RELEASE)
+        self.hanging = False            # When set, requests wait for `hang` before answering
+        self.hang = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                if stub.hanging:
+                    stub.hang.wait(10)
+                if self.headers.get("If-None-Match") == ETAG:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = json.dumps(stub.release).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", ETAG)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/repos/test/releases/latest"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.hang.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def github():
+    stub = StubGitHub()
+    yield stub
+    stub.close()
+
+
+def unused_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/repos/test/releases/latest"
+
+
+def test_fresh_fetch_writes_cache(github, tmp_path):
+    cache_path = str(tmp_path / "update_cache.json")
+    result = check_for_updates("1.0.0", github.url, cache_path)
+
+    assert result == {"has_update": True, "latest_version": "9.9.9", "download_url": RELEASE["zipball_url"]}
+    assert len(github.requests) == 1
+    cache = json.loads(open(cache_path, encoding="utf-8").read())
+    assert cache["url"] == github.url
+    assert cache["etag"] == ETAG
+    assert cache["release"] == RELEASE
+
+
+def test_cache_hit_within_ttl_makes_no_request(github, tmp_path):
+    cache_path = str(tmp_path / "update_cache.json")
+    check_for_updates("1.0.0", github.url, cache_path)
+    github.release = {"tag_name": "v10.0.0", "zipball_url": "https://example.invalid/new.zip"}
+
+    result = check_for_updates("1.0.0", github.url, cache_path, cache_ttl=3600)
+    assert result["latest_version"] == "9.9.9"
+    assert len(github.requests) == 1
+
+
+def test_expired_cache_revalidates_with_etag(github, tmp_path):
+    cache_path = str(tmp_path / "update_cache.json")
+    check_for_updates("1.0.0", github.url, cache_path)
+    checked_at = json.loads(open(cache_path, encoding="utf-8").read())["checked_at"]
+    time.sleep(0.01)
+
+    result = check_for_updates("1.0.0", github.url, cache_path, cache_ttl=0)
+    assert len(github.requests) == 2
+    assert github.requests[1].get("If-None-Match") == ETAG
+    assert result["latest_version"] == "9.9.9"
+    assert json.loads(open(cache_path, encoding="utf-8").read())["checked_at"] > checked_at
+
+
+def test_unreachable_host(github, tmp_path):
+    url = unused_port_url()
+    result = check_for_updates("1.0.0", url, str(tmp_path / "none.json"))
+    assert result["has_update"] is False
+    assert "error" in result
+
+    # With a cached release for that URL, the cache is used instead
+    cache_path = str(tmp_path / "update_cache.json")
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"url": url, "etag": ETAG, "checked_at": 0, "release": RELEASE}, f)
+    assert check_for_updates("1.0.0", url, cache_path, cache_ttl=0)["latest_version"] == "9.9.9"
+
+
+#region Preferences panel
+def test_hanging_update_check_does_not_block_preferences(github, edmc_config, fake_tk, monkeypatch):
+    from src import preferences
+
+    github.hanging = True
+    monkeypatch.setattr(preferences, "GITHUB_API_URL", github.url)
+    manager = preferences.PreferencesManager()
+
+    started = time.perf_counter()
+    frame = manager.create_preferences_ui(fake_tk())
+    elapsed = time.perf_counter() - started
+
+    assert frame is not None
+    assert elapsed < 1.0
+    assert not manager.update_check.done
+
+    # Once the server answers, the background check finishes with the release
+    github.hang.set()
+    assert manager.update_check.wait(5)["latest_version"] == "9.9.9"
+    assert os.path.exists(os.path.join(get_data_dir(edmc_config), UPDATE_CACHE_FILE_NAME))
+#endregion
@@ -0,0 +1,59 @@
+"""
+EDMC Income Tracker Plugin - Bounty vouchers and combat bonds are income once, when redeemed
+"""
+
+import json
+
+import pytest
+
+from src.headless.replay import replay
+
+BOND = 25_000
+
+
+def journal(*entries) -> list:
+    lines = [{"timestamp": "2026-01-01T10:00:00Z", "event": "LoadGame", "Commander": "Jameson", "Credits": 1_000_000}]
+    for seconds, entry in enumerate(entries, start=1):
+        lines.append(dict(entry, timestamp=f"2026-01-01T10:{seconds:02d}:00Z"))
+    return [json.dumps(line) for line in lines]
+
+
+def kill_bond(faction: str = "Jarildekald Public Industry", reward: int = BOND) -> dict:
+    return {"event": "FactionKillBond", "Reward": reward, "AwardingFaction": faction, "VictimFaction": "Lencali Freedom Party"}
+
+
+@pytest.fixture
+def plugin(edmc_config):
+    from src.plugin_manager import PluginManager
+
+    manager = PluginManager()
+    manager.initialize()
+    manager.journal_processor.use_entry_timestamps = True
+    yield manager
+    manager.cleanup()
+
+
+def test_kill_bond_is_income_only_when_redeemed(plugin):
+    tracker = plugin.income_tracker
+    replay(journal(kill_bond()), plugin)
+    assert tracker.trip_earnings() == 0
+    assert tracker.unredeemed() == BOND
+
+    replay(journal({"event": "RedeemVoucher", "Type": "CombatBond", "Amount": BOND,
+                    "Factions": [{"Faction": "Jarildekald Public Industry", "Amount": BOND}]}), plugin)
+    assert tracker.trip_earnings() == BOND
+    assert tracker.trip_earnings_by_category("combat") == BOND
+    assert len(tracker.transactions) == 1
+    assert tracker.unredeemed() == 0
+
+
+def test_several_bonds_redeemed_together(plugin):
+    tracker = plugin.income_tracker
+    replay(journal(kill_bond(), kill_bond(reward=10_000), kill_bond("Lave Radio", 5_000)), plugin)
+    assert tracker.trip_earnings() == 0
+    assert tracker.unredeemed() == BOND + 15_000
+
+    replay(journal({"event": "RedeemVoucher", "Type": "CombatBond", "Amount": BOND + 10_000,
+                    "Faction": "Jarildekald Public Industry"}), plugin)
+    assert tracker.trip_earnings() == BOND + 10_000
+    assert tracker.unredeemed() == 5_000